@@ -246,15 +246,9 @@ def main():
     def cleanup():
         print("Uygulama kapatılıyor, temizlik yapılıyor...")
         # Geçici dosyaları temizle
-        import shutil
-        temp_dirs = ["temp_frames"]
-        for temp_dir in temp_dirs:
-            if Path(temp_dir).exists():
-                try:
-                    shutil.rmtree(temp_dir)
-                    print(f"Temizlendi: {temp_dir}")
-                except Exception as e:
-                    print(f"Temizlik hatası {temp_dir}: {e}")
+        from utils.temp_storage import TempStorageManager
+        # Kontrol noktası olan (devam ettirilebilir) çalışmalar korunur
+        TempStorageManager().cleanup(keep_resumable=True)
     
     app.aboutToQuit.connect(cleanup)
     
@@ -0,0 +1,38 @@
+import multiprocessing
+
+import numpy as np
+
+from utils.calibration import CalibrationStore
+
+FRAME_SIZE = (1280, 720)
+
+
+def _fingerprint(seed):
+    return np.packbits(np.random.default_rng(seed).random(32 * 18 + 16 * 9) > 0.5)
+
+
+def _add_entries(directory, seed, count):
+    store = CalibrationStore(directory)
+    for i in range(count):
+        store.add(_fingerprint(seed * 1000 + i), np.eye(3), 1.0, FRAME_SIZE, source_video=f"{seed}_{i}.mp4")
+
+
+def test_stores_sharing_a_directory_keep_each_others_entries(tmp_path):
+    first, second = CalibrationStore(str(tmp_path)), CalibrationStore(str(tmp_path))
+    first.add(_fingerprint(1), np.eye(3), 2.0, FRAME_SIZE, source_video="a.mp4")
+    second.add(_fingerprint(2), np.eye(3), 2.0, FRAME_SIZE, source_video="b.mp4")
+
+    reloaded = CalibrationStore(str(tmp_path))
+    assert sorted(entry['source_video'] for entry in reloaded.entries) == ["a.mp4", "b.mp4"]
+    # Diğer sürecin eklediği kayıt eşleşmede de bulunur
+    assert first.match(_fingerprint(2), FRAME_SIZE)['source_video'] == "b.mp4"
+
+
+def test_concurrent_processes_do_not_lose_entries(tmp_path):
+    processes = [multiprocessing.Process(target=_add_entries, args=(str(tmp_path), seed, 10)) for seed in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    assert len(CalibrationStore(str(tmp_path)).entries) == 30
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QPoint, Qt
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import QApplication
+
+from ui.frame_grid import FrameGridView, FrameSelection
+
+SIZES = {'card_width': 100, 'card_height': 80, 'thumb_width': 80, 'thumb_height': 50}
+FRAMES = 12
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def view(app, tmp_path):
+    view = FrameGridView(SIZES)
+    view.resize(2000, 400)  # Tüm kareler tek satırda görünür
+    view.grid_model.set_frames([{'annotated_path': str(tmp_path / f"{i}.jpg")} for i in range(FRAMES)],
+                               FrameSelection(FRAMES, selected=False))
+    view.show()
+    app.processEvents()
+    yield view
+    view.close()
+
+
+def _mouse(view, event_type, row, buttons=Qt.LeftButton):
+    pos = view.visualRect(view.grid_model.index(row)).center()
+    button = Qt.LeftButton if event_type != QEvent.MouseMove else Qt.NoButton
+    return QMouseEvent(event_type, QPoint(pos), button, buttons, Qt.NoModifier)
+
+
+def _selected(view):
+    return list(view.grid_model.selection.indices())
+
+
+def test_reverse_drag_restores_frames_it_passed_over(view):
+    view.grid_model.set_range(9, 9, True)  # Sürükleme öncesinden seçili kare korunmalı
+    view.mousePressEvent(_mouse(view, QEvent.MouseButtonPress, 3))
+    view.mouseMoveEvent(_mouse(view, QEvent.MouseMove, 10))
+    assert _selected(view) == list(range(3, 11))
+
+    view.mouseMoveEvent(_mouse(view, QEvent.MouseMove, 6))
+    assert _selected(view) == [3, 4, 5, 6, 9]
+
+    # Anchor'ın öbür tarafına geçince önceki taraf tamamen geri alınır
+    view.mouseMoveEvent(_mouse(view, QEvent.MouseMove, 1))
+    assert _selected(view) == [1, 2, 3, 9]
+    view.mouseReleaseEvent(_mouse(view, QEvent.MouseButtonRelease, 1, Qt.NoButton))
+    assert view.grid_model.selection.count == 4
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from utils.intervals import IntervalSet
+
+UNIVERSE = 60
+
+
+def _assert_matches(intervals, model):
+    assert len(intervals) == len(model)
+    assert list(intervals.indices()) == sorted(model)
+    assert all((value in intervals) == (value in model) for value in range(-2, UNIVERSE + 2))
+    # Aralıklar sıralı, boş değil ve birbirine değmiyor (bitişikler birleştirilmiş)
+    ranges = list(intervals)
+    assert intervals.range_count == len(ranges)
+    assert all(start < end for start, end in ranges)
+    assert all(prev_end < start for (_, prev_end), (start, _) in zip(ranges, ranges[1:]))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_interval_set_matches_set_model(seed):
+    rng = random.Random(seed)
+    intervals, model = IntervalSet(), set()
+    for _ in range(300):
+        start = rng.randrange(-3, UNIVERSE)
+        end = start + rng.choice((-1, 0, 1, 1, 2, 5, 12, 30))
+        value = rng.random() < 0.5
+        intervals.set(start, end, value)
+        if value:
+            model.update(range(start, end))
+        else:
+            model.difference_update(range(start, end))
+        _assert_matches(intervals, model)
+        if rng.random() < 0.02:
+            intervals.clear()
+            model.clear()
+
+
+def test_constructor_merges_overlapping_and_adjacent_ranges():
+    intervals = IntervalSet([(5, 8), (0, 2), (2, 4), (7, 10), (12, 12)])
+    assert list(intervals) == [(0, 4), (5, 10)]
+    assert len(intervals) == 9
+    assert IntervalSet(intervals) == intervals
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+from utils.job_queue import JobQueue
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_recover_keeps_same_host_jobs_whose_process_is_alive(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    alive = queue.submit("a.mp4")
+    dead = queue.submit("b.mp4")
+    queue.claim("w1", pid=os.getpid())
+    queue.claim("w2", pid=_dead_pid())
+    # İki işin de heartbeat'i eski; yalnızca süreci ölmüş olan geri alınır
+    queue._conn.execute("UPDATE jobs SET heartbeat = 0")
+
+    assert queue.recover(stale_after_s=1) == [dead]
+    assert queue.get(alive)['status'] == 'running'
+    assert queue.get(dead)['status'] == 'queued'
+    queue.close()
+
+
+def test_running_scheduler_is_found_through_the_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    assert queue.running_scheduler() is None
+    queue.register_scheduler(2, pid=_dead_pid())
+    # Süreci ölmüş kayıt sayılmaz ve silinir
+    assert queue.running_scheduler() is None
+    assert queue._conn.execute("SELECT COUNT(*) FROM schedulers").fetchone()[0] == 0
+
+    queue.register_scheduler(2)
+    other = JobQueue(str(tmp_path / "jobs.db"))
+    assert other.running_scheduler()['pid'] == os.getpid()
+    queue.unregister_scheduler()
+    assert other.running_scheduler() is None
+    other.close()
+    queue.close()
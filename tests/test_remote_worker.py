@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+
+import cv2
+import pytest
+
+import utils.remote_worker
+from utils.benchmark import SyntheticScene, build_frame_processor
+from utils.broker import SegmentBroker, create_server
+from utils.cli import main
+from utils.config import SoccerPitchConfiguration
+from utils.job_queue import JobQueue
+
+FRAMES = 12
+SIZE = (640, 360)
+
+
+@pytest.fixture
+def scene():
+    return SyntheticScene(SoccerPitchConfiguration(), *SIZE, players_per_team=4)
+
+
+@pytest.fixture
+def video(tmp_path, scene):
+    path = str(tmp_path / "match.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, SIZE)
+    for index in range(FRAMES):
+        writer.write(scene.render(index))
+    writer.release()
+    return path
+
+
+@pytest.fixture
+def stub_models(monkeypatch, scene):
+    """remote-worker gerçek modeller yerine sahneden okuyan taklit modellerle çalışır."""
+    monkeypatch.setattr(utils.remote_worker, 'load_frame_processor',
+                        lambda *model_paths: build_frame_processor(SoccerPitchConfiguration(), 'stub', scene))
+
+
+def _run_distributed(tmp_path, video, broker_kwargs, workers=2):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.submit(video, {'modes': ['integrated', 'radar_only'], 'radar_size': [320, 200],
+                                  'calibration': False}, output_dir=str(tmp_path / "out"))
+    broker = SegmentBroker(str(tmp_path / "jobs.db"), work_dir=str(tmp_path / "broker_work"), **broker_kwargs)
+    server = create_server(broker, port=0, token="t")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # run_broker'daki gibi periyodik reap
+    stop_reaper = threading.Event()
+    reaper = threading.Thread(target=lambda: [broker.reap() for _ in iter(lambda: stop_reaper.wait(0.2), True)],
+                              daemon=True)
+    reaper.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for index in range(workers):
+            assert main(['remote-worker', url, '--token', 't', '--name', f"w{index}", '--exit-when-idle',
+                         '--cache-dir', str(tmp_path / "cache")]) == 0
+    finally:
+        # Birleştirmeler bitene kadar reap sürer (heartbeat'ler dahil)
+        for thread in list(broker._merge_threads.values()):
+            thread.join()
+        stop_reaper.set()
+        reaper.join()
+        server.shutdown()
+        server.server_close()
+        broker.close()
+    job = queue.get(job_id)
+    queue.close()
+    return job
+
+
+def _frame_count(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        count = 0
+        while cap.read()[0]:
+            count += 1
+        return count
+    finally:
+        cap.release()
+
+
+def test_remote_worker_processes_all_segments(tmp_path, monkeypatch, video, stub_models):
+    monkeypatch.chdir(tmp_path)
+    job = _run_distributed(tmp_path, video, {'segment_frames': 5, 'warmup_frames': 2})
+
+    assert job['status'] == 'done', job['error']
+    assert job['result']['segments'] == 3
+    assert job['result']['frames'] == FRAMES
+    for mode in ('integrated', 'radar_only'):
+        assert _frame_count(job['result']['outputs'][mode]) == FRAMES
+    with open(job['result']['outputs']['detections'], encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['frame'] for record in records] == list(range(FRAMES))
+    assert [record['segment'] for record in records] == [0] * 5 + [1] * 5 + [2] * 2
+
+
+def test_overestimated_frame_count_completes_empty_segments(tmp_path, monkeypatch, video, stub_models):
+    monkeypatch.chdir(tmp_path)
+    # Konteyner gerçekte olandan fazla kare bildiriyor: son bölümler videonun sonundan başlar
+    monkeypatch.setattr(SegmentBroker, '_count_frames', staticmethod(lambda path: FRAMES * 3))
+    job = _run_distributed(tmp_path, video, {'segment_frames': 5, 'warmup_frames': 2})
+
+    assert job['status'] == 'done', job['error']
+    assert job['result']['segments'] == 8
+    assert job['result']['frames'] == FRAMES
+    assert _frame_count(job['result']['outputs']['integrated']) == FRAMES
+
+
+def test_job_keeps_heartbeating_while_segments_are_merged(tmp_path, monkeypatch, video, stub_models):
+    monkeypatch.chdir(tmp_path)
+    concat_videos = SegmentBroker._concat_videos
+    seen = {}
+
+    def slow_concat(paths, output_path):
+        if not seen:
+            # Uzun süren birleştirme: heartbeat eskitilir, reap'in yenilemesi beklenir
+            queue = JobQueue(str(tmp_path / "jobs.db"))
+            queue._conn.execute("UPDATE jobs SET heartbeat = 0")
+            deadline = time.time() + 10
+            while time.time() < deadline and not queue.list(statuses=['running'])[0]['heartbeat']:
+                time.sleep(0.05)
+            seen['heartbeat'] = queue.list(statuses=['running'])[0]['heartbeat']
+            seen['recovered'] = queue.recover(stale_after_s=60)
+            queue.close()
+        return concat_videos(paths, output_path)
+
+    monkeypatch.setattr(SegmentBroker, '_concat_videos', staticmethod(slow_concat))
+    job = _run_distributed(tmp_path, video, {'segment_frames': 5, 'warmup_frames': 2}, workers=1)
+
+    assert seen['heartbeat'] > 0
+    assert seen['recovered'] == []
+    assert job['status'] == 'done', job['error']
+    assert job['attempts'] == 1
@@ -7,6 +7,7 @@ from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from ui.pages.home_page import HomePageWidget
 from ui.pages.my_videos_page import MyVideosPage
 from ui.pages.analysis_results_page import AnalysisResultsPage
+from ui.pages.job_queue_page import JobQueuePage
 
 
 # Backend ve stil importları
@@ -78,14 +79,16 @@ class DashboardWindow(QWidget):
         self.home_page = HomePageWidget(self.frame_processor, self.frame_annotator)
         self.my_videos_page = MyVideosPage()
         self.analysis_results_page = AnalysisResultsPage()
-
+        self.job_queue_page = JobQueuePage()
 
         self.content_stacked_widget.addWidget(self.home_page)
         self.content_stacked_widget.addWidget(self.my_videos_page)
         self.content_stacked_widget.addWidget(self.analysis_results_page)
+        self.content_stacked_widget.addWidget(self.job_queue_page)
  
         
         self.my_videos_page.video_selected_for_processing.connect(self.handle_video_selection_for_processing)
+        self.my_videos_page.video_queued.connect(self.handle_video_queued)
         self.home_page.video_processed.connect(self.handle_video_processed)
 
         content_scroll_area = QScrollArea()
@@ -114,7 +117,7 @@ class DashboardWindow(QWidget):
         sidebar_layout.setSpacing(3)  # Spacing azaltıldı
 
         # Menu butonları
-        menu_items = ["Home Page", "Your Videos", "Transformed\nVideos"]  # Alt satıra geçirmek için \n eklendi
+        menu_items = ["Home Page", "Your Videos", "Transformed\nVideos", "Job Queue"]  # Alt satıra geçirmek için \n eklendi
         self.sidebar_buttons = {}
 
         for i, item in enumerate(menu_items):
@@ -191,7 +194,7 @@ class DashboardWindow(QWidget):
         self.current_active_button = button
 
     def switch_page(self, index):
-        menu_items = ["Home Page", "Your Videos", "Transformed Videos"]  # Normal isimler
+        menu_items = ["Home Page", "Your Videos", "Transformed Videos", "Job Queue"]  # Normal isimler
         if index < len(menu_items):
             button_name = menu_items[index]
             if button_name in self.sidebar_buttons:
@@ -207,6 +210,10 @@ class DashboardWindow(QWidget):
         self.home_page.set_video_for_processing(video_path)
         self.switch_page(0) # Home Page'ya dön
 
+    def handle_video_queued(self, video_path):
+        self.job_queue_page.submit_videos([video_path])
+        self.switch_page(3) # Job Queue sayfasına geç
+
     def handle_video_processed(self, video_path):
         print(f"Video işlendi: {video_path}. Transformed Videos sayfası güncellenebilir.")
         self.analysis_results_page.load_results() # Sonuçlar sayfasını yenilemek için çağrı
@@ -0,0 +1,524 @@
+# ui/frame_grid.py
+import collections
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QWidget
+from PyQt5.QtGui import QPixmap, QImage, QImageReader, QColor, QPainter, QPen, QFont
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QObject, QRunnable, QThreadPool,
+                          QSize, QRect, QRectF, QPoint, pyqtSignal)
+
+from ui.styles import SIMPLE_STYLES
+from utils.intervals import IntervalSet
+
+
+class FrameSelection:
+    """
+    Kare seçimi, seçili aralıkların kümesi olarak tutulur (IntervalSet). Seçili kare
+    sayısı O(1) okunur; dışa aktarma ardışık aralıklar üzerinden ilerleyebilir.
+    """
+
+    def __init__(self, size: int = 0, selected: bool = True):
+        self.size = size
+        self.ranges = IntervalSet([(0, size)] if selected else [])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> bool:
+        return index in self.ranges
+
+    @property
+    def count(self) -> int:
+        return len(self.ranges)
+
+    def set(self, index: int, selected: bool) -> bool:
+        """Değer değiştiyse True döner."""
+        return self.set_range(index, index, selected)
+
+    def set_range(self, first: int, last: int, selected: bool) -> bool:
+        """first ve last dahil aralığı (sıra fark etmez) seçer ya da bırakır."""
+        first, last = max(min(first, last), 0), min(max(first, last), self.size - 1)
+        before = len(self.ranges)
+        self.ranges.set(first, last + 1, selected)
+        return len(self.ranges) != before
+
+    def set_all(self, selected: bool) -> None:
+        self.ranges.clear()
+        if selected:
+            self.ranges.add(0, self.size)
+
+    def snapshot(self) -> IntervalSet:
+        return IntervalSet(self.ranges)
+
+    def restore_range(self, first: int, last: int, snapshot: IntervalSet) -> None:
+        """first..last (dahil) karelerini snapshot() anındaki seçim durumuna döndürür."""
+        first, last = max(min(first, last), 0), min(max(first, last), self.size - 1)
+        self.ranges.remove(first, last + 1)
+        for start, end in snapshot:
+            if end > first and start <= last:
+                self.ranges.add(max(start, first), min(end, last + 1))
+
+    def indices(self) -> Iterator[int]:
+        return self.ranges.indices()
+
+
+class _ThumbnailSignals(QObject):
+    loaded = pyqtSignal(int, str, QImage)  # satır, dosya yolu, küçültülmüş görüntü
+
+
+class _ThumbnailTask(QRunnable):
+    """Bekleyen istekleri en yeniden başlayarak çözer; yeni istek kalmayınca biter."""
+
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        while True:
+            request = self.loader._next_request()
+            if request is None:
+                return
+            row, path = request
+            reader = QImageReader(path)
+            size = reader.size()
+            if size.isValid():
+                # JPEG çözücüsü küçültmeyi çözme sırasında yapar (tam boyut kare hiç oluşturulmaz)
+                reader.setScaledSize(size.scaled(self.loader.thumb_size, Qt.KeepAspectRatio))
+            image = reader.read()
+            self.loader.signals.loaded.emit(row, path, image)
+
+
+class ThumbnailLoader:
+    """
+    Küçük resimleri QThreadPool üzerinde çözer. İstekler yığın gibi işlenir: hızlı
+    kaydırmada en son görünen satırlar önce çözülür, sınırı aşan eski istekler atılır.
+    """
+
+    def __init__(self, thumb_size: QSize, max_pending: int = 256, max_threads: int = 2):
+        self.thumb_size = thumb_size
+        self.max_pending = max_pending
+        self.max_threads = max_threads
+        self.signals = _ThumbnailSignals()
+        self.pool = QThreadPool.globalInstance()
+        self._lock = threading.Lock()
+        self._pending: "collections.OrderedDict[int, str]" = collections.OrderedDict()
+        self._active_tasks = 0
+
+    def request(self, row: int, path: str) -> List[int]:
+        """İsteği kuyruğa ekler; sınır yüzünden atılan (hiç yüklenmeyecek) satırları döner."""
+        with self._lock:
+            self._pending[row] = path
+            self._pending.move_to_end(row)
+            dropped = []
+            while len(self._pending) > self.max_pending:
+                dropped.append(self._pending.popitem(last=False)[0])
+            start = self._active_tasks < self.max_threads
+            if start:
+                self._active_tasks += 1
+        if start:
+            self.pool.start(_ThumbnailTask(self))
+        return dropped
+
+    def _next_request(self):
+        with self._lock:
+            if not self._pending:
+                self._active_tasks -= 1
+                return None
+            return self._pending.popitem(last=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+
+class FrameGridModel(QAbstractListModel):
+    """
+    İşlenmiş kareler için liste modeli. Küçük resimler yalnızca görünür satırlar çizilirken
+    istenir ve LRU önbellekte (cache_size adet QPixmap) tutulur; seçim FrameSelection'dadır.
+    """
+
+    PathRole = Qt.UserRole + 1
+    selection_changed = pyqtSignal(int, int)  # seçili kare sayısı, toplam kare
+
+    def __init__(self, thumb_size: QSize, cache_size: int = 512, parent=None):
+        super().__init__(parent)
+        self.paths: List[str] = []
+        self.selection = FrameSelection()
+        self.cache_size = cache_size
+        self._cache: "collections.OrderedDict[int, QPixmap]" = collections.OrderedDict()
+        self._requested = set()
+        self.loader = ThumbnailLoader(thumb_size)
+        self.loader.signals.loaded.connect(self._on_thumbnail_loaded)
+
+    def set_frames(self, frames_info: List[Dict], selection: Optional[FrameSelection] = None) -> None:
+        self.beginResetModel()
+        self.paths = [info["annotated_path"] for info in frames_info]
+        self.selection = selection if selection is not None else FrameSelection(len(self.paths))
+        self._cache.clear()
+        self._requested.clear()
+        self.loader.clear()
+        self.endResetModel()
+        self.selection_changed.emit(self.selection.count, len(self.selection))
+
+    def clear(self) -> None:
+        self.set_frames([])
+
+    def set_thumb_size(self, thumb_size: QSize) -> None:
+        if thumb_size == self.loader.thumb_size:
+            return
+        self.loader.thumb_size = thumb_size
+        self.loader.clear()
+        self._cache.clear()
+        self._requested.clear()
+        if self.paths:
+            self.dataChanged.emit(self.index(0), self.index(len(self.paths) - 1), [Qt.DecorationRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return f"🎯 Frame {row + 1}"
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.selection[row] else Qt.Unchecked
+        if role == Qt.DecorationRole:
+            return self.thumbnail(row)
+        if role == self.PathRole:
+            return self.paths[row]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        if self.selection.set(index.row(), value == Qt.Checked):
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            self.selection_changed.emit(self.selection.count, len(self.selection))
+        return True
+
+    def set_range(self, first: int, last: int, selected: bool) -> None:
+        """first..last (dahil) karelerini tek seferde seçer ya da bırakır."""
+        if not self.paths:
+            return
+        if self.selection.set_range(first, last, selected):
+            first, last = min(first, last), max(first, last)
+            self.dataChanged.emit(self.index(first), self.index(last), [Qt.CheckStateRole])
+            self.selection_changed.emit(self.selection.count, len(self.selection))
+
+    def restore_range(self, first: int, last: int, snapshot: IntervalSet) -> None:
+        """first..last (dahil) karelerinin seçimini snapshot'taki haline döndürür."""
+        if not self.paths:
+            return
+        self.selection.restore_range(first, last, snapshot)
+        first, last = min(first, last), max(first, last)
+        self.dataChanged.emit(self.index(first), self.index(last), [Qt.CheckStateRole])
+        self.selection_changed.emit(self.selection.count, len(self.selection))
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def thumbnail(self, row: int) -> Optional[QPixmap]:
+        """Önbellekteki küçük resim; yoksa arka planda yüklenmesi istenir ve None döner."""
+        pixmap = self._cache.get(row)
+        if pixmap is not None:
+            self._cache.move_to_end(row)
+            return pixmap
+        if row not in self._requested:
+            self._requested.add(row)
+            # Atılan satırlar tekrar görünür olunca yeniden istenebilmeli
+            self._requested.difference_update(self.loader.request(row, self.paths[row]))
+        return None
+
+    def _on_thumbnail_loaded(self, row: int, path: str, image: QImage) -> None:
+        self._requested.discard(row)
+        # Model bu arada başka karelerle doldurulduysa sonuç atılır
+        if row >= len(self.paths) or self.paths[row] != path or image.isNull():
+            return
+        self._cache[row] = QPixmap.fromImage(image)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class FrameCardDelegate(QStyledItemDelegate):
+    """Kare kartını (küçük resim + onay kutusu + etiket) widget oluşturmadan çizer."""
+
+    def __init__(self, card_size: QSize, thumb_size: QSize, small: bool = False, parent=None):
+        super().__init__(parent)
+        self.set_sizes(card_size, thumb_size, small)
+
+    def set_sizes(self, card_size: QSize, thumb_size: QSize, small: bool) -> None:
+        self.card_size = card_size
+        self.thumb_size = thumb_size
+        self.padding = 15 if small else 20
+        self.indicator_size = 24 if small else 28
+        self.font = QFont()
+        self.font.setPixelSize(14 if small else 18)
+        self.font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return self.card_size
+
+    def _indicator_rect(self, card: QRect) -> QRect:
+        label_top = card.top() + self.padding + self.thumb_size.height() + 20
+        return QRect(card.left() + self.padding + 10, label_top, self.indicator_size, self.indicator_size)
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = option.rect.adjusted(6, 6, -6, -6)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        checked = index.data(Qt.CheckStateRole) == Qt.Checked
+
+        painter.setPen(QPen(QColor("#4CAF50" if hovered else "#444444"), 4 if hovered else 3))
+        painter.setBrush(QColor("#3A3D42" if hovered else "#36393F"))
+        painter.drawRoundedRect(QRectF(card), 15, 15)
+
+        thumb_area = QRect(card.left() + self.padding, card.top() + self.padding,
+                           card.width() - 2 * self.padding, self.thumb_size.height())
+        painter.setPen(QPen(QColor("#666666"), 3))
+        painter.setBrush(QColor("#2A2A2A"))
+        painter.drawRoundedRect(QRectF(thumb_area), 10, 10)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            target = pixmap.size().scaled(thumb_area.size() - QSize(16, 16), Qt.KeepAspectRatio)
+            rect = QRect(0, 0, target.width(), target.height())
+            rect.moveCenter(thumb_area.center())
+            painter.drawPixmap(rect, pixmap)
+        else:
+            painter.setPen(QColor("#777777"))
+            painter.drawText(thumb_area, Qt.AlignCenter, "…")
+
+        indicator = self._indicator_rect(card)
+        painter.setPen(QPen(QColor("#4CAF50" if checked else "#666666"), 4))
+        painter.setBrush(QColor("#4CAF50" if checked else "#404040"))
+        painter.drawRoundedRect(QRectF(indicator), 5, 5)
+        if checked:
+            painter.setPen(QPen(QColor("white"), 3))
+            painter.drawLine(indicator.left() + 6, indicator.center().y(),
+                             indicator.left() + indicator.width() // 2 - 2, indicator.bottom() - 6)
+            painter.drawLine(indicator.left() + indicator.width() // 2 - 2, indicator.bottom() - 6,
+                             indicator.right() - 5, indicator.top() + 6)
+
+        painter.setFont(self.font)
+        painter.setPen(QColor("white"))
+        text_rect = QRect(indicator.right() + 12, indicator.top() - 6,
+                          card.right() - indicator.right() - 12 - self.padding, indicator.height() + 12)
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, index.data(Qt.DisplayRole))
+        painter.restore()
+
+
+class FrameGridView(QListView):
+    """
+    Sanal kare seçimi grid'i: yalnızca görünür kartlar çizilir, satır başına widget yoktur.
+    Boyutlar HomePageWidget.get_responsive_sizes() çıktısından ayarlanır.
+
+    Tıklama kartın seçimini değiştirir; Shift+tıklama son tıklanan karttan bu karta kadar
+    olan aralığa aynı değeri uygular; basılı tutup sürüklemek geçilen aralığı seçer/bırakır.
+    """
+
+    visible_range_changed = pyqtSignal(int, int)  # ilk ve son görünür satır
+
+    def __init__(self, sizes: Dict, small: bool = False, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(500)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setStyleSheet(SIMPLE_STYLES["scroll_area"].replace("QScrollArea", "QListView"))
+
+        thumb_size = QSize(sizes['thumb_width'], sizes['thumb_height'])
+        self.grid_model = FrameGridModel(thumb_size, parent=self)
+        self.card_delegate = FrameCardDelegate(self._card_size(sizes), thumb_size, small, parent=self)
+        self.setModel(self.grid_model)
+        self.setItemDelegate(self.card_delegate)
+        self.apply_sizes(sizes, small)
+        self._anchor_row = None
+        self._anchor_value = True
+        self._drag_row = None
+        self._drag_snapshot = None  # Sürükleme başındaki seçim; geri çekilen kareler buna döner
+        self.verticalScrollBar().valueChanged.connect(self._emit_visible_range)
+        self.grid_model.modelReset.connect(self._forget_anchor)
+
+    def _forget_anchor(self):
+        self._anchor_row = self._drag_row = self._drag_snapshot = None
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.pos())
+        if event.button() != Qt.LeftButton or not index.isValid():
+            return super().mousePressEvent(event)
+        row = index.row()
+        self._drag_snapshot = self.grid_model.selection.snapshot()
+        if event.modifiers() & Qt.ShiftModifier and self._anchor_row is not None:
+            self.grid_model.set_range(self._anchor_row, row, self._anchor_value)
+        else:
+            self._anchor_row = row
+            self._anchor_value = not self.grid_model.selection[row]
+            self.grid_model.set_range(row, row, self._anchor_value)
+        self._drag_row = row
+
+    def mouseMoveEvent(self, event):
+        if self._drag_row is None or not event.buttons() & Qt.LeftButton:
+            return super().mouseMoveEvent(event)
+        index = self.indexAt(event.pos())
+        if index.isValid() and index.row() != self._drag_row:
+            anchor, previous, row = self._anchor_row, self._drag_row, index.row()
+            # Geri çekilen (artık anchor..row aralığında olmayan) kareler sürükleme öncesine döner
+            if min(anchor, previous) < min(anchor, row):
+                self.grid_model.restore_range(min(anchor, previous), min(anchor, row) - 1, self._drag_snapshot)
+            if max(anchor, previous) > max(anchor, row):
+                self.grid_model.restore_range(max(anchor, row) + 1, max(anchor, previous), self._drag_snapshot)
+            self._drag_row = row
+            self.grid_model.set_range(anchor, row, self._anchor_value)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self._drag_row is not None:
+            self._drag_row = self._drag_snapshot = None
+            return
+        super().mouseReleaseEvent(event)
+
+    def visible_rows(self):
+        """Görünür ilk ve son satır; model boşsa (0, -1)."""
+        count = self.grid_model.rowCount()
+        if count == 0:
+            return 0, -1
+        viewport = self.viewport().rect()
+        first = self.indexAt(viewport.topLeft() + QPoint(self.gridSize().width() // 2, 1))
+        last = self.indexAt(QPoint(viewport.right() - 1, viewport.bottom() - 1))
+        first_row = first.row() if first.isValid() else 0
+        last_row = last.row() if last.isValid() else min(first_row + self._rows_per_page(), count - 1)
+        return first_row, last_row
+
+    def _rows_per_page(self) -> int:
+        grid = self.gridSize()
+        columns = max(1, self.viewport().width() // max(grid.width(), 1))
+        rows = max(1, self.viewport().height() // max(grid.height(), 1) + 1)
+        return columns * rows
+
+    def _emit_visible_range(self, *args):
+        self.visible_range_changed.emit(*self.visible_rows())
+
+    def scroll_to_row(self, row: int) -> None:
+        if 0 <= row < self.grid_model.rowCount():
+            self.scrollTo(self.grid_model.index(row), QAbstractItemView.PositionAtTop)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._emit_visible_range()
+
+    @staticmethod
+    def _card_size(sizes: Dict) -> QSize:
+        return QSize(sizes['card_width'] + 12, sizes['card_height'] + 12)
+
+    def apply_sizes(self, sizes: Dict, small: bool) -> None:
+        thumb_size = QSize(sizes['thumb_width'], sizes['thumb_height'])
+        card_size = self._card_size(sizes)
+        self.card_delegate.set_sizes(card_size, thumb_size, small)
+        self.grid_model.set_thumb_size(thumb_size)
+        spacing = 20 if small else 30
+        self.setGridSize(card_size + QSize(spacing, spacing))
+        self.doItemsLayout()
+
+
+class SelectionTimeline(QWidget):
+    """
+    Tüm kareleri tek bir şeritte gösteren zaman çizelgesi: seçili aralıklar yeşil,
+    grid'de görünen bölüm çerçeveli çizilir.
+
+    - Tıklama/sürükleme: grid'i o kareye kaydırır (scrub)
+    - Shift+sürükleme: sürüklenen aralığı seçer
+    - Sağ tık + sürükleme: sürüklenen aralığın seçimini kaldırır
+    """
+
+    def __init__(self, view: FrameGridView, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.model = view.grid_model
+        self.visible = (0, -1)
+        self._range_start = None
+        self._range_value = True
+        self.setMinimumHeight(36)
+        self.setMouseTracking(True)
+        self.setCursor(Qt.PointingHandCursor)
+        self.model.selection_changed.connect(lambda *args: self.update())
+        self.model.modelReset.connect(self.update)
+        view.visible_range_changed.connect(self._on_visible_range)
+
+    def _on_visible_range(self, first: int, last: int) -> None:
+        self.visible = (first, last)
+        self.update()
+
+    def _bar(self) -> QRect:
+        return self.rect().adjusted(8, 8, -8, -8)
+
+    def _x_for(self, frame: int, bar: QRect, total: int) -> int:
+        return bar.left() + int(round(frame / max(total, 1) * bar.width()))
+
+    def _frame_at(self, x: int) -> int:
+        bar = self._bar()
+        total = self.model.rowCount()
+        fraction = (x - bar.left()) / max(bar.width(), 1)
+        return int(min(max(fraction, 0.0), 1.0) * max(total - 1, 0))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        bar = self._bar()
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#404040"))
+        painter.drawRoundedRect(QRectF(bar), 4, 4)
+        total = self.model.rowCount()
+        if total == 0:
+            return
+
+        # Aralık sayısı kadar dikdörtgen; piksel altı aralıklar en az 1 px çizilir
+        painter.setBrush(QColor("#4CAF50"))
+        for start, end in self.model.selection.ranges:
+            x0 = self._x_for(start, bar, total)
+            x1 = max(self._x_for(end, bar, total), x0 + 1)
+            painter.drawRect(QRect(x0, bar.top(), x1 - x0, bar.height()))
+
+        first, last = self.visible
+        if last >= first:
+            x0 = self._x_for(first, bar, total)
+            x1 = max(self._x_for(last + 1, bar, total), x0 + 2)
+            painter.setPen(QPen(QColor("white"), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(QRect(x0, bar.top() - 3, x1 - x0, bar.height() + 6))
+
+        if self._range_start is not None:
+            painter.setPen(QPen(QColor("#FFC107"), 2))
+            x = self._x_for(self._range_start, bar, total)
+            painter.drawLine(x, bar.top() - 4, x, bar.bottom() + 4)
+
+    def mousePressEvent(self, event):
+        frame = self._frame_at(event.pos().x())
+        if event.button() == Qt.RightButton or event.modifiers() & Qt.ShiftModifier:
+            self._range_start = frame
+            self._range_value = event.button() != Qt.RightButton
+            self.model.set_range(frame, frame, self._range_value)
+        else:
+            self.view.scroll_to_row(frame)
+
+    def mouseMoveEvent(self, event):
+        if not event.buttons() & (Qt.LeftButton | Qt.RightButton):
+            return
+        frame = self._frame_at(event.pos().x())
+        if self._range_start is not None:
+            self.model.set_range(self._range_start, frame, self._range_value)
+        else:
+            self.view.scroll_to_row(frame)
+
+    def mouseReleaseEvent(self, event):
+        self._range_start = None
+        self.update()
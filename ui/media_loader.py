@@ -0,0 +1,65 @@
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+from utils.media_index import MediaIndex
+
+
+class _ProbeSignals(QObject):
+    probed = pyqtSignal(str, dict)  # dosya yolu, MediaIndex kaydı
+
+
+class _ProbeTask(QRunnable):
+    def __init__(self, loader, path):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+
+    def run(self):
+        try:
+            record = self.loader.index.probe(self.path)
+        except Exception as e:
+            print(f"Video bilgisi okunamadı {self.path}: {e}")
+            record = None
+        self.loader._done(self.path)
+        if record is not None:
+            self.loader.signals.probed.emit(self.path, record)
+
+
+class MediaProbeLoader:
+    """
+    Dizinde kaydı olmayan ya da değişmiş videoları arka planda inceler. Sonuçlar
+    MediaIndex'e yazılır ve probed sinyaliyle arayüz iş parçacığına iletilir.
+    """
+
+    def __init__(self, index: MediaIndex, max_threads: int = 2):
+        self.index = index
+        self.signals = _ProbeSignals()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._in_flight = set()
+
+    def request(self, path: str) -> None:
+        with self._lock:
+            if path in self._in_flight:
+                return
+            self._in_flight.add(path)
+        self.pool.start(_ProbeTask(self, path))
+
+    def _done(self, path: str) -> None:
+        with self._lock:
+            self._in_flight.discard(path)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+
+def thumbnail_pixmap(record) -> QPixmap:
+    """Kayıttaki JPEG küçük resimden QPixmap; küçük resim yoksa boş pixmap."""
+    pixmap = QPixmap()
+    if record and record.get('thumbnail'):
+        pixmap.loadFromData(record['thumbnail'], 'JPG')
+    return pixmap
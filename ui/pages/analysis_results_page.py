@@ -1,19 +1,27 @@
 # pages/analysis_results_page.py
 import os
-import cv2
 import subprocess
 import platform
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QGridLayout, QHBoxLayout, QMessageBox 
-from PyQt5.QtGui import QCursor, QPixmap, QImage
+from PyQt5.QtGui import QCursor
 from PyQt5.QtCore import Qt, QTimer
 
+from ui.media_loader import MediaProbeLoader, thumbnail_pixmap
 from ui.styles import SIMPLE_STYLES
+from utils.media_index import MediaIndex, duration_text, file_signature
 
 class AnalysisResultsPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("background-color: #2F3136; color: white;")
         self.loading_label = None
+        # Küçük resim ve süre bilgileri kalıcı dizinden gelir; yalnızca yeni/değişen dosyalar incelenir
+        self.media_index = MediaIndex()
+        self.media_loader = MediaProbeLoader(self.media_index)
+        self.media_loader.signals.probed.connect(self._on_result_probed)
+        self.result_cards = {}
+        self.result_listing = None
+        self.grid_columns = None
         self.init_ui()
 
     def init_ui(self):
@@ -75,18 +83,24 @@ class AnalysisResultsPage(QWidget):
         self.results_scroll_area.show()
 
     def load_results(self):
-        self.show_loading()
-        
-        while self.results_grid_layout.count():
-            child = self.results_grid_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
         outputs_folder = os.path.join(os.getcwd(), "outputs")
         os.makedirs(outputs_folder, exist_ok=True)
         
         result_files = [f for f in os.listdir(outputs_folder) 
                     if f.lower().endswith(('.mp4', '.avi'))]
+        result_paths = [os.path.join(outputs_folder, f) for f in result_files]
+
+        # Klasör değişmediyse kartlar olduğu gibi kalır (her sayfa geçişinde yeniden kurulmaz)
+        listing = self._folder_listing(result_paths)
+        if listing == self.result_listing and self.result_cards:
+            return
+        self.result_listing = listing
+
+        while self.results_grid_layout.count():
+            child = self.results_grid_layout.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+        self.result_cards = {}
 
         if not result_files:
             no_results_label = QLabel("There are no analysis results in the 'outputs' folder yet.\nThe results will appear here once the video processing is complete.")
@@ -97,64 +111,57 @@ class AnalysisResultsPage(QWidget):
             self.hide_loading()
             return
 
-        # Sonuçları aşamalı olarak yükle
-        self.remaining_results = result_files.copy()
-        self.current_index = 0
-        QTimer.singleShot(100, self._load_next_result)
+        # Kayıtlı sonuçlar hemen gösterilir; yeni ya da değişmiş dosyalar arka planda incelenir
+        cached = 0
+        self.grid_columns = self._grid_columns()
+        for index, result_path in enumerate(result_paths):
+            record = self.media_index.get(result_path)
+            self._add_result_thumbnail(result_path, index, record)
+            if record is None:
+                self.media_loader.request(result_path)
+            else:
+                cached += 1
+        self.media_index.prune(outputs_folder, result_paths)
 
-    def _load_next_result(self):
-        if not self.remaining_results:
+        if cached == 0:
+            self.show_loading()
+        else:
             self.hide_loading()
-            return
 
-        result_file = self.remaining_results.pop(0)
-        result_path = os.path.join(os.getcwd(), "outputs", result_file)
-        self._add_result_thumbnail(result_path, self.current_index)
-        self.current_index += 1
+    @staticmethod
+    def _folder_listing(paths):
+        listing = []
+        for path in paths:
+            try:
+                listing.append((path, file_signature(path)))
+            except OSError:
+                continue
+        return listing
 
-        # Sonraki sonuç için zamanlayıcı ayarla
-        QTimer.singleShot(100, self._load_next_result)
+    def _on_result_probed(self, result_path, record):
+        card = self.result_cards.get(result_path)
+        if card is not None:
+            self._apply_media_record(card, record)
+        self.hide_loading()
 
-    def _add_result_thumbnail(self, result_path, index):
+    def _add_result_thumbnail(self, result_path, index, record=None):
         thumbnail_card = QFrame()
         thumbnail_card.setStyleSheet(SIMPLE_STYLES["thumbnail_card"])
         thumbnail_layout = QVBoxLayout(thumbnail_card)
         thumbnail_layout.setContentsMargins(10, 10, 10, 10)
         thumbnail_layout.setSpacing(10)
         
-        cap = cv2.VideoCapture(result_path)
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = frame_rgb.shape
-                qimage = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qimage).scaled(200, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                thumbnail_label = QLabel()
-                thumbnail_label.setPixmap(pixmap)
-                thumbnail_label.setAlignment(Qt.AlignCenter)
-                thumbnail_label.setStyleSheet("border: 1px solid #444;")
-                thumbnail_layout.addWidget(thumbnail_label)
-                
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                duration = frame_count / fps
-                minutes = int(duration // 60)
-                seconds = int(duration % 60)
-                duration_text = f"{minutes:02d}:{seconds:02d}"
-                
-                # Boyut ve süre bilgisini aynı etikette göster
-                info_label = QLabel(f"Duration: {duration_text}")
-                info_label.setStyleSheet("color: #BBBBBB; font-size: 10px;")
-                info_label.setAlignment(Qt.AlignCenter)
-                thumbnail_layout.addWidget(info_label)
-                
-            cap.release()
-        else:
-            thumbnail_label = QLabel("🎥")
-            thumbnail_label.setStyleSheet("font-size: 50px; color: #666;")
-            thumbnail_label.setAlignment(Qt.AlignCenter)
-            thumbnail_layout.addWidget(thumbnail_label)
+        thumbnail_label = QLabel("🎥")
+        thumbnail_label.setStyleSheet("font-size: 50px; color: #666;")
+        thumbnail_label.setAlignment(Qt.AlignCenter)
+        thumbnail_layout.addWidget(thumbnail_label)
+
+        # Süre etiketi bilgi gelene kadar gizli
+        duration_label = QLabel()
+        duration_label.setStyleSheet("color: #BBBBBB; font-size: 10px;")
+        duration_label.setAlignment(Qt.AlignCenter)
+        duration_label.hide()
+        thumbnail_layout.addWidget(duration_label)
 
         file_name_label = QLabel(os.path.basename(result_path))
         file_name_label.setStyleSheet("color: white; font-size: 12px; font-weight: bold;")
@@ -184,7 +191,29 @@ class AnalysisResultsPage(QWidget):
         button_layout.addWidget(play_btn)
         button_layout.addWidget(open_folder_btn)
         thumbnail_layout.addLayout(button_layout)
+
+        card = {'frame': thumbnail_card, 'thumbnail': thumbnail_label, 'duration': duration_label}
+        self.result_cards[result_path] = card
+        if record is not None:
+            self._apply_media_record(card, record)
+        
+        # Satır ve sütun indekslerini hesapla
+        columns = self.grid_columns
+        row = index // columns
+        col = index % columns
         
+        self.results_grid_layout.addWidget(thumbnail_card, row, col)
+
+    def _apply_media_record(self, card, record):
+        pixmap = thumbnail_pixmap(record)
+        if pixmap.isNull():
+            return
+        card['thumbnail'].setStyleSheet("border: 1px solid #444;")
+        card['thumbnail'].setPixmap(pixmap)
+        card['duration'].setText(f"Duration: {duration_text(record['duration_s'])}")
+        card['duration'].show()
+
+    def _grid_columns(self):
         # Sayfanın genişliğini al
         viewport_width = self.results_scroll_area.viewport().width()
         
@@ -192,19 +221,20 @@ class AnalysisResultsPage(QWidget):
         thumbnail_width = 220  # 200px thumbnail + 20px margins
         
         # Bir satıra sığabilecek thumbnail sayısını hesapla
-        columns = max(1, viewport_width // thumbnail_width)
-        
-        # Satır ve sütun indekslerini hesapla
-        row = index // columns
-        col = index % columns
-        
-        self.results_grid_layout.addWidget(thumbnail_card, row, col)
+        return max(1, viewport_width // thumbnail_width)
+
+    def _relayout(self):
+        """Kartları yeni sütun sayısına göre yeniden dizer; videolar yeniden okunmaz."""
+        columns = self._grid_columns()
+        if columns == self.grid_columns:
+            return
+        self.grid_columns = columns
+        for index, card in enumerate(self.result_cards.values()):
+            self.results_grid_layout.addWidget(card['frame'], index // columns, index % columns)
         
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # Sayfa yeniden boyutlandırıldığında sonuçları tekrar yükle
-        if hasattr(self, 'remaining_results'):
-            self.load_results()
+        self._relayout()
 
     def play_video(self, video_path):
         import subprocess
@@ -5,18 +5,53 @@ import subprocess
 import numpy as np
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QFrame, QHBoxLayout,
-    QScrollArea, QGridLayout, QFileDialog, QProgressBar,
-    QRadioButton, QButtonGroup, QMessageBox, QCheckBox, QSizePolicy,
+    QScrollArea, QFileDialog, QProgressBar,
+    QRadioButton, QButtonGroup, QMessageBox, QSizePolicy,
     QApplication
 )
 
-from PyQt5.QtGui import QCursor, QPixmap, QImage, QFont, QDesktopServices 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QObject, QDateTime, QUrl, QSize
+from PyQt5.QtGui import QCursor, QPixmap, QFont, QDesktopServices 
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QObject, QDateTime, QUrl, QSize, QRunnable, QThreadPool
 
 from workers.processing_worker import ProcessingWorker
+from workers.export_worker import ExportWorker
 from utils.backend import FrameProcessor, FrameAnnotator, VideoProcessor
+from utils.profiler import StageProfiler
+from utils.calibration import CalibrationStore
+from utils.checkpoint import find_resumable_run, has_checkpoint
+from utils.result_cache import AnalysisCache
+from utils.temp_storage import STORAGE_PROFILES, TempStorageManager
+from ui.frame_grid import FrameGridView, FrameSelection, SelectionTimeline
 from ui.styles import SIMPLE_STYLES
 
+class _CacheKeySignals(QObject):
+    finished = pyqtSignal(int, object)  # istek numarası, önbellek anahtarı (hesaplanamadıysa None)
+
+
+class _CacheKeyTask(QRunnable):
+    """
+    Analiz önbelleği anahtarını arka planda hesaplar: ilk seferde videonun ve model
+    dosyalarının tamamı okunur, çok GB'lık maç videolarında bu dakikalar sürebilir.
+    """
+
+    def __init__(self, cache, request_id, video_path, model_paths, config, signals):
+        super().__init__()
+        self.cache = cache
+        self.request_id = request_id
+        self.video_path = video_path
+        self.model_paths = model_paths
+        self.config = config
+        self.signals = signals
+
+    def run(self):
+        try:
+            key = self.cache.key_for(self.video_path, self.model_paths, self.config)
+        except OSError as e:
+            print(f"Analiz önbelleği anahtarı hesaplanamadı: {e}")
+            key = None
+        self.signals.finished.emit(self.request_id, key)
+
+
 class HomePageWidget(QWidget):
     video_processed = pyqtSignal(str) 
 
@@ -24,11 +59,27 @@ class HomePageWidget(QWidget):
         super().__init__(parent)
         self.frame_processor = frame_processor
         self.frame_annotator = frame_annotator
+        # Aynı stadyum/kameradan gelen videolar için kayıtlı homografiler
+        self.calibration_store = CalibrationStore()
+        # Daha önce aynı video/model/ayarlarla işlenmiş sonuçlar
+        self.analysis_cache = AnalysisCache()
+        self.analysis_cache_key = None
+        # Anahtarı hesaplanırken bekleyen VideoProcessor; iptalde eski sonuçlar istek numarasıyla ayıklanır
+        self.pending_video_processor = None
+        self.cache_key_request = 0
+        self.cache_key_signals = _CacheKeySignals()
+        self.cache_key_signals.finished.connect(self._on_analysis_cache_key)
+        # Geçici kare dizinleri: disk kotası ve eski çalışmaların silinmesi.
+        # Çöken oturumlardan kalan, devam ettirilemeyen çalışmalar açılışta temizlenir.
+        self.temp_storage = TempStorageManager()
+        self.temp_storage.cleanup(keep_resumable=True)
         
         self.setStyleSheet("background-color: #2F3136; color: white;")
         self.current_video_path = None
         self.temp_frame_dir = None
         self.processed_frames_info = []
+        self.frame_selection = FrameSelection()
+        self.export_worker = None
         
         # Responsive değişkenler
         self.screen_size = QApplication.primaryScreen().size()
@@ -301,9 +352,27 @@ class HomePageWidget(QWidget):
         self.frame_progress_label = QLabel("Frame Processing: -")
         self.frame_progress_label.setStyleSheet("color: #BBBBBB; font-size: 14px;")
         self.frame_progress_label.setAlignment(Qt.AlignCenter)
+
+        # Aşama bazlı süre dağılımı (son karelerin ortalaması)
+        self.stage_timing_label = QLabel("Stage timings: -")
+        self.stage_timing_label.setStyleSheet("""
+            color: #BBBBBB;
+            font-size: 12px;
+            font-family: Consolas, monospace;
+            padding: 8px;
+            background-color: #2A2A2A;
+            border-radius: 8px;
+        """)
+        self.stage_timing_label.setMinimumWidth(260)
+        self.stage_timing_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        progress_row = QHBoxLayout()
+        progress_row.setSpacing(15)
+        progress_row.addWidget(self.progress_bar, 1)
+        progress_row.addWidget(self.stage_timing_label)
         
         progress_section.addWidget(self.progress_label)
-        progress_section.addWidget(self.progress_bar)
+        progress_section.addLayout(progress_row)
         progress_section.addWidget(self.frame_progress_label)
         
         main_layout.addLayout(progress_section)
@@ -444,24 +513,24 @@ class HomePageWidget(QWidget):
         """)
         layout.addWidget(description)
         
-        self.frame_banners_scroll_area = QScrollArea()
-        self.frame_banners_scroll_area.setWidgetResizable(True)
-        self.frame_banners_scroll_area.setStyleSheet(SIMPLE_STYLES["scroll_area"])
+        # Sanal grid: yalnızca görünen kartlar çizilir, küçük resimler arka planda çözülür
+        self.frame_grid_view = FrameGridView(self.get_responsive_sizes(), self.is_small_screen)
+        self.frame_grid_view.grid_model.selection_changed.connect(self.update_selection_info)
         
         # Responsive scroll area height ayarı
         if self.is_small_screen:
-            self.frame_banners_scroll_area.setMinimumHeight(400)  # Küçük kartlar için daha az height
+            self.frame_grid_view.setMinimumHeight(400)  # Küçük kartlar için daha az height
         else:
-            self.frame_banners_scroll_area.setMinimumHeight(600)  # Orta/büyük kartlar için
+            self.frame_grid_view.setMinimumHeight(600)  # Orta/büyük kartlar için
         
-        self.frame_banners_content = QWidget()
-        self.frame_banners_layout = QGridLayout(self.frame_banners_content)
-        self.frame_banners_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.frame_banners_layout.setSpacing(30)
-        self.frame_banners_layout.setContentsMargins(25, 25, 25, 25)
-        self.frame_banners_scroll_area.setWidget(self.frame_banners_content)
-        
-        layout.addWidget(self.frame_banners_scroll_area)
+        layout.addWidget(self.frame_grid_view)
+
+        # Zaman çizelgesi: kaydırma (scrub) ve aralık seçimi
+        self.selection_timeline = SelectionTimeline(self.frame_grid_view)
+        self.selection_timeline.setToolTip("Click/drag: jump to frame · Shift+drag: select range · "
+                                           "Right-drag: deselect range\n"
+                                           "In the grid: Shift+click selects a range, drag toggles the frames you pass")
+        layout.addWidget(self.selection_timeline)
         
         button_layout = QHBoxLayout()
         button_layout.setContentsMargins(0, 20, 0, 0)
@@ -537,11 +606,8 @@ class HomePageWidget(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            if self.temp_frame_dir and os.path.exists(self.temp_frame_dir):
-                try:
-                    shutil.rmtree(self.temp_frame_dir)
-                except Exception as e:
-                    print(f"Geçici dosyalar silinirken hata: {e}")
+            self.temp_storage.remove_run(self.temp_frame_dir)
+            self.temp_frame_dir = None
             
             self._reset_ui_for_new_process()
             self._set_input_enabled(True)
@@ -615,14 +681,12 @@ class HomePageWidget(QWidget):
         self.progress_bar.setValue(0)
         self.progress_label.setText("Video Transforming - Plese Wait...")
         self.frame_progress_label.setText("Frame Processing: -")
+        self.stage_timing_label.setText("Stage timings: -")
         
-        while self.frame_banners_layout.count():
-            child = self.frame_banners_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        self.frame_grid_view.grid_model.clear()
         
-        if self.temp_frame_dir and os.path.exists(self.temp_frame_dir):
-            shutil.rmtree(self.temp_frame_dir)
+        if self.temp_frame_dir:
+            self.temp_storage.remove_run(self.temp_frame_dir)
             self.temp_frame_dir = None
             
 
@@ -654,21 +718,57 @@ class HomePageWidget(QWidget):
         self.frame_processor.reset_state()
         # ---------------------------
 
-        self.temp_frame_dir = f"temp_frames/run_{QDateTime.currentDateTime().toSecsSinceEpoch()}"
-        os.makedirs(self.temp_frame_dir, exist_ok=True)
-        
         video_processor_instance = VideoProcessor(
-            self.current_video_path, "", self.frame_processor, self.frame_annotator
+            self.current_video_path, "", self.frame_processor, self.frame_annotator,
+            profiler=StageProfiler(), calibration_store=self.calibration_store
         )
 
+        # Aynı içerik aynı modellerle işlendiyse inference tamamen atlanır. Model dosyaları
+        # bilinmiyorsa (ör. bellekte verilen modeller) önbellek kullanılmaz
+        self.analysis_cache_key = None
+        if not self.frame_processor.model_paths:
+            self._start_worker(video_processor_instance)
+            return
+
+        self.pending_video_processor = video_processor_instance
+        self.cache_key_request += 1
+        self.progress_label.setText("Preparing - Please Wait...")
+        self.frame_progress_label.setText("Checking previously processed results...")
+        QThreadPool.globalInstance().start(_CacheKeyTask(
+            self.analysis_cache, self.cache_key_request, self.current_video_path,
+            list(self.frame_processor.model_paths), video_processor_instance.config_signature(),
+            self.cache_key_signals))
+
+    def _on_analysis_cache_key(self, request_id, key):
+        if request_id != self.cache_key_request or self.pending_video_processor is None:
+            return  # İptal edilmiş ya da yerine yenisi başlatılmış istek
+        video_processor_instance = self.pending_video_processor
+        self.pending_video_processor = None
+        self.progress_label.setText("Video Transforming - Please Wait...")
+        self.frame_progress_label.setText("Frame Processing: -")
+
+        self.analysis_cache_key = key
+        if key and self._load_cached_analysis(key):
+            return
+        self._start_worker(video_processor_instance)
+
+    def _start_worker(self, video_processor_instance):
+        resume_state = self._ask_resume()
+        if resume_state is None:
+            self.temp_frame_dir = self.temp_storage.create_run()
+
         self.thread = QThread()
-        self.worker = ProcessingWorker(video_processor_instance, self.temp_frame_dir)
+        self.worker = ProcessingWorker(video_processor_instance, self.temp_frame_dir, resume_state=resume_state,
+                                       storage=self.temp_storage)
+        sizes = self.get_responsive_sizes()
+        self.worker.set_preview_size(sizes['preview_width'], sizes['preview_height'])
         self.worker.moveToThread(self.thread)
 
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_processing_finished)
         self.worker.progress.connect(self.update_progress)
         self.worker.frame_preview_ready.connect(self.update_frame_previews)
+        self.worker.stage_timings.connect(self.update_stage_timings)
         self.worker.error.connect(self.handle_processing_error)
         self.worker.finished.connect(self.thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
@@ -676,37 +776,105 @@ class HomePageWidget(QWidget):
 
         self.thread.start()
 
-    def update_progress(self, percentage, current, total):
+    def _load_cached_analysis(self, key):
+        """Önbellekte kayıt varsa çıktıları yeni çalışma dizinine bağlar ve kare seçimine geçer."""
+        entry = self.analysis_cache.lookup(key)
+        if entry is None:
+            return False
+
+        self.temp_frame_dir = self.temp_storage.create_run()
+        try:
+            frames_info = self.analysis_cache.materialize(key, self.temp_frame_dir)
+        except OSError as e:
+            print(f"Analiz önbelleğinden yüklenemedi ({e}), video yeniden işlenecek...")
+            self.temp_storage.remove_run(self.temp_frame_dir)
+            self.temp_frame_dir = None
+            return False
+        self.temp_storage.register_run(self.temp_frame_dir)
+
+        print(f"Analiz önbellekten yüklendi: {entry['video']} ({entry['frames']} kare)")
+        # Önbellekten gelen sonuç tekrar kaydedilmez
+        self.analysis_cache_key = None
+        self.on_processing_finished(frames_info)
+        return True
+
+    def _store_analysis(self, processed_frames_info):
+        if not self.analysis_cache_key:
+            return
+        full_quality = STORAGE_PROFILES[0]['name']
+        if any(info.get('storage_profile') != full_quality for info in processed_frames_info):
+            # Kareler düşük kalitede kaydedildi; önbelleğe alınırsa sonraki çalışmalar da bu kaliteyle kalır
+            print("Ara kareler düşük kaliteyle kaydedildiği için analiz önbelleğe alınmadı")
+            self.analysis_cache_key = None
+            return
+        try:
+            self.analysis_cache.store(self.analysis_cache_key, processed_frames_info, self.current_video_path)
+        except OSError as e:
+            print(f"Analiz önbelleğe kaydedilemedi: {e}")
+        self.analysis_cache_key = None
+
+    def _ask_resume(self):
+        """
+        Bu video için yarıda kalmış bir çalışma varsa devam edilip edilmeyeceğini sorar.
+        Devam edilecekse temp_frame_dir o çalışmanın dizini olur ve kontrol noktası durumu döner.
+        """
+        resumable = find_resumable_run(self.temp_storage.root, self.current_video_path)
+        if resumable is None:
+            return None
+
+        reply = QMessageBox.question(
+            self,
+            "Resume Processing",
+            f"An unfinished run of this video was found (stopped at frame {resumable['state']['next_frame']}).\n\n"
+            "Do you want to continue from where it stopped?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply == QMessageBox.Yes:
+            self.temp_frame_dir = resumable['run_dir']
+            return resumable['state']
+
+        self.temp_storage.remove_run(resumable['run_dir'])
+        return None
+
+    @staticmethod
+    def _format_duration(seconds):
+        if seconds < 0:
+            return "--:--"
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:d}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+    def update_progress(self, percentage, current, total, fps=0.0, eta_s=-1.0, elapsed_s=0.0):
         self.progress_bar.setValue(percentage)
-        self.frame_progress_label.setText(f"Frame Processing: {current}/{total}")
+        self.frame_progress_label.setText(
+            f"Frame Processing: {current}/{total}  ·  {fps:.1f} fps  ·  "
+            f"Elapsed {self._format_duration(elapsed_s)}  ·  ETA {self._format_duration(eta_s)}"
+        )
+
+    def update_stage_timings(self, breakdown):
+        """Canlı aşama süresi dağılımını göster (ms/kare, en yavaş aşama üstte)"""
+        stages = breakdown.get('stages_ms', {})
+        if not stages:
+            return
+
+        lines = [f"{name:<22}{ms:7.1f} ms" for name, ms in sorted(stages.items(), key=lambda item: -item[1])]
+        counts = breakdown.get('counts', {})
+        if counts:
+            lines.append(" · ".join(f"{name}: {value:.1f}" for name, value in sorted(counts.items())))
+        self.stage_timing_label.setText("\n".join(lines))
 
     def update_frame_previews(self, annotated_img, radar_img):
-        """Önizleme görüntülerini güncelle - Responsive boyutlarla"""
-        sizes = self.get_responsive_sizes()
-        
-        # Anotasyonlu görüntü
-        if isinstance(annotated_img, np.ndarray):
-            h, w, ch = annotated_img.shape
-            q_img = QImage(annotated_img.data, w, h, ch * w, QImage.Format_BGR888)
-            pixmap = QPixmap.fromImage(q_img).scaled(
-                sizes['preview_width'], 
-                sizes['preview_height'], 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            self.annotated_preview_label.setPixmap(pixmap)
-        
-        # Radar görüntüsü
-        if isinstance(radar_img, np.ndarray):
-            h, w, ch = radar_img.shape
-            q_img = QImage(radar_img.data, w, h, ch * w, QImage.Format_BGR888)
-            pixmap = QPixmap.fromImage(q_img).scaled(
-                sizes['preview_width'], 
-                sizes['preview_height'], 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            self.radar_preview_label.setPixmap(pixmap)
+        """Önizleme görüntülerini güncelle - kareler worker'da önizleme boyutuna küçültülmüş gelir"""
+        if not annotated_img.isNull():
+            self.annotated_preview_label.setPixmap(QPixmap.fromImage(annotated_img))
+        if not radar_img.isNull():
+            self.radar_preview_label.setPixmap(QPixmap.fromImage(radar_img))
+
+        # Worker bir sonraki önizlemeyi ancak bu onaydan sonra gönderir
+        worker = self.sender()
+        if worker is not None:
+            worker.ack_preview()
 
     def on_processing_finished(self, processed_frames_info):
         self.processed_frames_info = processed_frames_info
@@ -718,6 +886,7 @@ class HomePageWidget(QWidget):
             self._set_input_enabled(True)
             return
 
+        self._store_analysis(processed_frames_info)
         self.post_process_frame.setVisible(True)
         self.populate_frame_selection_grid()
         self.video_processed.emit(self.current_video_path)
@@ -727,161 +896,57 @@ class HomePageWidget(QWidget):
         self.cancel_processing()
 
     def cancel_processing(self):
+        if self.pending_video_processor is not None:
+            # Önbellek anahtarı hesaplanırken iptal: worker henüz başlamadı, sonuç yok sayılır
+            self.pending_video_processor.executor.shutdown(wait=False)
+            self.pending_video_processor = None
+            self._reset_ui_for_new_process()
+            self._set_input_enabled(True)
+            QMessageBox.information(self, "Cancelled", "The process was canceled by the user.")
+            return
         if hasattr(self, 'worker') and self.worker:
             self.worker.stop()
         if hasattr(self, 'thread') and self.thread.isRunning():
             self.thread.quit()
             self.thread.wait()
+
+        # Kontrol noktası yazılmış çalışma dizini silinmez; aynı video tekrar işlenirken devam edilebilir
+        resumable = has_checkpoint(self.temp_frame_dir)
+        if resumable:
+            self.temp_frame_dir = None
         
         self._reset_ui_for_new_process()
         self._set_input_enabled(True)
-        QMessageBox.information(self, "Cancelled", "The process was canceled by the user.")
+        if resumable:
+            QMessageBox.information(self, "Cancelled", "The process was canceled by the user.\n\n"
+                                    "Progress has been saved; processing the same video again will offer to resume it.")
+        else:
+            QMessageBox.information(self, "Cancelled", "The process was canceled by the user.")
 
     def populate_frame_selection_grid(self):
         """Kare seçimi grid'ini responsive olarak oluştur"""
-        # Mevcut grid'i temizle
-        while self.frame_banners_layout.count():
-            child = self.frame_banners_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        sizes = self.get_responsive_sizes()
-        cols = sizes['grid_cols']
-        
-        # Grid spacing'i responsive yap
-        if self.is_small_screen:
-            self.frame_banners_layout.setSpacing(20)
-            self.frame_banners_layout.setContentsMargins(15, 15, 15, 15)
-        else:
-            self.frame_banners_layout.setSpacing(30)
-            self.frame_banners_layout.setContentsMargins(25, 25, 25, 25)
-        
-        for i, info in enumerate(self.processed_frames_info):
-            row, col = divmod(i, cols)
-            
-            frame_card = QFrame()
-            frame_card_layout = QVBoxLayout(frame_card)
-            
-            # Responsive padding
-            padding = 15 if self.is_small_screen else 20
-            frame_card_layout.setContentsMargins(padding, padding, padding, padding)
-            frame_card_layout.setSpacing(12 if self.is_small_screen else 15)
-            
-            # Responsive card styling
-            frame_card.setStyleSheet(f"""
-                QFrame {{ 
-                    background-color: #36393F; 
-                    border-radius: 15px; 
-                    border: 3px solid #444444;
-                    min-width: {sizes['card_width']}px;
-                    min-height: {sizes['card_height']}px;
-                    max-width: {sizes['card_width'] + 50}px;  
-                    max-height: {sizes['card_height'] + 50}px; 
-                }}
-                QFrame:hover {{
-                    border: 4px solid #4CAF50;
-                    background-color: #3A3D42;
-                }}
-            """)
-            # Thumbnail oluştur - responsive boyutlarla
-            thumb_label = QLabel()
-            pixmap = QPixmap(info["annotated_path"])
-            scaled_pixmap = pixmap.scaled(
-                sizes['thumb_width'], 
-                sizes['thumb_height'], 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            thumb_label.setPixmap(scaled_pixmap)
-            thumb_label.setAlignment(Qt.AlignCenter)
-            
-            # Responsive thumbnail styling
-            thumb_label.setStyleSheet(f"""
-                border: 3px solid #666; 
-                border-radius: 10px;
-                background-color: #2A2A2A;
-                padding: 8px;
-                min-height: {sizes['thumb_height']}px;
-                min-width: {sizes['thumb_width']}px;
-                max-height: {sizes['thumb_height'] + 20}px;
-                max-width: {sizes['thumb_width'] + 20}px;
-            """)
-            
-            # Checkbox oluştur - responsive styling
-            checkbox = QCheckBox(f"🎯 Frame {i+1}")
-            checkbox.setChecked(info["selected"])
-            
-            # Responsive checkbox font size ve padding
-            if self.is_small_screen:
-                checkbox_font_size = "14px"
-                checkbox_padding = "10px"
-                checkbox_height = "40px"
-                indicator_size = "24px"
+        self.frame_grid_view.apply_sizes(self.get_responsive_sizes(), self.is_small_screen)
+        self.frame_selection = FrameSelection(len(self.processed_frames_info))
+        self.frame_grid_view.grid_model.set_frames(self.processed_frames_info, self.frame_selection)
+        self.frame_grid_view.scrollToTop()
+
+    def update_selection_info(self, selected_count, total_count):
+        if hasattr(self, 'selection_info_label'):
+            if selected_count == 0:
+                self.selection_info_label.setText("⚠️ No frames selected!")
+                self.selection_info_label.setStyleSheet("color: #FF5252; font-size: 14px; font-weight: bold; padding: 8px;")
+            elif selected_count == total_count:
+                self.selection_info_label.setText("✅ All frames are selected")
+                self.selection_info_label.setStyleSheet("color: #4CAF50; font-size: 14px; font-weight: bold; padding: 8px;")
             else:
-                checkbox_font_size = "18px"
-                checkbox_padding = "15px"
-                checkbox_height = "50px"
-                indicator_size = "28px"
-            
-            checkbox.setStyleSheet(f"""
-                QCheckBox {{
-                    color: white;
-                    font-weight: bold;
-                    font-size: {checkbox_font_size};
-                    padding: {checkbox_padding};
-                    background-color: #2A2A2A;
-                    border-radius: 10px;
-                    min-height: {checkbox_height};
-                }}
-                QCheckBox::indicator {{
-                    width: {indicator_size};
-                    height: {indicator_size};
-                    border-radius: 5px;
-                }}
-                QCheckBox::indicator:checked {{
-                    background-color: #4CAF50;
-                    border: 4px solid #4CAF50;
-                    image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHZpZXdCb3g9IjAgMCAxNiAxNiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEzLjUgNEw2IDExLjUgMi41IDhMMSA5LjUgNiAxNC41IDE1IDIuNSAxMy41IDRaIiBmaWxsPSJ3aGl0ZSIvPgo8L3N2Zz4K);
-                }}
-                QCheckBox::indicator:unchecked {{
-                    background-color: #404040;
-                    border: 4px solid #666;
-                }}
-                QCheckBox::indicator:hover {{
-                    border: 4px solid #4CAF50;
-                    background-color: #555;
-                }}
-            """)
-            checkbox.toggled.connect(lambda state, index=i: self.update_frame_selection(state, index))
-
-            # Widget'ları layout'a ekle
-            frame_card_layout.addWidget(thumb_label)
-            frame_card_layout.addWidget(checkbox, alignment=Qt.AlignCenter)
-
-            # Frame card'ı grid'e ekle
-            self.frame_banners_layout.addWidget(frame_card, row, col)
-        
-        # Grid'i yeniden düzenle
-        self.frame_banners_content.updateGeometry()
-        self.frame_banners_scroll_area.updateGeometry()
-
-    def update_frame_selection(self, state, index):
-        if 0 <= index < len(self.processed_frames_info):
-            self.processed_frames_info[index]["selected"] = state
-            
-            selected_count = sum(1 for info in self.processed_frames_info if info["selected"])
-            total_count = len(self.processed_frames_info)
-            
-            if hasattr(self, 'selection_info_label'):
-                if selected_count == 0:
-                    self.selection_info_label.setText("⚠️ No frames selected!")
-                    self.selection_info_label.setStyleSheet("color: #FF5252; font-size: 14px; font-weight: bold; padding: 8px;")
-                elif selected_count == total_count:
-                    self.selection_info_label.setText("✅ All frames are selected")
-                    self.selection_info_label.setStyleSheet("color: #4CAF50; font-size: 14px; font-weight: bold; padding: 8px;")
-                else:
-                    self.selection_info_label.setText(f"📊 {selected_count}/{total_count} frame selected")
-                    self.selection_info_label.setStyleSheet("color: #FFC107; font-size: 14px; font-weight: bold; padding: 8px;")
+                self.selection_info_label.setText(f"📊 {selected_count}/{total_count} frame selected")
+                self.selection_info_label.setStyleSheet("color: #FFC107; font-size: 14px; font-weight: bold; padding: 8px;")
+
+    def _iter_selected_frames(self):
+        """Seçili karelerin bilgileri; seçim aralıkları sırayla ve ardışık olarak dolaşılır."""
+        for start, end in self.frame_selection.ranges:
+            for index in range(start, end):
+                yield self.processed_frames_info[index]
 
     def generate_final_video(self):
         output_choice = "integrated"
@@ -895,8 +960,7 @@ class HomePageWidget(QWidget):
         os.makedirs(output_dir, exist_ok=True)
         final_video_path = os.path.join(output_dir, f"{output_filename_base}_{output_choice}.mp4")
         
-        selected_infos = [info for info in self.processed_frames_info if info["selected"]]
-        if not selected_infos:
+        if self.frame_selection.count == 0:
             self.handle_processing_error("No frame selected. Cannot create video.")
             return
 
@@ -904,49 +968,68 @@ class HomePageWidget(QWidget):
         fps = int(cap.get(cv2.CAP_PROP_FPS)) or 25
         cap.release()
 
-        first_frame_path = selected_infos[0]["radar_path"] if output_choice == "radar_only" else selected_infos[0]["annotated_path"]
-        first_frame = cv2.imread(first_frame_path)
-        if first_frame is None:
-            
-            self.handle_processing_error(f"The first frame could not be taken:: {first_frame_path}")
+        # Okuma, birleştirme ve kodlama arayüz iş parçacığını bloklamaz
+        self.export_thread = QThread()
+        self.export_worker = ExportWorker(list(self._iter_selected_frames()), final_video_path,
+                                          mode=output_choice, fps=fps)
+        self.export_worker.moveToThread(self.export_thread)
+
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.progress.connect(self.update_export_progress)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.error.connect(self.on_export_error)
+        self.export_worker.finished.connect(self.export_thread.quit)
+        self.export_worker.error.connect(self.export_thread.quit)
+        self.export_worker.finished.connect(self.export_worker.deleteLater)
+        self.export_worker.error.connect(self.export_worker.deleteLater)
+        self.export_thread.finished.connect(self.export_thread.deleteLater)
+
+        self._set_export_running(True)
+        self.update_export_progress(0, self.frame_selection.count, 0.0)
+        self.export_thread.start()
+
+    def _set_export_running(self, running):
+        """Dışa aktarma sürerken seçim kilitlenir, oluşturma düğmesi iptal düğmesine döner."""
+        self.generate_final_video_btn.clicked.disconnect()
+        if running:
+            self.generate_final_video_btn.setText("⏹ Cancel Export")
+            self.generate_final_video_btn.clicked.connect(self.cancel_export)
+        else:
+            self.generate_final_video_btn.setText("🎥 Create Final Video")
+            self.generate_final_video_btn.clicked.connect(self.generate_final_video)
+            self.export_worker = None
+        self.generate_final_video_btn.setEnabled(True)
+        self.cancel_frame_selection_btn.setEnabled(not running)
+        self.frame_grid_view.setEnabled(not running)
+        self.selection_timeline.setEnabled(not running)
+
+    def update_export_progress(self, written, total, fps):
+        self.selection_info_label.setText(f"🎬 Exporting {written}/{total} frames · {fps:.1f} FPS")
+        self.selection_info_label.setStyleSheet("color: #2196F3; font-size: 14px; font-weight: bold; padding: 8px;")
+
+    def cancel_export(self):
+        if self.export_worker:
+            self.export_worker.stop()
+            self.generate_final_video_btn.setEnabled(False)
+
+    def on_export_finished(self, final_video_path, stats):
+        self._set_export_running(False)
+        if stats['cancelled']:
+            self.update_selection_info(self.frame_selection.count, len(self.processed_frames_info))
+            QMessageBox.information(self, "Cancelled", "Video export was canceled. Your frame selection was kept.")
             return
-        height, width, _ = first_frame.shape
-
-        writer = cv2.VideoWriter(final_video_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
-
-        for info in selected_infos:
-            frame_to_write = None
-            if output_choice == "annotated_only":
-                frame_to_write = cv2.imread(info["annotated_path"])
-            elif output_choice == "radar_only":
-                frame_to_write = cv2.imread(info["radar_path"])
-            elif output_choice == "integrated":
-                main_frame = cv2.imread(info["annotated_path"])
-                radar_frame = cv2.imread(info["radar_path"])
-                if main_frame is None or radar_frame is None: continue
-
-                radar_h, radar_w, _ = radar_frame.shape
-                new_radar_w = int(width * 0.2)
-                new_radar_h = int(radar_h * (new_radar_w / radar_w))
-                radar_small = cv2.resize(radar_frame, (new_radar_w, new_radar_h))
-                
-                y_offset = height - new_radar_h - 10
-                x_offset = (width - new_radar_w) // 2
-                
-                main_frame[y_offset:y_offset+new_radar_h, x_offset:x_offset+new_radar_w] = radar_small
-                frame_to_write = main_frame
-            
-            if frame_to_write is not None:
-                writer.write(frame_to_write)
-        
-        writer.release()
-        
-        QMessageBox.information(self, "Successful", f"Video created successfully!\nLocation: {final_video_path}")
+
+        QMessageBox.information(self, "Successful", f"Video created successfully!\nLocation: {final_video_path}\n"
+                                f"{stats['frames']} frames in {stats['seconds']:.1f} s ({stats['fps']:.1f} FPS)")
         self._reset_ui_for_new_process()
         self._set_input_enabled(True)
         self.upload_btn.setText("Select a new video...")
         self.video_processed.emit(final_video_path) # İşlem bitiminde sinyal gönder
 
+    def on_export_error(self, error_message):
+        self._set_export_running(False)
+        self.handle_processing_error(error_message)
+
     def resizeEvent(self, event):
         """Pencere boyutu değiştiğinde responsive güncelleme"""
         super().resizeEvent(event)
@@ -968,6 +1051,8 @@ class HomePageWidget(QWidget):
         if hasattr(self, 'annotated_preview_label') and hasattr(self, 'radar_preview_label'):
             self.annotated_preview_label.setFixedSize(sizes['preview_width'], sizes['preview_height'])
             self.radar_preview_label.setFixedSize(sizes['preview_width'], sizes['preview_height'])
+            if getattr(self, 'worker', None) is not None and self.progress_frame.isVisible():
+                self.worker.set_preview_size(sizes['preview_width'], sizes['preview_height'])
             
             # Container boyutlarını güncelle
             if hasattr(self, 'annotated_preview_label'):
@@ -980,14 +1065,10 @@ class HomePageWidget(QWidget):
                 if parent:
                     parent.setFixedSize(sizes['preview_container_width'], sizes['preview_container_height'])
         
-        # Scroll area height güncelle
-        if hasattr(self, 'frame_banners_scroll_area'):
+        # Grid yüksekliği ve kart boyutları güncelle (seçim korunur)
+        if hasattr(self, 'frame_grid_view'):
             if self.is_small_screen:
-                self.frame_banners_scroll_area.setMinimumHeight(400)
+                self.frame_grid_view.setMinimumHeight(400)
             else:
-                self.frame_banners_scroll_area.setMinimumHeight(600)
-        
-        # Eğer kare seçimi görünüyorsa, grid'i yeniden oluştur
-        if hasattr(self, 'post_process_frame') and self.post_process_frame.isVisible():
-            if hasattr(self, 'processed_frames_info') and self.processed_frames_info:
-                self.populate_frame_selection_grid()
\ No newline at end of file
+                self.frame_grid_view.setMinimumHeight(600)
+            self.frame_grid_view.apply_sizes(sizes, self.is_small_screen)
\ No newline at end of file
@@ -0,0 +1,238 @@
+# pages/job_queue_page.py
+import os
+import platform
+import signal
+import subprocess
+import sys
+import threading
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QSpinBox, QComboBox,
+                             QFileDialog, QMessageBox)
+from PyQt5.QtGui import QCursor, QColor
+from PyQt5.QtCore import Qt, QTimer
+
+from ui.styles import SIMPLE_STYLES
+from utils.job_queue import JOB_STATUSES, JobQueue
+
+STATUS_COLORS = {
+    'queued': "#FFC107",
+    'running': "#2196F3",
+    'done': "#4CAF50",
+    'failed': "#FF5252",
+    'cancelled': "#888888",
+}
+
+OUTPUT_MODES = (("Integrated", 'integrated'), ("Annotated only", 'annotated_only'), ("Radar only", 'radar_only'))
+
+
+class JobQueuePage(QWidget):
+    """
+    Kalıcı iş kuyruğunu gösterir: video ekleme, iptal, yeniden deneme ve worker
+    zamanlayıcısını başlatma/durdurma. Zamanlayıcı ayrı bir süreçtir; arayüz
+    kapansa da çalışmaya devam eder. Liste sayfa görünürken saniyede bir yenilenir.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("background-color: #2F3136; color: white;")
+        self.queue = JobQueue()
+        self.scheduler_process = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        main_layout.setSpacing(15)
+
+        title = QLabel("Job Queue")
+        title.setStyleSheet("font-weight: bold; color: white; font-size: 18px;")
+        main_layout.addWidget(title)
+
+        # Video ekleme: öncelik ve çıktı türü
+        submit_layout = QHBoxLayout()
+        add_btn = QPushButton("Add Videos...")
+        add_btn.setStyleSheet(SIMPLE_STYLES["button_primary"])
+        add_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        add_btn.clicked.connect(self.add_videos)
+        submit_layout.addWidget(add_btn)
+
+        submit_layout.addWidget(QLabel("Priority:"))
+        self.priority_spin = QSpinBox()
+        self.priority_spin.setRange(-100, 100)
+        submit_layout.addWidget(self.priority_spin)
+
+        submit_layout.addWidget(QLabel("Output:"))
+        self.mode_combo = QComboBox()
+        for label, mode in OUTPUT_MODES:
+            self.mode_combo.addItem(label, mode)
+        submit_layout.addWidget(self.mode_combo)
+        submit_layout.addStretch()
+
+        submit_layout.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(1, os.cpu_count() or 1))
+        submit_layout.addWidget(self.workers_spin)
+        self.scheduler_btn = QPushButton("Start Workers")
+        self.scheduler_btn.setStyleSheet(SIMPLE_STYLES["secondary_button"])
+        self.scheduler_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.scheduler_btn.clicked.connect(self.toggle_scheduler)
+        submit_layout.addWidget(self.scheduler_btn)
+        main_layout.addLayout(submit_layout)
+
+        self.jobs_table = QTableWidget(0, 7)
+        self.jobs_table.setHorizontalHeaderLabels(["ID", "Video", "Priority", "Status", "Progress", "Worker", "Info"])
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        header = self.jobs_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(6, QHeaderView.Stretch)
+        self.jobs_table.setStyleSheet("""
+            QTableWidget { background-color: #36393f; gridline-color: #444; border-radius: 8px; }
+            QHeaderView::section { background-color: #2A2A2A; color: #BBBBBB; padding: 6px; border: none; }
+        """)
+        main_layout.addWidget(self.jobs_table, 1)
+
+        action_layout = QHBoxLayout()
+        self.counts_label = QLabel("-")
+        self.counts_label.setStyleSheet("color: #BBBBBB; font-size: 13px;")
+        action_layout.addWidget(self.counts_label)
+        action_layout.addStretch()
+        for text, handler in (("Cancel Selected", self.cancel_selected), ("Retry Selected", self.retry_selected),
+                              ("Clear Finished", self.clear_finished)):
+            btn = QPushButton(text)
+            btn.setStyleSheet(SIMPLE_STYLES["secondary_button"])
+            btn.setCursor(QCursor(Qt.PointingHandCursor))
+            btn.clicked.connect(handler)
+            action_layout.addWidget(btn)
+        main_layout.addLayout(action_layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start(1000)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh(self):
+        # Seçim satır yerine iş kimliğiyle korunur; işler durum değiştikçe sıraları değişir
+        selected = set(self._selected_job_ids())
+        jobs = self.queue.list()
+        self.jobs_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            status = job['status']
+            if status == 'running':
+                progress = (f"%{job['progress'] * 100:.0f} · {job['frames_done']}/{job['total_frames']} "
+                            f"· {job['fps']:.1f} FPS")
+            elif status == 'done':
+                progress = "%100"
+            else:
+                progress = ""
+            if status == 'done' and job['result']:
+                info = f"{job['result']['frames']} frames in {job['result']['seconds']:.0f} s"
+            else:
+                info = job['error'] or ("Cancel requested" if job['cancel_requested'] else "")
+            values = (str(job['id']), os.path.basename(job['video']), str(job['priority']), status,
+                      progress, job['worker'] or "", info)
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 0:
+                    item.setData(Qt.UserRole, job['id'])
+                if column == 3:
+                    item.setForeground(QColor(STATUS_COLORS.get(status, "#FFFFFF")))
+                if column == 1:
+                    item.setToolTip(job['video'])
+                self.jobs_table.setItem(row, column, item)
+
+        self.jobs_table.clearSelection()
+        for row, job in enumerate(jobs):
+            if job['id'] in selected:
+                self.jobs_table.selectRow(row)
+
+        counts = self.queue.counts()
+        self.counts_label.setText(" · ".join(f"{status}: {counts[status]}" for status in JOB_STATUSES))
+        self._update_scheduler_button()
+
+    def _selected_job_ids(self):
+        rows = {index.row() for index in self.jobs_table.selectionModel().selectedRows()}
+        return [self.jobs_table.item(row, 0).data(Qt.UserRole) for row in sorted(rows)
+                if self.jobs_table.item(row, 0) is not None]
+
+    def add_videos(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Videos", os.path.join(os.getcwd(), "videos"),
+                                                     "Video Files (*.mp4 *.avi)")
+        self.submit_videos(file_paths)
+
+    def submit_videos(self, file_paths, priority=None, mode=None):
+        """Videoları kuyruğa ekler; diğer sayfalardan da çağrılabilir."""
+        priority = self.priority_spin.value() if priority is None else priority
+        settings = {'modes': [mode or self.mode_combo.currentData()]}
+        for path in file_paths:
+            self.queue.submit(path, settings, priority=priority, output_dir=os.path.join(os.getcwd(), "outputs"))
+        if file_paths:
+            self.refresh()
+
+    def cancel_selected(self):
+        for job_id in self._selected_job_ids():
+            self.queue.cancel(job_id)
+        self.refresh()
+
+    def retry_selected(self):
+        for job_id in self._selected_job_ids():
+            self.queue.retry(job_id)
+        self.refresh()
+
+    def clear_finished(self):
+        self.queue.clear_finished()
+        self.refresh()
+
+    def _running_scheduler_pid(self):
+        """
+        Çalışan zamanlayıcının pid'i. Arayüz yeniden açıldıysa önceki oturumda başlatılan
+        (hâlâ çalışan) zamanlayıcı kuyruk veritabanındaki kaydından bulunur.
+        """
+        if self.scheduler_process is not None:
+            if self.scheduler_process.poll() is None:
+                return self.scheduler_process.pid
+            self.scheduler_process = None
+        scheduler = self.queue.running_scheduler()
+        return scheduler['pid'] if scheduler else None
+
+    def _update_scheduler_button(self):
+        running = self._running_scheduler_pid() is not None
+        self.scheduler_btn.setText("Stop Workers" if running else "Start Workers")
+        self.workers_spin.setEnabled(not running)
+
+    def toggle_scheduler(self):
+        pid = self._running_scheduler_pid()
+        if pid is not None:
+            # SIGTERM: worker'lar çalışan işleri kuyruğa geri bırakıp kapanır. Kapanma birkaç
+            # saniye sürebilir; süreç arayüzü bekletmeden arka planda toplanır (zombi kalmaz)
+            if self.scheduler_process is not None:
+                process, self.scheduler_process = self.scheduler_process, None
+                process.terminate()
+                threading.Thread(target=process.wait, name="scheduler-reaper", daemon=True).start()
+            else:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError as e:
+                    QMessageBox.warning(self, "Error", f"The workers could not be stopped: {str(e)}")
+        else:
+            command = [sys.executable, "-m", "utils.cli", "schedule", "--workers", str(self.workers_spin.value()),
+                       "--queue", os.path.abspath(self.queue.db_path)]
+            # Zamanlayıcı arayüzden bağımsız süreç grubunda çalışır; uygulama kapansa da sürer.
+            # Model yolları arayüzdeki gibi çalışma dizinine göredir
+            if platform.system() == "Windows":
+                kwargs = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                kwargs = {'start_new_session': True}
+            try:
+                self.scheduler_process = subprocess.Popen(command, cwd=os.getcwd(), **kwargs)
+            except OSError as e:
+                QMessageBox.warning(self, "Error", f"The workers could not be started: {str(e)}")
+        self._update_scheduler_button()
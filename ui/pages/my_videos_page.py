@@ -1,20 +1,29 @@
 # pages/my_videos_page.py
 import os
-import cv2
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
                            QFrame, QScrollArea, QGridLayout)
-from PyQt5.QtGui import QCursor, QPixmap, QImage, QMovie
+from PyQt5.QtGui import QCursor, QMovie
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 
+from ui.media_loader import MediaProbeLoader, thumbnail_pixmap
 from ui.styles import SIMPLE_STYLES
+from utils.media_index import MediaIndex, duration_text, file_signature
 
 class MyVideosPage(QWidget):
     video_selected_for_processing = pyqtSignal(str) 
+    video_queued = pyqtSignal(str) # İş kuyruğuna eklenecek video
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("background-color: #2F3136; color: white;")
         self.loading_label = None
+        # Küçük resim ve süre bilgileri kalıcı dizinden gelir; yalnızca yeni/değişen dosyalar incelenir
+        self.media_index = MediaIndex()
+        self.media_loader = MediaProbeLoader(self.media_index)
+        self.media_loader.signals.probed.connect(self._on_video_probed)
+        self.video_cards = {}
+        self.video_listing = None
+        self.grid_columns = None
         self.init_ui()
         # load_videos burada çağrılmamalı, çünkü her sayfa geçişinde refresh olması istenir
         # init_ui sonrasında load_videos yerine, dashboard_window'da switch_page'den çağrılmalı
@@ -74,17 +83,23 @@ class MyVideosPage(QWidget):
         self.videos_scroll_area.show()
 
     def load_videos(self):
-        self.show_loading()
-        
+        videos_folder = os.path.join(os.getcwd(), "videos")
+        os.makedirs(videos_folder, exist_ok=True)
+        video_files = [f for f in os.listdir(videos_folder) if f.lower().endswith(('.mp4', '.avi'))]
+        video_paths = [os.path.join(videos_folder, f) for f in video_files]
+
+        # Klasör değişmediyse kartlar olduğu gibi kalır (her sayfa geçişinde yeniden kurulmaz)
+        listing = self._folder_listing(video_paths)
+        if listing == self.video_listing and self.video_cards:
+            return
+        self.video_listing = listing
+
         # Mevcut video thumbnaillerini temizle
         while self.videos_grid_layout.count():
             child = self.videos_grid_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
-
-        videos_folder = os.path.join(os.getcwd(), "videos")
-        os.makedirs(videos_folder, exist_ok=True)
-        video_files = [f for f in os.listdir(videos_folder) if f.lower().endswith(('.mp4', '.avi'))]
+        self.video_cards = {}
 
         if not video_files:
             no_videos_label = QLabel("There are no videos in the 'videos' folder yet.")
@@ -93,60 +108,55 @@ class MyVideosPage(QWidget):
             self.hide_loading()
             return
 
-        # Video thumbnaillerini yüklemek için QTimer kullan
-        self.remaining_videos = video_files.copy()
-        self.current_index = 0
-        QTimer.singleShot(100, self._load_next_video)
-
-    def _load_next_video(self):
-        if not self.remaining_videos:
+        # Kayıtlı videolar hemen gösterilir; yeni ya da değişmiş dosyalar arka planda incelenir
+        cached = 0
+        self.grid_columns = self._grid_columns()
+        for index, video_path in enumerate(video_paths):
+            record = self.media_index.get(video_path)
+            self._add_video_thumbnail(video_path, index, record)
+            if record is None:
+                self.media_loader.request(video_path)
+            else:
+                cached += 1
+        self.media_index.prune(videos_folder, video_paths)
+
+        if cached == 0:
+            self.show_loading()
+        else:
             self.hide_loading()
-            return
 
-        video_file = self.remaining_videos.pop(0)
-        video_path = os.path.join(os.getcwd(), "videos", video_file)
-        self._add_video_thumbnail(video_path, self.current_index)
-        self.current_index += 1
-
-        # Sonraki video için zamanlayıcı ayarla
-        QTimer.singleShot(100, self._load_next_video)
-
-    def _add_video_thumbnail(self, video_path, index):
+    @staticmethod
+    def _folder_listing(paths):
+        listing = []
+        for path in paths:
+            try:
+                listing.append((path, file_signature(path)))
+            except OSError:
+                continue
+        return listing
+
+    def _on_video_probed(self, video_path, record):
+        card = self.video_cards.get(video_path)
+        if card is not None:
+            self._apply_media_record(card, record)
+        self.hide_loading()
+
+    def _add_video_thumbnail(self, video_path, index, record=None):
         thumbnail_card = QFrame()
         thumbnail_card.setStyleSheet(SIMPLE_STYLES["thumbnail_card"])
         thumbnail_layout = QVBoxLayout(thumbnail_card)
-        cap = cv2.VideoCapture(video_path)
-        
-        if cap.isOpened():
-            ret, frame = cap.read()
-            if ret:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = frame_rgb.shape
-                qimage = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qimage).scaled(200, 120, Qt.KeepAspectRatio)
-                thumbnail_label = QLabel()
-                thumbnail_label.setPixmap(pixmap)
-                thumbnail_label.setAlignment(Qt.AlignCenter)
-                thumbnail_layout.addWidget(thumbnail_label)
-                
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                duration = frame_count / fps
-                minutes = int(duration // 60)
-                seconds = int(duration % 60)
-                duration_text = f"{minutes:02d}:{seconds:02d}"
-                
-                # Süre etiketini oluştur
-                duration_label = QLabel(f"Duration: {duration_text}")
-                duration_label.setStyleSheet("color: #BBBBBB; font-size: 10px;")
-                duration_label.setAlignment(Qt.AlignCenter)
-                thumbnail_layout.addWidget(duration_label)
-            cap.release()
-        else:
-            thumbnail_label = QLabel("🎥")
-            thumbnail_label.setStyleSheet("font-size: 50px;")
-            thumbnail_label.setAlignment(Qt.AlignCenter)
-            thumbnail_layout.addWidget(thumbnail_label)
+
+        thumbnail_label = QLabel("🎥")
+        thumbnail_label.setStyleSheet("font-size: 50px;")
+        thumbnail_label.setAlignment(Qt.AlignCenter)
+        thumbnail_layout.addWidget(thumbnail_label)
+
+        # Süre etiketi bilgi gelene kadar gizli
+        duration_label = QLabel()
+        duration_label.setStyleSheet("color: #BBBBBB; font-size: 10px;")
+        duration_label.setAlignment(Qt.AlignCenter)
+        duration_label.hide()
+        thumbnail_layout.addWidget(duration_label)
 
         file_name_label = QLabel(os.path.basename(video_path))
         file_name_label.setStyleSheet("color: white; font-size: 12px; font-weight: bold;")
@@ -158,16 +168,43 @@ class MyVideosPage(QWidget):
         process_btn.setCursor(QCursor(Qt.PointingHandCursor))
         process_btn.clicked.connect(lambda: self.video_selected_for_processing.emit(video_path))
         thumbnail_layout.addWidget(process_btn)
-        
+        queue_btn = QPushButton("Add to Queue")
+        queue_btn.setStyleSheet(SIMPLE_STYLES["secondary_button"])
+        queue_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        queue_btn.clicked.connect(lambda: self.video_queued.emit(video_path))
+        thumbnail_layout.addWidget(queue_btn)
+
+        card = {'frame': thumbnail_card, 'thumbnail': thumbnail_label, 'duration': duration_label}
+        self.video_cards[video_path] = card
+        if record is not None:
+            self._apply_media_record(card, record)
+
+        columns = self.grid_columns
+        self.videos_grid_layout.addWidget(thumbnail_card, index // columns, index % columns)
+
+    def _apply_media_record(self, card, record):
+        pixmap = thumbnail_pixmap(record)
+        if pixmap.isNull():
+            return
+        card['thumbnail'].setStyleSheet("")
+        card['thumbnail'].setPixmap(pixmap)
+        card['duration'].setText(f"Duration: {duration_text(record['duration_s'])}")
+        card['duration'].show()
+
+    def _grid_columns(self):
         viewport_width = self.videos_scroll_area.viewport().width()
         thumbnail_width = 220  # 200px thumbnail + 20px margins
-        columns = max(1, viewport_width // thumbnail_width)
-        row = index // columns
-        col = index % columns
-        self.videos_grid_layout.addWidget(thumbnail_card, row, col)
-        
+        return max(1, viewport_width // thumbnail_width)
+
+    def _relayout(self):
+        """Kartları yeni sütun sayısına göre yeniden dizer; videolar yeniden okunmaz."""
+        columns = self._grid_columns()
+        if columns == self.grid_columns:
+            return
+        self.grid_columns = columns
+        for index, card in enumerate(self.video_cards.values()):
+            self.videos_grid_layout.addWidget(card['frame'], index // columns, index % columns)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # Sayfa yeniden boyutlandırıldığında videoları tekrar yükle
-        if hasattr(self, 'remaining_videos'):
-            self.load_videos()
\ No newline at end of file
+        self._relayout()
@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 from typing import Optional, List, Tuple
 import cv2
 import supervision as sv
@@ -16,93 +17,85 @@ def draw_pitch(
         height: int = 756
 ) -> np.ndarray:
 
-    # Belirtilen boyut ve renkte saha arkaplanı oluştur
-    pitch = np.ones((height, width, 3), dtype=np.uint8) * np.array(background_color.as_bgr(), dtype=np.uint8)
-
-    # Saha çizgilerini çiz
-    for edge in config.edges:
-        # 1-indexed olduğu için -1 yaparak 0-indexed'e dönüştür
-        start_idx, end_idx = edge
-        start = config.vertices[start_idx - 1]
-        end = config.vertices[end_idx - 1]
+    # Saha arkaplanı her radar karesinde aynıdır; önbellekteki görüntünün kopyası döndürülür
+    base = _render_pitch(
+        config.geometry, background_color.as_bgr(), line_color.as_bgr(),
+        padding, line_thickness, point_radius, scale, width, height
+    )
+    return base.copy()
+
+
+@lru_cache(maxsize=16)
+def _render_pitch(
+        geometry: 'PitchGeometry',
+        background_bgr: Tuple[int, int, int],
+        line_bgr: Tuple[int, int, int],
+        padding: int,
+        line_thickness: int,
+        point_radius: int,
+        scale: float,
+        width: int,
+        height: int
+) -> np.ndarray:
+    layout = geometry.radar_layout(scale=scale, padding=padding)
 
-        # Koordinatları ölçekle ve padding ekle
-        start_x, start_y = int(start[0] * scale) + padding, int(start[1] * scale) + padding
-        end_x, end_y = int(end[0] * scale) + padding, int(end[1] * scale) + padding
+    # Belirtilen boyut ve renkte saha arkaplanı oluştur
+    pitch = np.ones((height, width, 3), dtype=np.uint8) * np.array(background_bgr, dtype=np.uint8)
 
-        # Çizgiyi çiz
-        cv2.line(
-            img=pitch,
-            pt1=(start_x, start_y),
-            pt2=(end_x, end_y),
-            color=line_color.as_bgr(),
-            thickness=line_thickness
-        )
+    # Saha çizgilerini tek çağrıda çiz (kenarlar önceden piksele ölçeklenmiş)
+    cv2.polylines(
+        img=pitch,
+        pts=list(layout.edge_segments_px),
+        isClosed=False,
+        color=line_bgr,
+        thickness=line_thickness
+    )
 
     # Orta saha dairesini çiz
-    center_circle_center = (
-        int(config.length * scale / 2) + padding,
-        int(config.width * scale / 2) + padding
-    )
     cv2.circle(
         img=pitch,
-        center=center_circle_center,
-        radius=int(config.centre_circle_radius * scale),
-        color=line_color.as_bgr(),
+        center=layout.centre_px,
+        radius=layout.centre_circle_radius_px,
+        color=line_bgr,
         thickness=line_thickness
     )
 
-    # Penaltı noktalarını çiz
-    penalty_spots = [
-        (int(config.penalty_spot_distance * scale) + padding,
-         int(config.width * scale / 2) + padding),
-        (int(config.length * scale) - int(config.penalty_spot_distance * scale) + padding,
-         int(config.width * scale / 2) + padding)
-    ]
-
     # Ceza sahası yaylarını çiz
-    # Sol ceza sahası yayı
-    left_penalty_arc_center = (
-        int(config.penalty_spot_distance * scale) + padding,
-        int(config.width * scale / 2) + padding
-    )
-
     # Yayın başlangıç ve bitiş açıları (penaltı noktasından bakıldığında ceza sahasının dışında kalan yay)
     # Açılar derece cinsinden ve saat yönünün tersine
+    left_penalty_arc_center, right_penalty_arc_center = layout.penalty_spots_px
     draw_penalty_arc(
         pitch=pitch,
         center=left_penalty_arc_center,
-        radius=int(config.penalty_arc_radius * scale),
+        radius=layout.penalty_arc_radius_px,
         start_angle=-50,  # Yaklaşık başlangıç açısı
         end_angle=50,  # Yaklaşık bitiş açısı
-        color=line_color.as_bgr(),
+        color=line_bgr,
         thickness=line_thickness
     )
 
     # Sağ ceza sahası yayı
-    right_penalty_arc_center = (
-        int(config.length * scale) - int(config.penalty_spot_distance * scale) + padding,
-        int(config.width * scale / 2) + padding
-    )
     draw_penalty_arc(
         pitch=pitch,
         center=right_penalty_arc_center,
-        radius=int(config.penalty_arc_radius * scale),
+        radius=layout.penalty_arc_radius_px,
         start_angle=130,  # Yaklaşık başlangıç açısı
         end_angle=230,  # Yaklaşık bitiş açısı
-        color=line_color.as_bgr(),
+        color=line_bgr,
         thickness=line_thickness
     )
 
-    for spot in penalty_spots:
+    # Penaltı noktalarını çiz
+    for spot in layout.penalty_spots_px:
         cv2.circle(
             img=pitch,
             center=spot,
             radius=point_radius,
-            color=line_color.as_bgr(),
+            color=line_bgr,
             thickness=-1  # İçi dolu daire
         )
 
+    pitch.setflags(write=False)
     return pitch
 
 def draw_penalty_arc(
@@ -146,12 +139,11 @@ def draw_points_on_pitch(
             scale=scale
         )
 
-    # Her bir noktayı çiz
-    for point in xy:
-        # Koordinatları ölçekle ve padding ekle
-        scaled_x = int(point[0] * scale) + padding
-        scaled_y = int(point[1] * scale) + padding
+    # Koordinatları ölçekle ve padding ekle
+    layout = config.geometry.radar_layout(scale=scale, padding=padding)
 
+    # Her bir noktayı çiz
+    for scaled_x, scaled_y in layout.to_pixels(xy).tolist():
         # İçi dolu daire çiz
         cv2.circle(
             img=pitch,
@@ -199,27 +191,21 @@ def draw_paths_on_pitch(
         colors = colors * (len(paths) // len(colors) + 1)
         colors = colors[:len(paths)]
 
+    layout = config.geometry.radar_layout(scale=scale, padding=padding)
+
     # Her bir yolu çiz
     for i, path in enumerate(paths):
         # Boş yolları atla
         if path.size == 0 or len(path) < 2:
             continue
 
-        # Koordinatları ölçekle ve padding ekle
-        scaled_path = []
-        for point in path:
-            scaled_x = int(point[0] * scale) + padding
-            scaled_y = int(point[1] * scale) + padding
-            scaled_path.append((scaled_x, scaled_y))
-
-        # Ardışık noktaları çizgilerle birleştir
-        for j in range(len(scaled_path) - 1):
-            cv2.line(
-                img=pitch,
-                pt1=scaled_path[j],
-                pt2=scaled_path[j + 1],
-                color=colors[i].as_bgr(),
-                thickness=thickness
-            )
+        # Koordinatları ölçekle, padding ekle ve ardışık noktaları tek çağrıda birleştir
+        cv2.polylines(
+            img=pitch,
+            pts=[layout.to_pixels(path)],
+            isClosed=False,
+            color=colors[i].as_bgr(),
+            thickness=thickness
+        )
 
     return pitch
\ No newline at end of file
@@ -9,17 +9,35 @@ import collections
 # Bu importlar kendi projenizdeki dosya yapılandırmanıza göre düzenlenmelidir.
 from utils.config import SoccerPitchConfiguration
 from utils.Draw import draw_points_on_pitch, draw_pitch, draw_paths_on_pitch
-from utils.view import ViewTransformer
+from utils.view import ViewTransformer, HomographyCache
+from utils.profiler import StageProfiler
+from utils.calibration import CalibrationStore, compute_fingerprint
+from utils.scene import ShotClassifier, PitchRegionFilter, SHOT_WIDE, SHOT_CLOSE_UP, SHOT_TYPES
+from utils.video_io import open_frame_source
+from utils.tracking import MultiClassTracker
+from utils.reid import ReIDGallery, jersey_embedding
 import concurrent.futures
-# PyQt5 ve UI sınıfı için importlar (PyQt6'dan PyQt5'e değiştirildi)
+import os
+import time
 import sys
-from PyQt5.QtWidgets import QApplication, QMessageBox
 
 # --- MODEL PATHS (Lütfen kendi model yollarınızla güncelleyin) ---
 PLAYER_MODEL_PATH = "./models/players.pt"
 KEYPOINT_MODEL_PATH = "./models/keypoints.pt"
 BALL_MODEL_PATH = "./models/ball.pt"
 
+# Oyuncu modelinin kişi sınıfları: (sonuç anahtarı, model sınıf adı, varsayılan id)
+PERSON_CLASSES = (
+    ('players', 'player', 0),
+    ('goalkeepers', 'goalkeeper', 1),
+    ('referees', 'referee', 2),
+)
+
+# Saha izdüşümünün yapıldığı tespit grupları ve Detections.data alan adları
+PITCH_PROJECTION_KEYS = ('players', 'goalkeepers', 'referees', 'ball')
+PITCH_XY_FIELD = 'pitch_xy'
+ON_PITCH_FIELD = 'on_pitch'
+
 class FrameAnnotator:
     """
     Handles the annotation of frames with various detections
@@ -200,11 +218,14 @@ class FrameProcessor:
         self.player_model = None
         self.keypoint_model = None
         self.ball_model = None
+        self.model_paths = ()  # load_models ile yüklenen ağırlık dosyaları (analiz önbelleği anahtarı için)
         self.class_ids = {}
-        self.player_tracker = sv.ByteTrack()
-        self.goalkeeper_tracker = sv.ByteTrack()
-        self.referee_tracker = sv.ByteTrack()
+        self.person_class_lut = self._build_person_class_lut()
+        # Oyuncu, kaleci ve hakemler tek takipçide; top ayrı modelden geldiği için ayrı takip edilir
+        self.person_tracker = MultiClassTracker([key for key, _, _ in PERSON_CLASSES])
         self.ball_tracker = sv.ByteTrack()
+        # Kaybolup yeni id ile dönen oyuncuları forma histogramıyla eski id'ye bağlar
+        self.reid = ReIDGallery()
         self.movement_history = {}
         self.path_history_length = 50
         self.team0_centroid = None
@@ -214,6 +235,20 @@ class FrameProcessor:
         self.last_seen_players = {}  # {tracker_id: {'bbox': ..., 'frame': ..., 'team': ...}}
         self.max_missing_frames = 20  # Kaç frame boyunca kaybolan oyuncu gösterilsin
         self.last_successful_transformer = None
+        # Homografi: MAGSAC/RANSAC ile kestirilir, son kabul edilenler önbellekte tutulur
+        self.homography_method = 'magsac'
+        self.homography_threshold = 100.0  # saha birimi (cm)
+        self.max_reprojection_error = 150.0
+        self.min_refit_keypoints = 6  # bundan az güvenilir keypoint varsa önbellekteki homografi tercih edilir
+        self.homography_cache = HomographyCache()
+        # Ayak noktası saha dışında kalan kişi tespitleri takipten önce elenir
+        self.pitch_filter = PitchRegionFilter(pitch_config.length, pitch_config.width) if pitch_config else None
+        self.pitch_filter_enabled = True
+        # Çalışma boyunca görülen en iyi homografi: (score, matrix, fingerprint, frame_size)
+        self.best_calibration = None
+        self.calibration_max_score = 100.0
+        # VideoProcessor kendi profiler'ını bağlar; varsayılan olarak ölçüm kapalıdır
+        self.profiler = StageProfiler(enabled=False)
         
     def reset_state(self):
         """
@@ -227,10 +262,9 @@ class FrameProcessor:
         )
         
         # Takipçileri yeniden başlat
-        self.player_tracker = sv.ByteTrack()
-        self.goalkeeper_tracker = sv.ByteTrack()
-        self.referee_tracker = sv.ByteTrack()
+        self.person_tracker = MultiClassTracker([key for key, _, _ in PERSON_CLASSES])
         self.ball_tracker = sv.ByteTrack()
+        self.reid = ReIDGallery()
         
         # Takım rengi ve atama bilgilerini temizle
         self.team0_centroid = None
@@ -241,58 +275,167 @@ class FrameProcessor:
         # Son görülme bilgilerini temizle
         self.last_seen_players = {}
         
-        # Son başarılı transformer'ı da temizle
+        # Son başarılı transformer'ı ve homografi önbelleğini de temizle
         self.last_successful_transformer = None
-        
+        self.homography_cache.clear()
+        self.best_calibration = None
+
+    def seed_transformer(self, transformer: ViewTransformer) -> None:
+        """
+        Keypoint'lerden homografi bulunana kadar kullanılacak başlangıç transformer'ı
+        (ör. kalibrasyon önbelleğinden) ayarlar.
+        """
+        self.last_successful_transformer = transformer
+
+    def _remember_calibration(self, transformer: ViewTransformer, frame: np.ndarray) -> None:
+        """Çalışmanın en iyi skorlu homografisini ve karenin parmak izini saklar."""
+        if transformer.score > self.calibration_max_score:
+            return
+        if self.best_calibration is not None and transformer.score >= self.best_calibration[0]:
+            return
+        self.best_calibration = (transformer.score, transformer.m.copy(), compute_fingerprint(frame),
+                                 (frame.shape[1], frame.shape[0]))
+
+    # Kontrol noktasına yazılan çalışma durumu (modeller ve ayarlar hariç)
+    CHECKPOINT_ATTRIBUTES = (
+        'person_tracker', 'ball_tracker', 'reid', 'movement_history',
+        'team0_centroid', 'team1_centroid', 'team_colors_initialized', 'player_team_assignments',
+        'last_seen_players', 'last_successful_transformer', 'homography_cache', 'best_calibration',
+    )
+
+    def get_state(self) -> Dict[str, object]:
+        """Yarıda kalan bir çalışmaya devam edebilmek için takip, takım ve kalibrasyon durumu."""
+        return {name: getattr(self, name) for name in self.CHECKPOINT_ATTRIBUTES}
+
+    def set_state(self, state: Dict[str, object]) -> None:
+        """get_state ile alınmış durumu geri yükler; eksik alanlar olduğu gibi bırakılır."""
+        for name in self.CHECKPOINT_ATTRIBUTES:
+            if name in state:
+                setattr(self, name, state[name])
+
     def load_models(self, player_model_path, keypoint_model_path, ball_model_path):
-        self.player_model = YOLO(player_model_path).to(self.device)
-        self.keypoint_model = YOLO(keypoint_model_path).to(self.device)
-        self.ball_model = YOLO(ball_model_path).to(self.device)
-        
+        self.set_models(
+            YOLO(player_model_path).to(self.device),
+            YOLO(keypoint_model_path).to(self.device),
+            YOLO(ball_model_path).to(self.device),
+        )
+        self.model_paths = (player_model_path, keypoint_model_path, ball_model_path)
+
+    def config_signature(self) -> Dict[str, object]:
+        """Çıktıyı etkileyen işleme ayarları (analiz önbelleği anahtarına katılır)."""
+        return {
+            'homography_method': self.homography_method,
+            'homography_threshold': self.homography_threshold,
+            'max_reprojection_error': self.max_reprojection_error,
+            'min_refit_keypoints': self.min_refit_keypoints,
+            'pitch_filter_enabled': self.pitch_filter_enabled,
+            'max_missing_frames': self.max_missing_frames,
+            'path_history_length': self.path_history_length,
+        }
+
+    def set_models(self, player_model, keypoint_model, ball_model):
+        """
+        Önceden yüklenmiş (veya benchmark için taklit edilmiş) modelleri bağlar.
+        """
+        self.player_model = player_model
+        self.keypoint_model = keypoint_model
+        self.ball_model = ball_model
+
         if hasattr(self.player_model.model, 'names'):
             names = self.player_model.model.names
             self.class_ids = {k: v for v, k in names.items()}
 
+        # Sınıf adı eşlemesi her karede yeniden kurulmasın diye bir kez hesaplanır
+        self.person_class_lut = self._build_person_class_lut()
+
+    def _build_person_class_lut(self) -> np.ndarray:
+        """
+        Model class_id -> PERSON_CLASSES sırası tablosu. Kişi sınıfı olmayan id'ler -1 olur.
+        """
+        class_ids = [self.class_ids.get(name, default) for _, name, default in PERSON_CLASSES]
+        lut = np.full(max(class_ids + list(self.class_ids.values())) + 1, -1, dtype=np.int64)
+        for slot, class_id in enumerate(class_ids):
+            lut[class_id] = slot
+        return lut
+
+    def _split_person_detections(self, detections: sv.Detections) -> Dict[str, sv.Detections]:
+        """
+        NMS uygulanmış tespitleri tek bir argsort ile sınıflarına ayırır.
+        """
+        class_id = detections.class_id if detections.class_id is not None else np.empty(0, dtype=np.int64)
+        in_table = (class_id >= 0) & (class_id < len(self.person_class_lut))
+        slots = np.where(in_table, self.person_class_lut[np.where(in_table, class_id, 0)], -1)
+        order = np.argsort(slots, kind='stable')
+        bounds = np.searchsorted(slots[order], np.arange(len(PERSON_CLASSES) + 1))
+
+        return {key: detections[order[bounds[slot]:bounds[slot + 1]]]
+                for slot, (key, _, _) in enumerate(PERSON_CLASSES)}
+
+    def _fallback_transformer(self) -> Optional[ViewTransformer]:
+        """Önbellekteki en iyi yeni homografi, yoksa son başarılı transformer."""
+        return self.homography_cache.best() or self.last_successful_transformer
+
     def detect_keypoints(self, frame: np.ndarray) -> Optional[ViewTransformer]:
         """
         Keypoint detection yapar. Eğer keypoint bulunamazsa son başarılı transformer'ı döner.
+        Yeni homografi, yakın zamandaki bir kayıttan belirgin şekilde kötüyse önbellekteki kullanılır.
         """
-        if not self.keypoint_model or not getattr(self.pitch_config, 'vertices', None):
-            return self.last_successful_transformer
+        self.homography_cache.tick()
+        if not self.keypoint_model or self.pitch_config is None:
+            return self._fallback_transformer()
 
-        results = self.keypoint_model(frame, conf=0.45, verbose=False)[0]
+        with self.profiler.stage('keypoint_inference'):
+            results = self.keypoint_model(frame, conf=0.45, verbose=False)[0]
 
         if not hasattr(results, 'keypoints') or results.keypoints is None:
             print("Keypoints bulunamadı, son başarılı transformer kullanılıyor...")
-            return self.last_successful_transformer
+            return self._fallback_transformer()
 
         sv_keypoints = sv.KeyPoints.from_ultralytics(results)
 
         if len(sv_keypoints.xy) == 0:
             print("Keypoint array boş, son başarılı transformer kullanılıyor...")
-            return self.last_successful_transformer
+            return self._fallback_transformer()
 
         frame_pts = sv_keypoints.xy[0]
         conf = sv_keypoints.confidence[0] if sv_keypoints.confidence is not None else np.ones(len(frame_pts))
         mask = conf > 0.5
         filtered_pts = frame_pts[mask]
-        pitch_pts = np.array(self.pitch_config.vertices, dtype=np.float32)[mask]
+        pitch_pts = self.pitch_config.geometry.vertices[mask]
 
         if len(filtered_pts) < 4:
             print("Yeterli keypoint bulunamadı (< 4), son başarılı transformer kullanılıyor...")
-            return self.last_successful_transformer
+            return self._fallback_transformer()
+
+        # Zayıf keypoint setiyle yeniden kestirim yapmak yerine yakın zamandaki iyi homografiyi kullan
+        cached = self.homography_cache.best()
+        if cached is not None and len(filtered_pts) < self.min_refit_keypoints:
+            self.profiler.count('homography_reused')
+            self.last_successful_transformer = cached
+            return cached
 
         try:
             # Yeni transformer oluştur
-            new_transformer = ViewTransformer(source=filtered_pts, target=pitch_pts)
-            # Başarılı olursa son başarılı transformer'ı güncelle
-            self.last_successful_transformer = new_transformer
-            print("Yeni keypoint transformer başarıyla oluşturuldu")
-            return new_transformer
-
+            with self.profiler.stage('homography'):
+                new_transformer = ViewTransformer(
+                    source=filtered_pts, target=pitch_pts,
+                    method=self.homography_method,
+                    reprojection_threshold=self.homography_threshold,
+                    max_reprojection_error=self.max_reprojection_error,
+                )
         except Exception as e:
+            self.profiler.count('homography_rejected')
             print(f"ViewTransformer oluşturulurken hata: {e}, son başarılı transformer kullanılıyor...")
-            return self.last_successful_transformer
+            return self._fallback_transformer()
+
+        # Başarılı olursa son başarılı transformer'ı güncelle
+        self._remember_calibration(new_transformer, frame)
+        transformer = self.homography_cache.select(new_transformer)
+        if transformer is not new_transformer:
+            self.profiler.count('homography_reused')
+        self.last_successful_transformer = transformer
+        print("Yeni keypoint transformer başarıyla oluşturuldu")
+        return transformer
 
     def filter_referees_by_color(self, detections: sv.Detections, frame: np.ndarray) -> sv.Detections:
         # Takım renkleri henüz belirlenmediyse filtreleme yapma
@@ -333,44 +476,139 @@ class FrameProcessor:
                 
         return detections[filtered_indices]
 
-    def detect_objects(self, frame: np.ndarray) -> Dict[str, Optional[sv.Detections]]:
+    def _infer_people(self, frame: np.ndarray) -> Dict[str, sv.Detections]:
+        with self.profiler.stage('player_inference'):
+            dets = sv.Detections.from_ultralytics(self.player_model(frame, conf=0.45, verbose=False)[0])
+            # Tek geçişte sınıf bazlı NMS, ardından sınıflara göre ayır
+            person_dets = self._split_person_detections(dets.with_nms(threshold=0.3, class_agnostic=False))
+        self.profiler.count('detections', len(dets))
+        return person_dets
 
+    def detect_people(self, frame: np.ndarray) -> Dict[str, Optional[sv.Detections]]:
+        """
+        Yakın çekimler için yalnızca kişi tespiti: takipçiler, son görülme bilgisi ve
+        takım renkleri güncellenmez, böylece ara çekimler takip durumunu bozmaz.
+        """
         results = {'players': None, 'goalkeepers': None, 'referees': None, 'ball': None}
+        if self.player_model:
+            results.update(self._infer_people(frame))
+        return results
+
+    def infer_objects(self, frame: np.ndarray) -> Dict[str, Optional[object]]:
+        """
+        Yalnızca model çıkarımı: {'people': {players/goalkeepers/referees}, 'ball': en güvenilir top}.
+        Takipçi durumu değişmez; keypoint tespitiyle paralel çalışabilir.
+        """
+        raw = {'people': None, 'ball': None}
 
         if self.player_model:
-            dets = sv.Detections.from_ultralytics(self.player_model(frame, conf=0.45, verbose=False)[0])
-            class_map = {v: k for k, v in self.player_model.model.names.items()}
-            player_ids, goalkeeper_ids, referee_ids = [class_map.get('player', 0)], [class_map.get('goalkeeper', 1)], [
-                class_map.get('referee', 2)]
-            results['players'] = self.player_tracker.update_with_detections(
-                dets[np.isin(dets.class_id, player_ids)].with_nms(threshold=0.3))
-            if results['players'] is not None and results['players'].tracker_id is not None:
-
-                for i, tracker_id in enumerate(results['players'].tracker_id):
-                    self.last_seen_players[tracker_id] = {
-                        'bbox': results['players'].xyxy[i].copy(),
-                        'frame': 0,  # Şu anki frame'de görüldü
-                        'team': self.player_team_assignments.get(tracker_id, -1)
-                    }
-
-            results['goalkeepers'] = self.goalkeeper_tracker.update_with_detections(
-                dets[np.isin(dets.class_id, goalkeeper_ids)].with_nms(threshold=0.3))
-
-            results['referees'] = self.filter_referees_by_color(self.referee_tracker.update_with_detections(
-                dets[np.isin(dets.class_id, referee_ids)].with_nms(threshold=0.3)), frame)
+            raw['people'] = self._infer_people(frame)
 
         if self.ball_model:
 
-            ball_dets = sv.Detections.from_ultralytics(self.ball_model(frame, conf=0.1, verbose=False)[0]).with_nms(
-                threshold=0.1)
+            with self.profiler.stage('ball_inference'):
+                ball_dets = sv.Detections.from_ultralytics(
+                    self.ball_model(frame, conf=0.1, verbose=False)[0]).with_nms(threshold=0.1)
+            self.profiler.count('detections', len(ball_dets))
 
             if len(ball_dets) > 0:
-                best = ball_dets[np.argmax(ball_dets.confidence):np.argmax(ball_dets.confidence) + 1]
-                results['ball'] = self.ball_tracker.update_with_detections(best)
+                best_idx = int(np.argmax(ball_dets.confidence))
+                raw['ball'] = ball_dets[best_idx:best_idx + 1]
+
+        return raw
+
+    def filter_to_pitch(self, person_dets: Dict[str, sv.Detections], frame: np.ndarray,
+                        transformer: Optional[ViewTransformer]) -> Dict[str, sv.Detections]:
+        """
+        Ayak noktası saha dışında (tribün, yedek kulübesi) kalan kişi tespitlerini eler.
+        Üç sınıfın ayak noktaları tek seferde test edilir.
+        """
+        if self.pitch_filter is None or not self.pitch_filter_enabled:
+            return person_dets
+        keys = [key for key, _, _ in PERSON_CLASSES]
+        lengths = [len(person_dets[key]) for key in keys]
+        if sum(lengths) == 0:
+            return person_dets
+
+        with self.profiler.stage('pitch_filter'):
+            footpoints = np.concatenate([person_dets[key].get_anchors_coordinates(sv.Position.BOTTOM_CENTER)
+                                         for key in keys if len(person_dets[key])])
+            keep = self.pitch_filter.keep_mask(footpoints, frame, transformer)
+            filtered, offset = {}, 0
+            for key, length in zip(keys, lengths):
+                filtered[key] = person_dets[key][keep[offset:offset + length]] if length else person_dets[key]
+                offset += length
+        self.profiler.count('pitch_filter_dropped', int(len(keep) - keep.sum()))
+        return filtered
+
+    def track_objects(self, raw: Dict[str, Optional[object]], frame: np.ndarray,
+                      transformer: Optional[ViewTransformer] = None) -> Dict[str, Optional[sv.Detections]]:
+        """
+        infer_objects çıktısını saha maskesinden geçirir ve takipçileri günceller.
+        """
+        results = {'players': None, 'goalkeepers': None, 'referees': None, 'ball': None}
+
+        if raw['people'] is not None:
+            person_dets = self.filter_to_pitch(raw['people'], frame, transformer)
+
+            with self.profiler.stage('tracking'):
+                tracked = self._resolve_reid_aliases(self.person_tracker.update(person_dets))
+                results['players'] = tracked['players']
+                if results['players'] is not None and results['players'].tracker_id is not None:
+
+                    for i, tracker_id in enumerate(results['players'].tracker_id):
+                        self.last_seen_players[tracker_id] = {
+                            'bbox': results['players'].xyxy[i].copy(),
+                            'frame': 0,  # Şu anki frame'de görüldü
+                            'team': self.player_team_assignments.get(tracker_id, -1)
+                        }
+
+                results['goalkeepers'] = tracked['goalkeepers']
+                referees = tracked['referees']
+
+            with self.profiler.stage('referee_color_filter'):
+                results['referees'] = self.filter_referees_by_color(referees, frame)
+
+        if raw['ball'] is not None:
+            with self.profiler.stage('tracking'):
+                results['ball'] = self.ball_tracker.update_with_detections(raw['ball'])
+
+        self.profiler.count('tracked_objects', sum(
+            len(dets) for dets in results.values() if dets is not None and dets.tracker_id is not None))
+
+        self._age_last_seen_players(results)
+        return results
+
+    def _resolve_reid_aliases(self, tracked: Dict[str, sv.Detections]) -> Dict[str, sv.Detections]:
+        """Re-ID ile eski kimliğe bağlanmış izlerin id'lerini tüm sınıflar için birlikte çevirir."""
+        keys = [key for key, _, _ in PERSON_CLASSES if tracked[key].tracker_id is not None and len(tracked[key])]
+        if not keys or not self.reid.aliases:
+            return tracked
+        resolved = self.reid.resolve(np.concatenate([tracked[key].tracker_id for key in keys]))
+        offset = 0
+        for key in keys:
+            count = len(tracked[key])
+            tracked[key].tracker_id = resolved[offset:offset + count]
+            offset += count
+        return tracked
+
+    def detect_objects(self, frame: np.ndarray,
+                       transformer: Optional[ViewTransformer] = None) -> Dict[str, Optional[sv.Detections]]:
+        """
+        Çıkarım ve takip tek çağrıda. Homografi verilmezse son başarılı transformer
+        saha maskesi için kullanılır.
+        """
+        return self.track_objects(self.infer_objects(frame), frame,
+                                  transformer if transformer is not None else self.last_successful_transformer)
+
+    def _age_last_seen_players(self, results: Dict[str, Optional[sv.Detections]]) -> None:
+        visible_ids = set()
+        if results['players'] is not None and results['players'].tracker_id is not None:
+            visible_ids = set(results['players'].tracker_id.tolist())
 
         for tracker_id in list(self.last_seen_players.keys()):
 
-            if results['players'] is None or tracker_id not in results['players'].tracker_id:
+            if tracker_id not in visible_ids:
                 self.last_seen_players[tracker_id]['frame'] += 1
 
                 if self.last_seen_players[tracker_id]['frame'] > self.max_missing_frames:
@@ -379,21 +617,60 @@ class FrameProcessor:
             else:
                 self.last_seen_players[tracker_id]['frame'] = 0  # Yeniden görüldü
 
-        return results
-
     def annotate_original_frame(self, frame: np.ndarray, detections: Dict[str, Optional[sv.Detections]],
                                 annotator: FrameAnnotator, show_jersey_analysis: bool = True) -> np.ndarray:
         team_centroids = {0: self.team0_centroid, 1: self.team1_centroid} if show_jersey_analysis else None
-        annotated = annotator.annotate_frame(
-            frame,
-            detections,
-            team_assignments=self.player_team_assignments if show_jersey_analysis else None,
-            team_centroids=team_centroids,
-            show_jersey_regions=show_jersey_analysis
-        )
+        with self.profiler.stage('annotation'):
+            annotated = annotator.annotate_frame(
+                frame,
+                detections,
+                team_assignments=self.player_team_assignments if show_jersey_analysis else None,
+                team_centroids=team_centroids,
+                show_jersey_regions=show_jersey_analysis
+            )
 
         return annotated
 
+    def project_to_pitch(self, detections: Dict[str, Optional[sv.Detections]], transformer: ViewTransformer) -> None:
+        """
+        Karedeki tüm oyuncu, kaleci, hakem ve top çapalarını tek bir perspectiveTransform
+        çağrısıyla saha koordinatlarına çevirir. Sonuçlar her Detections nesnesinin
+        data alanına 'pitch_xy' ve 'on_pitch' (saha sınırları içinde mi) olarak eklenir.
+        """
+        groups, anchors = [], []
+        for key in PITCH_PROJECTION_KEYS:
+            dets = detections.get(key)
+            if dets is None or len(dets) == 0:
+                continue
+            groups.append(dets)
+            anchors.append(dets.get_anchors_coordinates(
+                sv.Position.CENTER if key == 'ball' else sv.Position.BOTTOM_CENTER))
+
+        if not groups:
+            return
+
+        with self.profiler.stage('pitch_projection'):
+            pitch_xy = transformer.transform_points(np.concatenate(anchors))
+            on_pitch = ((pitch_xy[:, 0] >= 0) & (pitch_xy[:, 0] <= self.pitch_config.length) &
+                        (pitch_xy[:, 1] >= 0) & (pitch_xy[:, 1] <= self.pitch_config.width))
+
+        offset = 0
+        for dets, group_anchors in zip(groups, anchors):
+            end = offset + len(group_anchors)
+            dets.data[PITCH_XY_FIELD] = pitch_xy[offset:end]
+            dets.data[ON_PITCH_FIELD] = on_pitch[offset:end]
+            offset = end
+
+    def _pitch_coordinates(self, detections: Dict[str, Optional[sv.Detections]], key: str,
+                           transformer: ViewTransformer) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bir grubun saha koordinatları ve saha içi maskesi; karede izdüşüm henüz yapılmadıysa yapılır.
+        """
+        dets = detections[key]
+        if PITCH_XY_FIELD not in dets.data:
+            self.project_to_pitch(detections, transformer)
+        return dets.data[PITCH_XY_FIELD], dets.data[ON_PITCH_FIELD]
+
     def create_radar_image(self, detections: Dict[str, Optional[sv.Detections]], transformer: ViewTransformer,
                            include_paths: bool = True) -> np.ndarray:
         radar_image = draw_pitch(config=self.pitch_config)
@@ -405,18 +682,16 @@ class FrameProcessor:
         color_map = {'goalkeepers': sv.Color.GREEN, 'referees': sv.Color.YELLOW, 'ball': sv.Color.RED}
         player_dets = detections.get('players')
 
-        if player_dets is not None and player_dets.tracker_id is not None:
+        if player_dets is not None and len(player_dets) > 0 and player_dets.tracker_id is not None:
 
-            coords, coords_pitch = player_dets.get_anchors_coordinates(
-                sv.Position.BOTTOM_CENTER), transformer.transform_points(
-                player_dets.get_anchors_coordinates(sv.Position.BOTTOM_CENTER))
+            coords_pitch, on_pitch = self._pitch_coordinates(detections, 'players', transformer)
 
             for i, tracker_id in enumerate(player_dets.tracker_id):
 
                 team_id, color, point = self.player_team_assignments.get(tracker_id, -1), team_colors.get(
                     self.player_team_assignments.get(tracker_id, -1), sv.Color.WHITE), coords_pitch[i]
 
-                if 0 <= point[0] <= self.pitch_config.length and 0 <= point[1] <= self.pitch_config.width:
+                if on_pitch[i]:
                     radar_image = draw_points_on_pitch(config=self.pitch_config, xy=np.array([point]), face_color=color,
                                                        edge_color=sv.Color.BLACK, radius=8, pitch=radar_image)
 
@@ -425,16 +700,12 @@ class FrameProcessor:
 
             if dets is None or len(dets) == 0 or dets.tracker_id is None: continue
 
-            coords, coords_pitch = dets.get_anchors_coordinates(
-                sv.Position.CENTER if key == 'ball' else sv.Position.BOTTOM_CENTER), transformer.transform_points(
-                dets.get_anchors_coordinates(sv.Position.CENTER if key == 'ball' else sv.Position.BOTTOM_CENTER))
+            coords_pitch, on_pitch = self._pitch_coordinates(detections, key, transformer)
 
-            for point in coords_pitch:
-
-                if 0 <= point[0] <= self.pitch_config.length and 0 <= point[1] <= self.pitch_config.width:
-                    radar_image = draw_points_on_pitch(config=self.pitch_config, xy=np.array([point]),
-                                                       face_color=color_map[key], edge_color=sv.Color.BLACK,
-                                                       radius=10 if key == 'ball' else 8, pitch=radar_image)
+            # Aynı gruptaki noktalar aynı renkte olduğu için tek çağrıda çizilir
+            radar_image = draw_points_on_pitch(config=self.pitch_config, xy=coords_pitch[on_pitch],
+                                               face_color=color_map[key], edge_color=sv.Color.BLACK,
+                                               radius=10 if key == 'ball' else 8, pitch=radar_image)
 
         if include_paths:
             for tracker_id, history in self.movement_history.items():
@@ -462,10 +733,8 @@ class FrameProcessor:
         for key in ['players', 'goalkeepers', 'ball']:
             dets = detections.get(key)
 
-            if dets is None or dets.tracker_id is None: continue
-            coords, coords_pitch = dets.get_anchors_coordinates(
-                sv.Position.CENTER if key == 'ball' else sv.Position.BOTTOM_CENTER), transformer.transform_points(
-                dets.get_anchors_coordinates(sv.Position.CENTER if key == 'ball' else sv.Position.BOTTOM_CENTER))
+            if dets is None or len(dets) == 0 or dets.tracker_id is None: continue
+            coords_pitch, _ = self._pitch_coordinates(detections, key, transformer)
 
             for i, tracker_id in enumerate(dets.tracker_id):
 
@@ -500,6 +769,7 @@ class FrameProcessor:
         hsv_pixels = cv2.cvtColor(region, cv2.COLOR_RGB2HSV).reshape(-1, 3).astype(np.float32)
         kmeans = KMeans(n_clusters=num_clusters, n_init=10, random_state=0)
         kmeans.fit(hsv_pixels)
+        self.profiler.count('kmeans_fits')
         dominant_cluster_idx = np.argmax(np.bincount(kmeans.labels_))
         dominant_color_hsv = kmeans.cluster_centers_[dominant_cluster_idx]
 
@@ -513,6 +783,7 @@ class FrameProcessor:
         if dets is None or dets.tracker_id is None or len(dets) == 0: return {}
 
         dominant_colors, tracker_ids = [], []
+        reid_ids, reid_embeddings, reid_centers = [], [], []
 
         for i in range(len(dets)):
 
@@ -524,15 +795,28 @@ class FrameProcessor:
                 dominant_colors.append(color)
                 tracker_ids.append(tracker_id)
 
+            # Aynı forma bölgesinden re-ID gömmesi (renk histogramı)
+            embedding = jersey_embedding(jersey)
+            if embedding is not None:
+                reid_ids.append(tracker_id)
+                reid_embeddings.append(embedding)
+                reid_centers.append(((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2))
+
+        links = self.reid.observe(reid_ids, reid_embeddings, reid_centers, float(np.hypot(*frame.shape[:2])))
+        if links:
+            self.profiler.count('reid_links', len(links))
+
         if len(dominant_colors) < 2: return {}
 
         kmeans = KMeans(n_clusters=2, n_init=10, random_state=0).fit(dominant_colors)
+        self.profiler.count('kmeans_fits')
         self.team0_centroid, self.team1_centroid = kmeans.cluster_centers_
 
         return {tracker_ids[i]: kmeans.labels_[i] for i in range(len(tracker_ids))}
 
     def update_team_classification(self, detections: Dict[str, Optional[sv.Detections]], frame: np.ndarray) -> None:
-        current_assignments = self.classify_teams_by_jersey_color(detections, frame)
+        with self.profiler.stage('team_classification'):
+            current_assignments = self.classify_teams_by_jersey_color(detections, frame)
 
         if current_assignments: self.player_team_assignments.update(current_assignments)
 
@@ -540,21 +824,45 @@ class FrameProcessor:
 class VideoProcessor:
 
     def __init__(self, video_path: str, output_path: str, frame_processor: FrameProcessor,
-                 frame_annotator: FrameAnnotator, radar_width: int = 1600, radar_height: int = 1000):
+                 frame_annotator: FrameAnnotator, radar_width: int = 1600, radar_height: int = 1000,
+                 profiler: Optional[StageProfiler] = None, decoder: str = 'auto', prefetch: int = 8,
+                 decode_size: Optional[Tuple[int, int]] = None, hw_accel: bool = False,
+                 calibration_store: Optional[CalibrationStore] = None, skip_cutaways: bool = True):
         self.video_path = video_path
         self.output_path = output_path
         self.radar_width = radar_width
         self.radar_height = radar_height
         self.frame_processor = frame_processor
         self.frame_annotator = frame_annotator
+        # Aşama süreleri ve sayaçlar; FrameProcessor da aynı profiler'a yazar
+        self.profiler = profiler or StageProfiler(enabled=False)
+        self.frame_processor.profiler = self.profiler
+        # Video çözme seçenekleri: arka uç (auto/opencv/pyav), ön-okuma tamponu ve çıkış çözünürlüğü
+        self.decoder = decoder
+        self.prefetch = prefetch
+        self.decode_size = decode_size
+        self.hw_accel = hw_accel
+        # Kamera kalibrasyon önbelleği: ilk karede en yakın kayıtla radar başlatılır
+        self.calibration_store = calibration_store
+        self._calibration_pending = False
+        # Çekim sınıflandırıcı: yakın çekim ve saha dışı karelerde inference'ın çoğu atlanır
+        self.shot_classifier = ShotClassifier() if skip_cutaways else None
+        self.shot_stats = {shot: {'frames': 0, 'seconds': 0.0} for shot in SHOT_TYPES}
         self.cap = None
         self.total_frames = 0
+        self.duration_s = 0.0
+        self.frame_count_reliable = True
         self.last_radar = np.zeros((self.radar_height, self.radar_width, 3), dtype=np.uint8)
+        # Son işlenen karenin çekim türü ve tespitleri (tespit kaydı için)
+        self.last_shot = SHOT_WIDE
+        self.last_detections: Optional[Dict[str, Optional[sv.Detections]]] = None
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
 
-    def setup_video_io(self) -> bool:
+    def setup_video_io(self, start_frame: int = 0) -> bool:
 
-        self.cap = cv2.VideoCapture(self.video_path)
+        self.cap = open_frame_source(self.video_path, decoder=self.decoder, prefetch=self.prefetch,
+                                     target_size=self.decode_size, hw_accel=self.hw_accel,
+                                     start_frame=start_frame)
 
         if not self.cap.isOpened():
             print("Error: Could not open video file.")
@@ -564,18 +872,214 @@ class VideoProcessor:
         self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.fps = int(self.cap.get(cv2.CAP_PROP_FPS)) or 25
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.duration_s = self._probe_duration()
+        self.total_frames = self._estimate_total_frames(int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        self._calibration_pending = self.calibration_store is not None
+        if self.shot_classifier is not None:
+            self.shot_classifier.reset()
 
         return True
 
+    def config_signature(self) -> Dict[str, object]:
+        """FrameProcessor ayarlarına ek olarak çözme ve radar ayarları."""
+        return dict(self.frame_processor.config_signature(),
+                    radar_size=(self.radar_width, self.radar_height),
+                    decode_size=self.decode_size,
+                    skip_cutaways=self.shot_classifier is not None)
+
+    def get_state(self) -> Dict[str, object]:
+        """Kontrol noktası için video düzeyindeki durum (FrameProcessor durumu dahil)."""
+        return {
+            'frame_processor': self.frame_processor.get_state(),
+            'last_radar': self.last_radar,
+            'shot_stats': self.shot_stats,
+            'shot_classifier': self.shot_classifier,
+        }
+
+    def set_state(self, state: Dict[str, object]) -> None:
+        """
+        Kontrol noktasındaki durumu geri yükler; setup_video_io'dan sonra çağrılmalıdır.
+        Kalibrasyon önbelleği aranmaz, çalışmanın kendi homografileri zaten yüklenmiştir.
+        """
+        self.frame_processor.set_state(state['frame_processor'])
+        self.last_radar = state['last_radar']
+        self.shot_stats = state['shot_stats']
+        if self.shot_classifier is not None and state.get('shot_classifier') is not None:
+            self.shot_classifier = state['shot_classifier']
+        self._calibration_pending = False
+
+    def _seed_calibration(self, frame: np.ndarray) -> None:
+        """İlk karenin parmak iziyle kalibrasyon önbelleğinde eşleşme arar."""
+        self._calibration_pending = False
+        fingerprint = compute_fingerprint(frame)
+        match = self.calibration_store.match(fingerprint, (frame.shape[1], frame.shape[0]))
+        if match is None:
+            print("Kalibrasyon önbelleğinde eşleşme bulunamadı.")
+            return
+        try:
+            self.frame_processor.seed_transformer(ViewTransformer.from_matrix(match['matrix'], match['score']))
+        except ValueError as e:
+            print(f"Kalibrasyon kaydı kullanılamadı: {e}")
+            return
+        self.calibration_store.touch(match['id'])
+        print(f"Kalibrasyon önbelleğinden başlangıç homografisi yüklendi "
+              f"(mesafe: {match['distance']:.3f}, kaynak: {match['source_video']})")
+
+    def save_calibration(self) -> Optional[str]:
+        """Çalışmanın en iyi homografisini kalibrasyon önbelleğine kaydeder."""
+        best = self.frame_processor.best_calibration
+        if self.calibration_store is None or best is None:
+            return None
+        score, matrix, fingerprint, frame_size = best
+        try:
+            entry_id = self.calibration_store.add(fingerprint, matrix, score, frame_size,
+                                                  source_video=os.path.basename(self.video_path))
+        except OSError as e:
+            print(f"Kalibrasyon kaydedilemedi: {e}")
+            return None
+        print(f"Kalibrasyon kaydedildi: {entry_id} (skor: {score:.1f})")
+        return entry_id
+
+    def _probe_duration(self) -> float:
+        """
+        Konteyner süresini (sn) ayrı bir capture ile sona atlayarak bulur; asıl okuma
+        konumu etkilenmez. Süre okunamazsa 0 döner.
+        """
+        if getattr(self.cap, 'duration_s', 0) > 0:
+            return self.cap.duration_s
+
+        probe = cv2.VideoCapture(self.video_path)
+        try:
+            if not probe.isOpened() or not probe.set(cv2.CAP_PROP_POS_AVI_RATIO, 1):
+                return 0.0
+            last_frame_ms = probe.get(cv2.CAP_PROP_POS_MSEC)
+        finally:
+            probe.release()
+
+        # Son karenin zaman damgasına bir kare süresi eklenir
+        return (last_frame_ms + 1000.0 / self.fps) / 1000.0 if last_frame_ms > 0 else 0.0
+
+    def _estimate_total_frames(self, reported_frames: int) -> int:
+        """
+        CAP_PROP_FRAME_COUNT, VFR veya bozuk konteynerlerde sıkça yanlıştır.
+        Konteyner süresinden bulunan tahminle %10'dan fazla çelişirse süre tahmini kullanılır.
+        """
+        duration_frames = int(round(self.duration_s * self.fps)) if self.duration_s > 0 else 0
+        self.frame_count_reliable = True
+
+        if reported_frames <= 0 or (
+                duration_frames > 0 and abs(reported_frames - duration_frames) > 0.1 * duration_frames):
+            print(f"Kare sayısı güvenilir değil ({reported_frames}), süreden tahmin ediliyor: {duration_frames}")
+            self.frame_count_reliable = False
+            return duration_frames
+        return reported_frames
+
+    def progress_fraction(self, frames_done: int) -> float:
+        """
+        İşlenen bölümün oranı (0-1). Kare sayısı güvenilir değilse okuma konumunun
+        zaman damgası, güvenilirse kare sayısı kullanılır.
+        """
+        if not self.frame_count_reliable and self.duration_s > 0 and self.cap is not None:
+            # POS_MSEC son okunan karenin başlangıcını verir; kare süresi eklenir
+            position_s = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0 + 1.0 / self.fps
+            if position_s > 1.0 / self.fps:
+                return min(position_s / self.duration_s, 1.0)
+        if self.total_frames > 0:
+            return min(frames_done / self.total_frames, 1.0)
+        return 0.0
+
     def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        start = time.perf_counter()
+        with self.profiler.stage('process_frame'):
+            shot = self._classify_shot(frame)
+            self.last_shot = shot
+            self.last_detections = None
+            if shot == SHOT_WIDE:
+                result = self._process_frame(frame)
+            else:
+                result = self._process_cutaway(frame, shot)
+        stats = self.shot_stats[shot]
+        stats['frames'] += 1
+        stats['seconds'] += time.perf_counter() - start
+        return result
+
+    def _classify_shot(self, frame: np.ndarray) -> str:
+        if self.shot_classifier is None:
+            return SHOT_WIDE
+        with self.profiler.stage('shot_classification'):
+            shot = self.shot_classifier.classify(frame)
+        if shot != SHOT_WIDE:
+            self.profiler.count(f'skipped_{shot}')
+        return shot
+
+    def _process_cutaway(self, frame: np.ndarray, shot: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Yakın çekimde yalnızca kişi tespiti çizilir; saha dışı karede hiçbir model çalışmaz.
+        Keypoint, top, takım sınıflandırması ve radar atlanır; radar son kareyi gösterir.
+        """
+        if shot == SHOT_CLOSE_UP:
+            detections = self.frame_processor.detect_people(frame)
+            self.last_detections = detections
+            annotated = self.frame_processor.annotate_original_frame(
+                frame.copy(), detections, self.frame_annotator, show_jersey_analysis=False)
+            return annotated, self._overlay_last_radar("Close-up")
+        return frame.copy(), self._overlay_last_radar("Off-pitch view")
+
+    def detection_record(self, frame_index: int) -> Dict[str, object]:
+        """
+        Son işlenen karenin tespitleri JSON'a yazılabilir biçimde:
+        {'frame', 'shot', 'objects': [{'class', 'id', 'bbox', 'team', 'pitch'}]}.
+        Saha koordinatı yalnızca izdüşümü yapılmış ve saha içindeki nesnelerde bulunur.
+        """
+        objects = []
+        for key, dets in (self.last_detections or {}).items():
+            if dets is None or len(dets) == 0:
+                continue
+            pitch_xy = dets.data.get(PITCH_XY_FIELD)
+            on_pitch = dets.data.get(ON_PITCH_FIELD)
+            for i in range(len(dets)):
+                tracker_id = int(dets.tracker_id[i]) if dets.tracker_id is not None else None
+                objects.append({
+                    'class': key,
+                    'id': tracker_id,
+                    'bbox': [round(float(v), 1) for v in dets.xyxy[i]],
+                    'team': int(self.frame_processor.player_team_assignments.get(tracker_id, -1))
+                    if key == 'players' else None,
+                    'pitch': [round(float(v), 1) for v in pitch_xy[i]]
+                    if pitch_xy is not None and on_pitch[i] else None,
+                })
+        return {'frame': frame_index, 'shot': self.last_shot, 'objects': objects}
+
+    def shot_report(self) -> Dict[str, object]:
+        """
+        Çekim türlerine göre kare sayıları ve süreler. Kazanılan süre, atlanan karelerin
+        geniş çekim karelerinin ortalama süresiyle işlenseydi alacağı süreye göre tahmin edilir.
+        """
+        wide = self.shot_stats[SHOT_WIDE]
+        wide_mean = wide['seconds'] / wide['frames'] if wide['frames'] else 0.0
+        saved = sum(max(stats['frames'] * wide_mean - stats['seconds'], 0.0)
+                    for shot, stats in self.shot_stats.items() if shot != SHOT_WIDE)
+        return {
+            'frames': {shot: stats['frames'] for shot, stats in self.shot_stats.items()},
+            'frames_skipped': sum(stats['frames'] for shot, stats in self.shot_stats.items() if shot != SHOT_WIDE),
+            'mean_ms': {shot: (stats['seconds'] / stats['frames'] * 1000 if stats['frames'] else 0.0)
+                        for shot, stats in self.shot_stats.items()},
+            'time_saved_s': saved,
+        }
+
+    def _process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self._calibration_pending:
+            self._seed_calibration(frame)
 
         # Parallel tasks için future objects
         keypoints_future = self.executor.submit(self.frame_processor.detect_keypoints, frame)
-        detections_future = self.executor.submit(self.frame_processor.detect_objects, frame)
-        # Keypoints ve detections'ı parallel olarak al
+        inference_future = self.executor.submit(self.frame_processor.infer_objects, frame)
+        # Keypoints ve model çıkarımını parallel olarak al
         transformer = keypoints_future.result()
-        detections = detections_future.result()
+        raw_detections = inference_future.result()
+        # Saha maskesi bu karenin homografisiyle uygulanır, ardından takipçiler güncellenir
+        detections = self.frame_processor.track_objects(raw_detections, frame, transformer)
+        self.last_detections = detections
         # Team sınıflandırması
         team_future = self.executor.submit(
             self.frame_processor.update_team_classification,
@@ -614,22 +1118,30 @@ class VideoProcessor:
 
     def _create_radar_with_tracking(self, detections, transformer) -> np.ndarray:
             """Radar oluşturma ve tracking işlemlerini handle eden yardımcı method"""
-            # Hareket geçmişi hala toplanır, bu satır kalabilir veya kaldırılabilir.
-            self.frame_processor.track_player_movement(detections, transformer)
-            
-            # Fonksiyonu include_paths=False parametresiyle çağırarak yolların çizilmesini engelleyin.
-            radar = self.frame_processor.create_radar_image(detections, transformer, include_paths=False) # <--- DEĞİŞİKLİK BURADA
-            
-            radar = cv2.resize(radar, (self.radar_width, self.radar_height))
+            with self.profiler.stage('radar'):
+                # Saha koordinatları karede bir kez hesaplanır; takip ve radar aynı sonucu okur
+                self.frame_processor.project_to_pitch(detections, transformer)
+
+                # Hareket geçmişi hala toplanır, bu satır kalabilir veya kaldırılabilir.
+                self.frame_processor.track_player_movement(detections, transformer)
+
+                # Fonksiyonu include_paths=False parametresiyle çağırarak yolların çizilmesini engelleyin.
+                radar = self.frame_processor.create_radar_image(detections, transformer, include_paths=False) # <--- DEĞİŞİKLİK BURADA
+
+                radar = cv2.resize(radar, (self.radar_width, self.radar_height))
             self.last_radar = radar.copy()
             return radar
 
     def _handle_missing_transformer(self) -> np.ndarray:
         """Transformer olmadığında radar handling"""
+        return self._overlay_last_radar("No Keypoints Detected")
+
+    def _overlay_last_radar(self, text: str) -> np.ndarray:
+        """Son radarın üzerine durum yazısı ekler."""
         radar = self.last_radar.copy()
         cv2.putText(
             radar,
-            "No Keypoints Detected",
+            text,
             (50, self.radar_height // 2),
             cv2.FONT_HERSHEY_SIMPLEX,
             1,
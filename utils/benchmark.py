@@ -0,0 +1,748 @@
+"""
+İşleme hattı için benchmark aracı.
+
+VideoProcessor.process_frame ve alt aşamalarını (keypoint, nesne tespiti, takım
+sınıflandırması, anotasyon, radar, JPEG/video yazma) sentetik veya kayıtlı
+kareler üzerinde çalıştırır ve sonuçları JSON olarak raporlar:
+
+    python -m utils.benchmark --frames 200 --output bench.json
+    python -m utils.benchmark --video videos/match.mp4 --models real
+    python -m utils.benchmark --output new.json --compare old.json
+    python -m utils.benchmark --decode-only --video videos/match.mp4 --decoder pyav --prefetch 8
+    python -m utils.benchmark --warp-only --width 1920 --height 1080
+    python -m utils.benchmark --crowd 8 --no-pitch-filter
+    python -m utils.benchmark --tracking-only --class-flip 0.05
+    python -m utils.benchmark --reid-only --frames 150
+
+Varsayılan olarak YOLO modelleri yerine taklit (stub) modeller kullanılır;
+böylece ağırlık dosyaları ve GPU olmadan da her yerde çalışır.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+import supervision as sv
+
+from utils.backend import (
+    FrameProcessor, FrameAnnotator, VideoProcessor,
+    PLAYER_MODEL_PATH, KEYPOINT_MODEL_PATH, BALL_MODEL_PATH,
+)
+from utils.config import SoccerPitchConfiguration
+from utils.profiler import StageProfiler
+from utils.video_io import DECODERS, open_frame_source
+from utils.reid import ReIDGallery, jersey_embedding
+from utils.tracking import MultiClassTracker
+from utils.view import ViewTransformer, WarpEngine
+
+STAGES = (
+    'decode',
+    'detect_keypoints',
+    'detect_objects',
+    'update_team_classification',
+    'annotate_original_frame',
+    'create_radar_image',
+    'jpeg_write',
+    'video_write',
+    'process_frame',
+)
+
+
+# --- Ultralytics sonuç nesnelerinin yerel taklitleri ---
+
+class _StubTensor:
+    """torch.Tensor'ın supervision'ın kullandığı kadarını taklit eder."""
+
+    def __init__(self, array: np.ndarray):
+        self._array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self) -> np.ndarray:
+        return self._array
+
+    def int(self):
+        return _StubTensor(self._array.astype(np.int32))
+
+    def numel(self) -> int:
+        return int(self._array.size)
+
+
+class _StubBoxes:
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray):
+        self.xyxy = _StubTensor(xyxy.astype(np.float32))
+        self.conf = _StubTensor(conf.astype(np.float32))
+        self.cls = _StubTensor(cls.astype(np.float32))
+        self.id = None
+
+
+class _StubKeypoints:
+    def __init__(self, xy: np.ndarray, conf: np.ndarray):
+        self.xy = _StubTensor(xy.astype(np.float32))
+        self.conf = _StubTensor(conf.astype(np.float32))
+
+
+class _StubResult:
+    def __init__(self, names: Dict[int, str], orig_shape, boxes: _StubBoxes,
+                 keypoints: Optional[_StubKeypoints] = None):
+        self.names = names
+        self.orig_shape = orig_shape
+        self.boxes = boxes
+        self.keypoints = keypoints
+        self.masks = None
+        self.obb = None
+
+
+class _StubModelInfo:
+    def __init__(self, names: Dict[int, str]):
+        self.names = names
+
+
+class SyntheticScene:
+    """
+    Sentetik yayın görüntüsü üretir: perspektifli yeşil saha, beyaz saha çizgileri
+    ve iki takım renginde hareket eden oyuncular. Taklit modeller tespitlerini
+    bu sahneden okur, böylece takım renkleri ve homografi tutarlı olur.
+    """
+
+    TEAM_COLORS_BGR = ((40, 40, 200), (220, 220, 220))
+    GOALKEEPER_COLOR_BGR = (0, 200, 200)
+    REFEREE_COLOR_BGR = (20, 20, 20)
+
+    def __init__(self, pitch_config: SoccerPitchConfiguration, width: int = 1920, height: int = 1080,
+                 players_per_team: int = 10, seed: int = 0, crowd: int = 0):
+        self.pitch_config = pitch_config
+        self.width = width
+        self.height = height
+        self.crowd = crowd
+        self.rng = np.random.default_rng(seed)
+
+        # Saha köşelerini yamuk bir görüntü bölgesine eşleyen sabit homografi
+        pitch_corners = np.array([[0, 0], [pitch_config.length, 0],
+                                  [pitch_config.length, pitch_config.width], [0, pitch_config.width]],
+                                 dtype=np.float32)
+        image_corners = np.array([[0.22 * width, 0.18 * height], [0.78 * width, 0.18 * height],
+                                  [1.05 * width, 0.98 * height], [-0.05 * width, 0.98 * height]],
+                                 dtype=np.float32)
+        self.pitch_to_image = cv2.getPerspectiveTransform(pitch_corners, image_corners)
+        self.background = self._render_background()
+        # Düz renkler KMeans'i yanıltmasın diye sabit bir doku gürültüsü eklenir
+        self.noise = self.rng.integers(0, 30, (height, width, 3), dtype=np.uint8)
+
+        # Sınıflar: 0 top, 1 kaleci, 2 oyuncu, 3 hakem (tipik players.pt düzeni)
+        self.names = {0: 'ball', 1: 'goalkeeper', 2: 'player', 3: 'referee'}
+        count = players_per_team * 2 + 2 + 3
+        self.base_positions = np.column_stack([
+            self.rng.uniform(0.1, 0.9, count) * pitch_config.length,
+            self.rng.uniform(0.1, 0.9, count) * pitch_config.width,
+        ])
+        self.classes = np.array([2] * (players_per_team * 2) + [1, 1] + [3, 3, 3])
+        self.colors = ([self.TEAM_COLORS_BGR[i % 2] for i in range(players_per_team * 2)]
+                       + [self.GOALKEEPER_COLOR_BGR] * 2 + [self.REFEREE_COLOR_BGR] * 3)
+        self.phases = self.rng.uniform(0, 2 * np.pi, count)
+
+        # Tribündeki seyirciler: modelin 'player' olarak yanlış tespit ettiği kutular
+        self.crowd_boxes = np.column_stack([
+            self.rng.uniform(0.05, 0.95, crowd) * width,
+            self.rng.uniform(0.03, 0.14, crowd) * height,
+        ])
+        self.crowd_colors = [tuple(int(c) for c in self.rng.integers(0, 255, 3)) for _ in range(crowd)]
+
+        self.frame_index = -1
+        self.person_boxes = np.empty((0, 4), dtype=np.float32)
+        self.ball_box = np.empty((0, 4), dtype=np.float32)
+
+    def _project(self, pitch_points: np.ndarray) -> np.ndarray:
+        return cv2.perspectiveTransform(pitch_points.reshape(-1, 1, 2).astype(np.float32),
+                                        self.pitch_to_image).reshape(-1, 2)
+
+    def _render_background(self) -> np.ndarray:
+        frame = np.full((self.height, self.width, 3), (60, 140, 50), dtype=np.uint8)
+        vertices = self._project(self.pitch_config.geometry.vertices)
+        segments = vertices[self.pitch_config.geometry.edges].astype(np.int32)
+        cv2.polylines(frame, list(segments), False, (255, 255, 255), 3)
+        if self.crowd:
+            # Uzak taç çizgisinin üstü tribün
+            far_touchline_y = int(self._project(np.array([[0, 0]], dtype=np.float32))[0, 1]) - 5
+            frame[:far_touchline_y] = (120, 100, 150)
+        return frame
+
+    @property
+    def keypoints_xy(self) -> np.ndarray:
+        return self._project(self.pitch_config.geometry.vertices)
+
+    def render(self, frame_index: int) -> np.ndarray:
+        """frame_index'inci kareyi üretir ve taklit modellerin okuyacağı kutuları günceller."""
+        self.frame_index = frame_index
+        t = frame_index / 25.0
+        drift = np.column_stack([np.sin(t + self.phases), np.cos(0.7 * t + self.phases)]) * 300
+        feet = self._project(self.base_positions + drift)
+
+        frame = self.background.copy()
+        boxes = []
+        for (x, y), color in zip(feet, self.colors):
+            # Uzaktaki oyuncular perspektif nedeniyle daha küçük görünür
+            h = 40 + 60 * (y / self.height)
+            w = h * 0.4
+            box = (x - w / 2, y - h, x + w / 2, y)
+            boxes.append(box)
+            x1, y1, x2, y2 = (int(v) for v in box)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+        for (x, y), color in zip(self.crowd_boxes, self.crowd_colors):
+            h = 30
+            box = (x - h * 0.2, y - h, x + h * 0.2, y)
+            boxes.append(box)
+            x1, y1, x2, y2 = (int(v) for v in box)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+        self.person_boxes = np.array(boxes, dtype=np.float32)
+
+        ball = self._project(np.array([[self.pitch_config.length / 2 + 2000 * np.sin(t),
+                                        self.pitch_config.width / 2]], dtype=np.float32))[0]
+        self.ball_box = np.array([[ball[0] - 6, ball[1] - 6, ball[0] + 6, ball[1] + 6]], dtype=np.float32)
+        cv2.circle(frame, (int(ball[0]), int(ball[1])), 6, (255, 255, 255), -1)
+
+        return cv2.add(frame, self.noise)
+
+
+class StubDetectionModel:
+    """YOLO tespit modelinin yerine geçer; kutuları SyntheticScene'den alır."""
+
+    def __init__(self, scene: SyntheticScene, ball: bool = False):
+        self.scene = scene
+        self.ball = ball
+        self.model = _StubModelInfo(scene.names)
+
+    def __call__(self, frame: np.ndarray, conf: float = 0.25, verbose: bool = False) -> List[_StubResult]:
+        rng = np.random.default_rng(self.scene.frame_index)
+        if self.ball:
+            xyxy = self.scene.ball_box
+            cls = np.zeros(len(xyxy))
+        else:
+            xyxy = self.scene.person_boxes + rng.normal(0, 1.5, self.scene.person_boxes.shape)
+            cls = np.concatenate([self.scene.classes, np.full(self.scene.crowd, 2)])
+        confidence = rng.uniform(max(conf, 0.5), 1.0, len(xyxy))
+        return [_StubResult(self.scene.names, frame.shape[:2], _StubBoxes(xyxy, confidence, cls))]
+
+
+class StubKeypointModel:
+    """Saha keypoint modelinin yerine geçer; köşeleri sahnenin homografisinden üretir."""
+
+    def __init__(self, scene: SyntheticScene):
+        self.scene = scene
+        self.model = _StubModelInfo({0: 'pitch'})
+
+    def __call__(self, frame: np.ndarray, conf: float = 0.25, verbose: bool = False) -> List[_StubResult]:
+        rng = np.random.default_rng(self.scene.frame_index)
+        xy = self.scene.keypoints_xy + rng.normal(0, 2.0, (len(self.scene.keypoints_xy), 2))
+        inside = ((xy[:, 0] >= 0) & (xy[:, 0] < frame.shape[1]) &
+                  (xy[:, 1] >= 0) & (xy[:, 1] < frame.shape[0]))
+        keypoint_conf = np.where(inside, rng.uniform(0.6, 1.0, len(xy)), rng.uniform(0.0, 0.3, len(xy)))
+        boxes = _StubBoxes(np.array([[0, 0, frame.shape[1], frame.shape[0]]]), np.ones(1), np.zeros(1))
+        return [_StubResult(self.model.names, frame.shape[:2], boxes,
+                            _StubKeypoints(xy[np.newaxis], keypoint_conf[np.newaxis]))]
+
+
+# --- Ölçüm yardımcıları ---
+
+def peak_rss_mb() -> Optional[float]:
+    """İşlemin tepe bellek kullanımı (MB). Ölçülemiyorsa None."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt döndürür
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def summarize(samples_s: List[float]) -> Dict[str, float]:
+    samples_ms = np.array(samples_s, dtype=np.float64) * 1000
+    return {
+        'count': int(samples_ms.size),
+        'mean_ms': round(float(samples_ms.mean()), 3),
+        'p50_ms': round(float(np.percentile(samples_ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(samples_ms, 95)), 3),
+        'max_ms': round(float(samples_ms.max()), 3),
+    }
+
+
+def _timed(samples: Dict[str, List[float]], stage: str, fn: Callable, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    samples.setdefault(stage, []).append(time.perf_counter() - start)
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_frame_processor(pitch_config: SoccerPitchConfiguration, models: str,
+                          scene: Optional[SyntheticScene]) -> FrameProcessor:
+    processor = FrameProcessor(pitch_config=pitch_config)
+    if models == 'real':
+        processor.load_models(PLAYER_MODEL_PATH, KEYPOINT_MODEL_PATH, BALL_MODEL_PATH)
+    else:
+        processor.set_models(StubDetectionModel(scene), StubKeypointModel(scene), StubDetectionModel(scene, ball=True))
+    return processor
+
+
+class FrameFeed:
+    """Kayıtlı video ya da sentetik sahneden kare sağlar; video çözme süresini ayrıca kaydeder."""
+
+    def __init__(self, video_path: Optional[str], scene: Optional[SyntheticScene], frames: int,
+                 decoder: str = 'opencv', prefetch: int = 0):
+        self.video_path = video_path
+        self.scene = scene
+        self.frames = frames
+        self.decoder = decoder
+        self.prefetch = prefetch
+        self.last_decode_s = 0.0
+
+    def __iter__(self):
+        if self.video_path:
+            cap = open_frame_source(self.video_path, decoder=self.decoder, prefetch=self.prefetch)
+            try:
+                for index in range(self.frames):
+                    start = time.perf_counter()
+                    ret, frame = cap.read()
+                    self.last_decode_s = time.perf_counter() - start
+                    if not ret:
+                        break
+                    if self.scene is not None:
+                        # Kayıtlı kare + taklit modeller: tespitler sentetik sahneden gelir
+                        self.scene.render(index)
+                    yield index, frame
+            finally:
+                cap.release()
+        else:
+            for index in range(self.frames):
+                yield index, self.scene.render(index)
+
+
+def run_decode_benchmark(video_path: str, frames: int = 500, decoders=('opencv', 'pyav'), prefetch: int = 0,
+                         decode_size=None) -> Dict:
+    """
+    Video çözmeyi inference'tan bağımsız ölçer: her arka uç için kare/sn ve kare başına gecikme.
+    """
+    results = {}
+    for decoder in decoders:
+        source = open_frame_source(video_path, decoder=decoder, prefetch=prefetch, target_size=decode_size)
+        if not source.isOpened():
+            results[decoder] = {'error': 'could not open video'}
+            continue
+        backend = source.backend_name
+        samples = []
+        wall_start = time.perf_counter()
+        try:
+            for _ in range(frames):
+                start = time.perf_counter()
+                ret, _frame = source.read()
+                if not ret:
+                    break
+                samples.append(time.perf_counter() - start)
+        finally:
+            source.release()
+        wall = time.perf_counter() - wall_start
+        if not samples:
+            results[decoder] = {'backend': backend, 'error': 'no frames decoded'}
+            continue
+        results[decoder] = {
+            'backend': backend,
+            'frames': len(samples),
+            'fps': round(len(samples) / wall, 3),
+            'read': summarize(samples),
+        }
+
+    return {
+        'meta': {
+            'git_revision': _git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'video': video_path,
+            'prefetch': prefetch,
+            'decode_size': list(decode_size) if decode_size else None,
+            'opencv': cv2.__version__,
+        },
+        'decoders': results,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_warp_benchmark(frames: int = 100, width: int = 1920, height: int = 1080,
+                       roi: Optional[tuple] = None) -> Dict:
+    """
+    Sabit kamerada kuş bakışı dönüşüm: her karede cv2.warpPerspective ile
+    WarpEngine (önceden hesaplanmış remap tabloları) karşılaştırılır.
+    """
+    pitch_config = SoccerPitchConfiguration()
+    scene = SyntheticScene(pitch_config, width=width, height=height)
+    # Saha, çıktı çözünürlüğünü dolduracak şekilde ölçeklenir
+    scale = min(width / pitch_config.length, height / pitch_config.width)
+    transformer = ViewTransformer(source=scene.keypoints_xy, target=pitch_config.geometry.vertices * scale)
+    images = [scene.render(i) for i in range(min(frames, 10))]
+    resolution_wh = (width, height)
+    engine = WarpEngine()
+
+    samples = {'warp_perspective': [], 'remap_first_call': [], 'remap': []}
+    start = time.perf_counter()
+    reference = transformer.transform_image(images[0], resolution_wh, roi=roi)
+    samples['warp_perspective'].append(time.perf_counter() - start)
+    start = time.perf_counter()
+    remapped = transformer.transform_image(images[0], resolution_wh, warp_engine=engine, roi=roi)
+    samples['remap_first_call'].append(time.perf_counter() - start)
+
+    for i in range(frames):
+        image = images[i % len(images)]
+        _timed(samples, 'warp_perspective', transformer.transform_image, image, resolution_wh, roi=roi)
+        _timed(samples, 'remap', transformer.transform_image, image, resolution_wh, warp_engine=engine, roi=roi)
+
+    return {
+        'meta': {
+            'git_revision': _git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'resolution': [width, height],
+            'roi': list(roi) if roi else None,
+            'frames': frames,
+            'opencv': cv2.__version__,
+            'cv2_threads': cv2.getNumThreads(),
+        },
+        'stages': {name: summarize(values) for name, values in samples.items()},
+        'map_rebuilds': engine.rebuilds,
+        'max_abs_diff': int(np.abs(reference.astype(np.int16) - remapped.astype(np.int16)).max()),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def _count_id_switches(history: Dict[int, List[int]]) -> int:
+    """Gerçek kimlik başına, ardışık görüldüğü karelerde tracker_id değişim sayısı."""
+    return sum(sum(1 for a, b in zip(ids, ids[1:]) if a != b) for ids in history.values())
+
+
+def run_tracking_benchmark(frames: int = 300, class_flip: float = 0.05, width: int = 1920,
+                           height: int = 1080, seed: int = 0) -> Dict:
+    """
+    Sınıf başına ayrı ByteTrack'ler ile MultiClassTracker'ı aynı tespit akışında karşılaştırır.
+    Tespitler sahneden doğrudan üretilir; class_flip olasılığıyla oyuncular kaleci ya da
+    hakem olarak yanlış sınıflanır. Gerçek kimlikler üzerinden kimlik değişimleri sayılır.
+    """
+    pitch_config = SoccerPitchConfiguration()
+    scene = SyntheticScene(pitch_config, width, height)
+    rng = np.random.default_rng(seed)
+    keys = ('players', 'goalkeepers', 'referees')
+    slot_of_class = {2: 0, 1: 1, 3: 2}
+    class_of_slot = {slot: class_id for class_id, slot in slot_of_class.items()}
+
+    legacy = {key: sv.ByteTrack() for key in keys}
+    unified = MultiClassTracker(keys)
+    samples: Dict[str, List[float]] = {}
+    histories = {'legacy': {}, 'unified': {}}
+
+    for index in range(frames):
+        scene.render(index)
+        slots = np.array([slot_of_class[c] for c in scene.classes])
+        flips = rng.random(len(slots)) < class_flip
+        slots[flips] = (slots[flips] + rng.integers(1, 3, flips.sum())) % 3
+        boxes = scene.person_boxes[:len(slots)] + rng.normal(0, 1.5, (len(slots), 4))
+        detections = sv.Detections(xyxy=boxes.astype(np.float32),
+                                   confidence=rng.uniform(0.6, 1.0, len(slots)).astype(np.float32),
+                                   class_id=np.array([class_of_slot[s] for s in slots]),
+                                   data={'gt_index': np.arange(len(slots))})
+        by_key = {key: detections[slots == slot] for slot, key in enumerate(keys)}
+
+        start = time.perf_counter()
+        legacy_out = {key: legacy[key].update_with_detections(by_key[key]) for key in keys}
+        samples.setdefault('legacy', []).append(time.perf_counter() - start)
+        unified_out = _timed(samples, 'unified', unified.update, by_key)
+
+        for name, out in (('legacy', legacy_out), ('unified', unified_out)):
+            for key in keys:
+                dets = out[key]
+                # Ayrı takipçilerin kimlik uzayları çakışır; sınıf anahtarıyla ayrıştırılır
+                for gt, tracker_id in zip(dets.data.get('gt_index', []), dets.tracker_id):
+                    identity = (key, int(tracker_id)) if name == 'legacy' else int(tracker_id)
+                    histories[name].setdefault(int(gt), []).append(identity)
+
+    return {
+        'meta': {
+            'git_revision': _git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'frames': frames,
+            'class_flip': class_flip,
+            'objects': len(scene.classes),
+        },
+        'update': {name: summarize(values) for name, values in samples.items()},
+        'id_switches': {name: _count_id_switches(history) for name, history in histories.items()},
+        'unique_ids': {name: len({i for ids in history.values() for i in ids}) for name, history in histories.items()},
+    }
+
+
+def run_reid_benchmark(frames: int = 150, hidden: int = 4, hide_from: int = 30, hide_frames: int = 45,
+                       width: int = 1920, height: int = 1080, seed: int = 0) -> Dict:
+    """
+    Bazı oyuncular takipçinin tamponundan (30 kare) uzun süre kaybolur ve geri döner.
+    Re-ID açık/kapalı iken geri dönenlerin eski kimliğini koruyup korumadığı ve
+    yanlış bağlantılar (başka birinin kimliği) sayılır.
+    """
+    pitch_config = SoccerPitchConfiguration()
+    scene = SyntheticScene(pitch_config, width, height)
+    processor = FrameProcessor(pitch_config=pitch_config)
+    rng = np.random.default_rng(seed)
+    keys = ('players', 'goalkeepers', 'referees')
+    people = np.flatnonzero(scene.classes == 2)
+    hidden_ids = rng.choice(people, size=min(hidden, len(people)), replace=False)
+    diagonal = float(np.hypot(width, height))
+
+    setups = {'no_reid': (MultiClassTracker(keys), None), 'reid': (MultiClassTracker(keys), ReIDGallery())}
+    identities = {name: {} for name in setups}
+    samples: Dict[str, List[float]] = {}
+
+    for index in range(frames):
+        frame = scene.render(index)
+        visible = np.ones(len(scene.classes), dtype=bool)
+        if hide_from <= index < hide_from + hide_frames:
+            visible[hidden_ids] = False
+        boxes = scene.person_boxes[:len(scene.classes)][visible]
+        detections = sv.Detections(xyxy=boxes.astype(np.float32),
+                                   confidence=np.full(len(boxes), 0.9, dtype=np.float32),
+                                   class_id=np.full(len(boxes), 2), data={'gt_index': np.flatnonzero(visible)})
+        by_key = {'players': detections, 'goalkeepers': detections[:0], 'referees': detections[:0]}
+
+        for name, (tracker, gallery) in setups.items():
+            players = tracker.update(by_key)['players']
+            if gallery is not None and len(players):
+                start = time.perf_counter()
+                players.tracker_id = gallery.resolve(players.tracker_id)
+                embeddings = [jersey_embedding(processor._extract_jersey_region(frame, box)) for box in players.xyxy]
+                valid = [i for i, e in enumerate(embeddings) if e is not None]
+                centers = players.get_anchors_coordinates(sv.Position.CENTER)
+                gallery.observe(players.tracker_id[valid], [embeddings[i] for i in valid], centers[valid], diagonal)
+                samples.setdefault('reid', []).append(time.perf_counter() - start)
+            for gt, tracker_id in zip(players.data['gt_index'], players.tracker_id):
+                identities[name].setdefault(int(gt), []).append(int(tracker_id))
+
+    report = {}
+    for name, history in identities.items():
+        first_ids = {gt: ids[0] for gt, ids in history.items()}
+        recovered = sum(1 for gt in hidden_ids if history[int(gt)][-1] == first_ids[int(gt)])
+        wrong = sum(1 for gt in hidden_ids if history[int(gt)][-1] in
+                    {first_ids[other] for other in first_ids if other != int(gt)})
+        report[name] = {'recovered': recovered, 'wrong_links': wrong, 'id_switches': _count_id_switches(history)}
+
+    return {
+        'meta': {
+            'git_revision': _git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'frames': frames,
+            'hidden': len(hidden_ids),
+            'hide_frames': hide_frames,
+        },
+        'results': report,
+        'reid_update': summarize(samples['reid']) if samples.get('reid') else None,
+        'links': setups['reid'][1].links,
+    }
+
+
+def run_benchmark(frames: int = 100, warmup: int = 5, video_path: Optional[str] = None, models: str = 'stub',
+                  width: int = 1920, height: int = 1080, decoder: str = 'opencv', prefetch: int = 0,
+                  crowd: int = 0, pitch_filter: bool = True) -> Dict:
+    pitch_config = SoccerPitchConfiguration()
+    if video_path and models == 'stub':
+        cap = cv2.VideoCapture(video_path)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or width
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or height
+        cap.release()
+    scene = SyntheticScene(pitch_config, width, height, crowd=crowd) if models == 'stub' else None
+    annotator = FrameAnnotator()
+    samples: Dict[str, List[float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix='bench_') as tmp_dir:
+        # 1. Geçiş: alt aşamalar tek tek, sırayla
+        processor = build_frame_processor(pitch_config, models, scene)
+        processor.pitch_filter_enabled = pitch_filter
+        video_processor = VideoProcessor(video_path or '', '', processor, annotator, skip_cutaways=False)
+        writer = None
+        feed = FrameFeed(video_path, scene, frames + warmup, decoder=decoder, prefetch=prefetch)
+
+        for index, frame in feed:
+            stage_samples = samples if index >= warmup else {}
+            if video_path:
+                stage_samples.setdefault('decode', []).append(feed.last_decode_s)
+
+            transformer = _timed(stage_samples, 'detect_keypoints', processor.detect_keypoints, frame)
+            detections = _timed(stage_samples, 'detect_objects', processor.detect_objects, frame)
+            _timed(stage_samples, 'update_team_classification', processor.update_team_classification,
+                   detections, frame)
+            annotated = _timed(stage_samples, 'annotate_original_frame', processor.annotate_original_frame,
+                               frame.copy(), detections, annotator)
+            if transformer is not None:
+                radar = _timed(stage_samples, 'create_radar_image', processor.create_radar_image,
+                               detections, transformer, False)
+            else:
+                radar = video_processor.last_radar
+
+            _timed(stage_samples, 'jpeg_write', cv2.imwrite,
+                   os.path.join(tmp_dir, f"annotated_{index % 8:05d}.jpg"), annotated)
+            if writer is None:
+                writer = cv2.VideoWriter(os.path.join(tmp_dir, 'bench.mp4'), cv2.VideoWriter_fourcc(*'mp4v'),
+                                         25, (annotated.shape[1], annotated.shape[0]))
+            _timed(stage_samples, 'video_write', writer.write, annotated)
+
+        if writer is not None:
+            writer.release()
+
+        # 2. Geçiş: uçtan uca process_frame (paralel yürütme dahil), temiz takipçi durumu ile
+        scene = SyntheticScene(pitch_config, width, height, crowd=crowd) if models == 'stub' else None
+        processor = build_frame_processor(pitch_config, models, scene)
+        processor.pitch_filter_enabled = pitch_filter
+        profiler = StageProfiler()
+        # Ara çekim atlama kapalı: SyntheticScene oyuncuları sabit piksel boyutunda çizdiği için düşük
+        # çözünürlükte her kare 'close_up' sayılır ve ölçüm pipeline yerine atlama yolunu gösterirdi
+        video_processor = VideoProcessor(video_path or '', '', processor, annotator, profiler=profiler,
+                                         skip_cutaways=False)
+        measured = 0
+        wall_start = None
+        for index, frame in FrameFeed(video_path, scene, frames + warmup, decoder=decoder, prefetch=prefetch):
+            if index == warmup:
+                wall_start = time.perf_counter()
+            _timed(samples if index >= warmup else {}, 'process_frame', video_processor.process_frame, frame)
+            profiler.end_frame()
+            measured += index >= warmup
+        wall = time.perf_counter() - wall_start if wall_start is not None else 0.0
+        video_processor.executor.shutdown(wait=True)
+
+    stage_report = {stage: summarize(samples[stage]) for stage in STAGES if samples.get(stage)}
+    profile = profiler.summary()
+    return {
+        'meta': {
+            'git_revision': _git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'models': models,
+            'video': video_path,
+            'decoder': decoder,
+            'prefetch': prefetch,
+            'resolution': [width, height],
+            'frames': measured,
+            'warmup_frames': warmup,
+            'crowd': crowd,
+            'pitch_filter': pitch_filter,
+        },
+        'stages': stage_report,
+        # Uçtan uca geçişte kare başına ortalama sayaçlar (ısınma dahil)
+        'counts_per_frame': {name: round(total / max(profile['frames'], 1), 3)
+                             for name, total in profile['counts_total'].items()},
+        'pipeline_stages_ms': {name: round(ms, 3) for name, ms in profile['stages_mean_ms'].items()},
+        'fps': {
+            'process_frame': round(measured / wall, 3) if wall > 0 else None,
+            'process_frame_p50': round(1000 / stage_report['process_frame']['p50_ms'], 3)
+            if 'process_frame' in stage_report else None,
+        },
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[str]:
+    """İki rapor arasındaki p50/p95 farklarını satır satır döndürür; eşiği aşanlar işaretlenir."""
+    lines = []
+    for stage, stats in current.get('stages', {}).items():
+        old = baseline.get('stages', {}).get(stage)
+        if not old:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            if not old[key]:
+                continue
+            change = (stats[key] - old[key]) / old[key]
+            marker = ' <-- REGRESSION' if change > threshold else ''
+            lines.append(f"{stage:28s} {key}: {old[key]:9.3f} -> {stats[key]:9.3f} ({change:+.1%}){marker}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Processing pipeline benchmark")
+    parser.add_argument('--frames', type=int, default=100, help="Ölçülen kare sayısı")
+    parser.add_argument('--warmup', type=int, default=5, help="Ölçüme dahil edilmeyen ısınma kareleri")
+    parser.add_argument('--video', default=None, help="Sentetik kareler yerine kullanılacak video")
+    parser.add_argument('--models', choices=('stub', 'real'), default='stub',
+                        help="Taklit modeller ya da ./models altındaki YOLO ağırlıkları")
+    parser.add_argument('--decoder', choices=DECODERS, default='opencv',
+                        help="Video okuyucu arka ucu (--decode-only ile 'auto' tüm arka uçları ölçer)")
+    parser.add_argument('--prefetch', type=int, default=0, help="Arka plan ön-okuma tampon boyutu")
+    parser.add_argument('--decode-only', action='store_true', help="Yalnızca video çözme hızını ölç")
+    parser.add_argument('--decode-size', default=None, help="Çözme çözünürlüğü, örn. 1280x720")
+    parser.add_argument('--warp-only', action='store_true',
+                        help="Yalnızca warpPerspective ile remap tablolarını karşılaştır")
+    parser.add_argument('--roi', default=None, help="--warp-only için çıktı bölgesi, örn. 0,0,960,540")
+    parser.add_argument('--tracking-only', action='store_true',
+                        help="Ayrı ByteTrack'ler ile MultiClassTracker'ı karşılaştır")
+    parser.add_argument('--class-flip', type=float, default=0.05,
+                        help="--tracking-only için yanlış sınıflama olasılığı")
+    parser.add_argument('--reid-only', action='store_true',
+                        help="Uzun süre kaybolan oyuncuların re-ID ile kimlik korumasını ölç")
+    parser.add_argument('--crowd', type=int, default=0,
+                        help="Sentetik sahnede tribüne eklenen yanlış pozitif oyuncu sayısı")
+    parser.add_argument('--no-pitch-filter', action='store_true', help="Saha maskesi filtresini kapat")
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--output', default=None, help="JSON raporun yazılacağı dosya (varsayılan: stdout)")
+    parser.add_argument('--compare', default=None, help="Karşılaştırılacak önceki JSON rapor")
+    args = parser.parse_args(argv)
+
+    if args.decode_only:
+        if not args.video:
+            parser.error("--decode-only için --video gerekli")
+        decode_size = tuple(int(v) for v in args.decode_size.lower().split('x')) if args.decode_size else None
+        decoders = ('opencv', 'pyav') if args.decoder == 'auto' else (args.decoder,)
+        report = run_decode_benchmark(args.video, frames=args.frames, decoders=decoders, prefetch=args.prefetch,
+                                      decode_size=decode_size)
+    elif args.tracking_only:
+        report = run_tracking_benchmark(frames=args.frames, class_flip=args.class_flip,
+                                        width=args.width, height=args.height)
+    elif args.reid_only:
+        report = run_reid_benchmark(frames=args.frames, width=args.width, height=args.height)
+    elif args.warp_only:
+        roi = tuple(int(v) for v in args.roi.split(',')) if args.roi else None
+        report = run_warp_benchmark(frames=args.frames, width=args.width, height=args.height, roi=roi)
+    else:
+        report = run_benchmark(frames=args.frames, warmup=args.warmup, video_path=args.video, models=args.models,
+                               width=args.width, height=args.height, decoder=args.decoder, prefetch=args.prefetch,
+                               crowd=args.crowd, pitch_filter=not args.no_pitch_filter)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Benchmark raporu yazıldı: {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for line in compare_reports(baseline, report):
+            print(line, file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
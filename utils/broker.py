@@ -0,0 +1,667 @@
+"""
+İş kuyruğunu (utils.job_queue) birden çok makineyle paylaştıran HTTP aracısı.
+
+Aracı kuyruktaki sıradaki işi kendisi alır ve kare aralıklarına (bölüm) ayırır. Uzak
+worker'lar (utils.remote_worker) bölümleri kiralar, işlerken ilerlemeyi ve tespit
+kayıtlarını heartbeat ile gönderir, bitince bölüm videolarını yükler. lease_s boyunca
+heartbeat gelmeyen kira düşer ve bölüm başka worker'a verilir. Bir işin tüm bölümleri
+bitince bölüm videoları ve tespit kayıtları birleştirilip işin çıktı dizinine yazılır.
+
+    python -m utils.cli broker --host 0.0.0.0 --port 8765 --token gizli
+    python -m utils.cli remote-worker http://sunucu:8765 --token gizli
+
+Protokol (JSON gövde, token verilmişse X-Broker-Token başlığı zorunlu):
+    POST /api/claim          {"worker"}                         -> bölüm bilgisi; bölüm yoksa 204
+    POST /api/heartbeat      {"lease", "frames", "fps", "seq", "log"} -> {"lease_s"}; kira düştüyse 410
+    PUT  /api/output/<kira>/<mod>                               bölüm videosu (gövde dosyanın kendisi)
+    POST /api/complete       {"lease", "frames", "seconds"}
+    POST /api/fail           {"lease", "error"}
+    POST /api/release        {"lease"}                          worker düzenli kapanırken
+    GET  /api/video/<iş>     kaynak video (worker dosyaya doğrudan erişemiyorsa)
+    GET  /api/status         kuyruk ve bölüm sayıları
+"""
+import hmac
+import json
+import math
+import os
+import shutil
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import cv2
+
+from utils.cli import DEFAULT_SETTINGS, output_paths
+from utils.export import ThreadedVideoWriter
+from utils.job_queue import DEFAULT_MAX_ATTEMPTS, DEFAULT_QUEUE_PATH, DEFAULT_STALE_AFTER_S, JobQueue
+
+DEFAULT_PORT = 8765
+DEFAULT_WORK_DIR = "broker_work"
+DEFAULT_SEGMENT_FRAMES = 1500
+# Bölüm başından önce işlenip yazılmayan kareler: takip ve takım renkleri oturur
+DEFAULT_WARMUP_FRAMES = 25
+DEFAULT_LEASE_S = 30.0
+BROKER_WORKER = "broker"
+TOKEN_HEADER = "X-Broker-Token"
+CHUNK_BYTES = 1024 * 1024
+SEGMENT_STATUSES = ('pending', 'leased', 'done')
+
+
+class BrokerError(Exception):
+    """İstemciye HTTP durum koduyla dönen hata."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SegmentBroker:
+    """
+    Bölüm kiralama, heartbeat, yükleme ve birleştirme mantığı; HTTP katmanından
+    bağımsızdır. Veritabanı erişimi tek kilitle sıralanır (HTTP istekleri ayrı
+    iş parçacıklarında gelir). Bölümler kuyrukla aynı SQLite dosyasında tutulur;
+    aracı yeniden başlatılırsa biten bölümler yeniden işlenmez.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_PATH, work_dir: str = DEFAULT_WORK_DIR,
+                 segment_frames: int = DEFAULT_SEGMENT_FRAMES, warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+                 lease_s: float = DEFAULT_LEASE_S, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.work_dir = work_dir
+        self.segment_frames = max(1, segment_frames)
+        self.warmup_frames = max(0, warmup_frames)
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        os.makedirs(work_dir, exist_ok=True)
+        self.queue = JobQueue(db_path, check_same_thread=False)
+        self._conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS segments (
+                job_id INTEGER NOT NULL,
+                idx INTEGER NOT NULL,
+                start_frame INTEGER NOT NULL,
+                frames INTEGER,
+                status TEXT NOT NULL DEFAULT 'pending',
+                lease TEXT, worker TEXT, lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                frames_done INTEGER NOT NULL DEFAULT 0,
+                fps REAL NOT NULL DEFAULT 0,
+                log_count INTEGER NOT NULL DEFAULT 0,
+                error TEXT, result TEXT,
+                PRIMARY KEY (job_id, idx)
+            )""")
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS segments_lease ON segments (lease)")
+        self._lock = threading.RLock()
+        # Aracının bu çalışmada aldığı işler: iş kimliği -> iş kaydı (toplam kare ve alınma zamanı eklenir)
+        self._jobs: Dict[int, Dict] = {}
+        self._merge_threads: Dict[int, threading.Thread] = {}
+
+    def close(self) -> None:
+        """Alınan işleri ve kiralanmış bölümleri kuyruğa geri bırakır; biten bölümler saklanır."""
+        for thread in list(self._merge_threads.values()):
+            thread.join()
+        with self._lock:
+            for job_id in list(self._jobs):
+                self._conn.execute("UPDATE segments SET status = 'pending', lease = NULL, "
+                                   "attempts = MAX(attempts - 1, 0) WHERE job_id = ? AND status = 'leased'",
+                                   (job_id,))
+                self.queue.release(job_id, count_attempt=False)
+            self._jobs.clear()
+            self.queue.close()
+            self._conn.close()
+
+    # --- dosya yolları ---
+
+    def _job_dir(self, job_id: int) -> str:
+        return os.path.join(self.work_dir, f"job_{job_id}")
+
+    def _segment_output(self, job_id: int, idx: int, mode: str) -> str:
+        return os.path.join(self._job_dir(job_id), f"segment_{idx:04d}_{mode}.mp4")
+
+    def _segment_log(self, job_id: int, idx: int) -> str:
+        return os.path.join(self._job_dir(job_id), f"segment_{idx:04d}.jsonl")
+
+    def _segment_files(self, job: Dict, idx: int) -> List[str]:
+        return ([self._segment_output(job['id'], idx, mode) for mode in job['settings']['modes']] +
+                [self._segment_log(job['id'], idx)])
+
+    def _segment_files_present(self, job: Dict, row: sqlite3.Row) -> bool:
+        """Biten bölümün dosyaları duruyor mu; boş bölümün (0 kare) yalnızca kaydı vardır."""
+        result = json.loads(row['result']) if row['result'] else {}
+        paths = self._segment_files(job, row['idx']) if result.get('frames') else [self._segment_log(job['id'], row['idx'])]
+        return all(map(os.path.exists, paths))
+
+    # --- işleri bölümlere ayırma ---
+
+    @staticmethod
+    def _count_frames(video_path: str) -> int:
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                raise IOError(f"Video açılamadı: {video_path}")
+            return int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        finally:
+            cap.release()
+
+    def _plan(self, job: Dict) -> None:
+        """
+        İşi segment_frames'lik bölümlere ayırır. Son bölüm max_frames yoksa videonun
+        sonuna kadar okur. Kare sayısı (CAP_PROP_FRAME_COUNT) güvenilir olmayabilir;
+        fazla gösterirse son bölümler videonun sonundan başlar ve 0 kareyle tamamlanır,
+        birleştirmede atlanır. Önceki bir çalışmadan
+        aynı planla biten bölümler, dosyaları duruyorsa korunur.
+        """
+        max_frames = job['settings']['max_frames']
+        total = self._count_frames(job['video'])
+        if max_frames:
+            total = min(total, max_frames) if total > 0 else max_frames
+        count = max(1, math.ceil(total / self.segment_frames))
+        plan = []
+        for idx in range(count):
+            start = idx * self.segment_frames
+            if idx < count - 1:
+                frames = self.segment_frames
+            else:
+                frames = total - start if max_frames else None
+            plan.append((idx, start, frames))
+
+        existing = {row['idx']: row for row in
+                    self._conn.execute("SELECT * FROM segments WHERE job_id = ?", (job['id'],))}
+        if sorted((row['idx'], row['start_frame'], row['frames']) for row in existing.values()) != plan:
+            self._conn.execute("DELETE FROM segments WHERE job_id = ?", (job['id'],))
+            shutil.rmtree(self._job_dir(job['id']), ignore_errors=True)
+            existing = {}
+        os.makedirs(self._job_dir(job['id']), exist_ok=True)
+
+        kept = 0
+        for idx, start, frames in plan:
+            row = existing.get(idx)
+            if row is not None and row['status'] == 'done' and self._segment_files_present(job, row):
+                kept += 1
+                continue
+            self._conn.execute("INSERT OR REPLACE INTO segments (job_id, idx, start_frame, frames) VALUES (?, ?, ?, ?)",
+                               (job['id'], idx, start, frames))
+        job['total_frames'] = total
+        print(f"#{job['id']} {count} bölüme ayrıldı ({total} kare"
+              f"{f', {kept} bölüm önceki çalışmadan' if kept else ''}): {job['video']}", flush=True)
+
+    def _start_next_job(self) -> bool:
+        """Kuyruktan sıradaki işi alıp bölümlere ayırır; kiralanacak bölümü olan iş yoksa False."""
+        while True:
+            job = self.queue.claim(BROKER_WORKER)
+            if job is None:
+                return False
+            job['settings'] = dict(DEFAULT_SETTINGS, **job['settings'])
+            try:
+                self._plan(job)
+            except Exception as e:
+                print(f"#{job['id']} bölümlere ayrılamadı: {e}", flush=True)
+                self.queue.fail(job['id'], str(e))
+                continue
+            job['claimed_at'] = time.time()
+            self._jobs[job['id']] = job
+            if self._conn.execute("SELECT 1 FROM segments WHERE job_id = ? AND status != 'done'",
+                                  (job['id'],)).fetchone():
+                return True
+            # Tüm bölümler önceki çalışmadan kalmış; yalnızca birleştirme gerekir
+            self._start_merge(job['id'])
+
+    # --- kiralama ---
+
+    def _next_pending(self) -> Optional[sqlite3.Row]:
+        job_ids = [job_id for job_id in self._jobs if job_id not in self._merge_threads]
+        if not job_ids:
+            return None
+        return self._conn.execute(
+            f"SELECT * FROM segments WHERE status = 'pending' AND job_id IN ({', '.join('?' * len(job_ids))}) "
+            "ORDER BY job_id, idx LIMIT 1", job_ids).fetchone()
+
+    def _leased(self, lease: str) -> sqlite3.Row:
+        row = self._conn.execute("SELECT * FROM segments WHERE lease = ?", (lease,)).fetchone()
+        if row is None or row['status'] != 'leased' or row['job_id'] not in self._jobs:
+            raise BrokerError(410, "Kira geçersiz ya da süresi dolmuş")
+        return row
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Sıradaki bekleyen bölümü worker'a kiralar. Alınmış işlerde bekleyen bölüm
+        kalmadıysa kuyruktan yeni iş alınır; böylece iş öncelikleri korunur.
+        """
+        with self._lock:
+            row = self._next_pending()
+            if row is None and self._start_next_job():
+                row = self._next_pending()
+            if row is None:
+                return None
+
+            job = self._jobs[row['job_id']]
+            lease = uuid.uuid4().hex
+            self._conn.execute(
+                "UPDATE segments SET status = 'leased', lease = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1, frames_done = 0, fps = 0, log_count = 0, error = NULL "
+                "WHERE job_id = ? AND idx = ?",
+                (lease, worker, time.time() + self.lease_s, row['job_id'], row['idx']))
+            # Önceki denemeden kalan kayıt ve videolar silinir
+            for path in self._segment_files(job, row['idx']):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        end = f"{row['start_frame'] + row['frames']}" if row['frames'] else "son"
+        print(f"#{row['job_id']}/{row['idx']} -> {worker} (kare {row['start_frame']}-{end})", flush=True)
+        return {
+            'lease': lease,
+            'lease_s': self.lease_s,
+            'job_id': row['job_id'],
+            'segment': row['idx'],
+            'video': job['video'],
+            'video_size': os.path.getsize(job['video']),
+            'start_frame': row['start_frame'],
+            'frames': row['frames'],
+            'warmup_frames': self.warmup_frames,
+            'settings': job['settings'],
+        }
+
+    def heartbeat(self, lease: str, frames: int, fps: float, seq: int = 0,
+                  log: Optional[List[Dict]] = None) -> Dict:
+        """
+        Kirayı uzatır ve ilerlemeyi kaydeder. log, worker'ın seq numaralı kayıttan
+        başlayan tespit kayıtlarıdır; yanıtı kaybolup yeniden gönderilen kayıtlar
+        atlanır, böylece bölüm kaydına aynı kare iki kez yazılmaz.
+        """
+        with self._lock:
+            row = self._leased(lease)
+            records = log or []
+            if seq > row['log_count']:
+                raise BrokerError(409, f"Tespit kaydında boşluk: beklenen {row['log_count']}, gelen {seq}")
+            records = records[row['log_count'] - seq:]
+            if records:
+                with open(self._segment_log(row['job_id'], row['idx']), 'a', encoding='utf-8') as f:
+                    for record in records:
+                        record['segment'] = row['idx']
+                        f.write(json.dumps(record, separators=(',', ':')) + "\n")
+            self._conn.execute("UPDATE segments SET frames_done = ?, fps = ?, log_count = log_count + ?, "
+                               "lease_expires = ? WHERE lease = ?",
+                               (frames, fps, len(records), time.time() + self.lease_s, lease))
+        return {'lease_s': self.lease_s}
+
+    def video_path(self, job_id: int) -> str:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise BrokerError(404, f"#{job_id} aracıda işlenmiyor")
+        return job['video']
+
+    def store_output(self, lease: str, mode: str, stream, length: int) -> None:
+        """
+        Bölüm videosunu gövdeden parça parça okuyup geçici dosyaya yazar. Yükleme
+        uzun sürebileceği için kira yükleme sırasında da uzatılır.
+        """
+        with self._lock:
+            row = self._leased(lease)
+            job = self._jobs[row['job_id']]
+            if mode not in job['settings']['modes']:
+                raise BrokerError(400, f"İşte olmayan çıktı türü: {mode}")
+            path = self._segment_output(row['job_id'], row['idx'], mode)
+        temp_path = f"{path}.{lease}.part"
+        last_extend = time.time()
+        try:
+            with open(temp_path, 'wb') as f:
+                remaining = length
+                while remaining > 0:
+                    chunk = stream.read(min(CHUNK_BYTES, remaining))
+                    if not chunk:
+                        raise BrokerError(400, "Yükleme yarıda kesildi")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+                    if time.time() - last_extend > self.lease_s / 3:
+                        last_extend = time.time()
+                        with self._lock:
+                            self._leased(lease)
+                            self._conn.execute("UPDATE segments SET lease_expires = ? WHERE lease = ?",
+                                               (last_extend + self.lease_s, lease))
+            with self._lock:
+                self._leased(lease)
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def complete(self, lease: str, frames: int, seconds: float) -> None:
+        with self._lock:
+            row = self._leased(lease)
+            job = self._jobs[row['job_id']]
+            # Videonun sonundan sonra başlayan bölümün çıktısı yoktur
+            missing = [mode for mode in job['settings']['modes']
+                       if not os.path.exists(self._segment_output(row['job_id'], row['idx'], mode))]
+            if missing and frames > 0:
+                raise BrokerError(409, f"Yüklenmemiş çıktılar: {', '.join(missing)}")
+            log_path = self._segment_log(row['job_id'], row['idx'])
+            if not os.path.exists(log_path):
+                open(log_path, 'w').close()
+            self._conn.execute("UPDATE segments SET status = 'done', lease = NULL, frames_done = ?, result = ? "
+                               "WHERE job_id = ? AND idx = ?",
+                               (frames, json.dumps({'frames': frames, 'seconds': seconds, 'worker': row['worker']}),
+                                row['job_id'], row['idx']))
+            print(f"#{row['job_id']}/{row['idx']} tamamlandı: {frames} kare, {seconds:.1f} sn [{row['worker']}]",
+                  flush=True)
+            if not self._conn.execute("SELECT 1 FROM segments WHERE job_id = ? AND status != 'done'",
+                                      (row['job_id'],)).fetchone():
+                self._start_merge(row['job_id'])
+
+    def fail(self, lease: str, error: str) -> None:
+        with self._lock:
+            row = self._leased(lease)
+            print(f"#{row['job_id']}/{row['idx']} hata [{row['worker']}]: {error}", flush=True)
+            self._retry_segment(row, error)
+
+    def release(self, lease: str) -> None:
+        """Worker düzenli kapanırken bölümü bırakır; deneme hakkından düşülmez."""
+        with self._lock:
+            row = self._leased(lease)
+            self._conn.execute("UPDATE segments SET status = 'pending', lease = NULL, attempts = attempts - 1 "
+                               "WHERE lease = ?", (lease,))
+            print(f"#{row['job_id']}/{row['idx']} bırakıldı [{row['worker']}]", flush=True)
+
+    def _retry_segment(self, row: sqlite3.Row, error: str) -> None:
+        """Bölümü yeniden kiralanmak üzere bekletir; deneme hakkı bittiyse iş başarısız olur."""
+        if row['attempts'] >= self.max_attempts:
+            self._drop_job(row['job_id'], f"Bölüm {row['idx']}: {error}", failed=True)
+            return
+        self._conn.execute("UPDATE segments SET status = 'pending', lease = NULL, error = ? "
+                           "WHERE job_id = ? AND idx = ?", (error, row['job_id'], row['idx']))
+
+    def _drop_job(self, job_id: int, error: Optional[str] = None, failed: bool = False) -> None:
+        """İptal edilen ya da başarısız olan işi ve bölümlerini kaldırır; kiralar geçersiz olur."""
+        self._jobs.pop(job_id, None)
+        self._conn.execute("DELETE FROM segments WHERE job_id = ?", (job_id,))
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        if failed:
+            # Bölüm zaten deneme hakkını tükettiği için iş yeniden kuyruğa alınmaz
+            self.queue.fail(job_id, error, max_attempts=0)
+            print(f"#{job_id} başarısız: {error}", flush=True)
+        else:
+            self.queue.mark_cancelled(job_id)
+            print(f"#{job_id} iptal edildi", flush=True)
+
+    # --- süre aşımı, iptal ve ilerleme ---
+
+    def reap(self) -> None:
+        """
+        Süresi dolan kiraları düşürür, kuyrukta iptal istenen işleri durdurur ve
+        işlerin toplam ilerlemesini kuyruğa yazar. Periyodik çağrılır.
+        """
+        now = time.time()
+        with self._lock:
+            for row in self._conn.execute("SELECT * FROM segments WHERE status = 'leased' AND lease_expires < ?",
+                                          (now,)).fetchall():
+                if row['job_id'] not in self._jobs:
+                    continue
+                print(f"#{row['job_id']}/{row['idx']} kirası düştü [{row['worker']}]", flush=True)
+                self._retry_segment(row, f"{row['worker']} yanıt vermedi")
+
+            for job_id, job in list(self._jobs.items()):
+                if job_id in self._merge_threads:
+                    # Birleştirme dakikalar sürebilir; heartbeat kesilirse aynı kuyruğu kullanan
+                    # scheduler işi ölü sayıp yeniden kuyruğa alır. İptal birleştirme bitince işlenmez
+                    self.queue.heartbeat(job_id, job['total_frames'], job['total_frames'], 0.0)
+                    continue
+                rows = self._conn.execute("SELECT status, frames_done, fps FROM segments WHERE job_id = ?",
+                                          (job_id,)).fetchall()
+                frames = sum(row['frames_done'] for row in rows if row['status'] in ('leased', 'done'))
+                fps = sum(row['fps'] for row in rows if row['status'] == 'leased')
+                if self.queue.heartbeat(job_id, frames, job['total_frames'], fps):
+                    self._drop_job(job_id)
+
+    # --- birleştirme ---
+
+    def _start_merge(self, job_id: int) -> None:
+        thread = threading.Thread(target=self._merge, args=(job_id,), name=f"merge-{job_id}", daemon=True)
+        self._merge_threads[job_id] = thread
+        thread.start()
+
+    def _merge(self, job_id: int) -> None:
+        """
+        Bölüm videolarını sırayla okuyup her çıktı türü için tek videoya, tespit
+        kayıtlarını da <video adı>_detections.jsonl dosyasına yazar. Dosyalar önce
+        geçici adla yazılır; yarım çıktı bırakılmaz.
+        """
+        with self._lock:
+            job = self._jobs[job_id]
+            rows = self._conn.execute("SELECT * FROM segments WHERE job_id = ? ORDER BY idx", (job_id,)).fetchall()
+        settings = job['settings']
+        outputs = output_paths(job['video'], job['output_dir'], settings['modes'])
+        base = os.path.splitext(os.path.basename(job['video']))[0]
+        outputs['detections'] = os.path.join(job['output_dir'], f"{base}_detections.jsonl")
+        temp_paths = {key: f"{os.path.splitext(path)[0]}.merging{os.path.splitext(path)[1]}"
+                      for key, path in outputs.items()}
+        started = time.perf_counter()
+        print(f"#{job_id} {len(rows)} bölüm birleştiriliyor...", flush=True)
+        try:
+            os.makedirs(job['output_dir'], exist_ok=True)
+            frames = 0
+            for mode in settings['modes']:
+                frames = self._concat_videos([self._segment_output(job_id, row['idx'], mode) for row in rows],
+                                             temp_paths[mode])
+            with open(temp_paths['detections'], 'w', encoding='utf-8') as out:
+                for row in rows:
+                    with open(self._segment_log(job_id, row['idx']), encoding='utf-8') as f:
+                        shutil.copyfileobj(f, out)
+            for key, path in outputs.items():
+                os.replace(temp_paths[key], path)
+        except Exception as e:
+            for path in temp_paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            print(f"#{job_id} birleştirilemedi: {e}", flush=True)
+            with self._lock:
+                # Biten bölümler saklanır; iş yeniden alınınca yalnızca birleştirme tekrarlanır
+                self._jobs.pop(job_id, None)
+                self.queue.fail(job_id, f"Birleştirme hatası: {e}")
+                self._merge_threads.pop(job_id, None)
+            return
+
+        seconds = time.time() - job['claimed_at']
+        results = [json.loads(row['result']) for row in rows if row['result']]
+        result = {
+            'outputs': outputs,
+            'frames': frames,
+            'seconds': round(seconds, 3),
+            'fps': round(frames / seconds, 3) if seconds > 0 else 0.0,
+            'segments': len(rows),
+            'workers': sorted({r['worker'] for r in results}),
+            'merge_seconds': round(time.perf_counter() - started, 3),
+        }
+        with self._lock:
+            self.queue.complete(job_id, result=result)
+            self._jobs.pop(job_id, None)
+            self._conn.execute("DELETE FROM segments WHERE job_id = ?", (job_id,))
+            self._merge_threads.pop(job_id, None)
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        print(f"#{job_id} tamamlandı: {frames} kare, {len(result['workers'])} worker, "
+              f"birleştirme {result['merge_seconds']:.1f} sn", flush=True)
+
+    @staticmethod
+    def _concat_videos(paths: List[str], output_path: str) -> int:
+        """
+        Aynı boyuttaki bölüm videolarını ilk bölümün fps'iyle tek videoya yazar. Boş
+        bölümlerin (videonun sonundan sonra başlayan) dosyası yoktur ve atlanır.
+        """
+        writer = None
+        frames = 0
+        try:
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                cap = cv2.VideoCapture(path)
+                try:
+                    if not cap.isOpened():
+                        raise IOError(f"Bölüm videosu açılamadı: {path}")
+                    while True:
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        if writer is None:
+                            fps = cap.get(cv2.CAP_PROP_FPS) or 25
+                            writer = ThreadedVideoWriter(output_path, 'mp4v', fps, frame.shape[1::-1])
+                            if not writer.isOpened():
+                                raise IOError(f"Video yazıcı açılamadı: {output_path}")
+                        writer.write(frame)
+                        frames += 1
+                finally:
+                    cap.release()
+        finally:
+            if writer is not None:
+                writer.release()
+        if writer is None:
+            raise IOError("Bölüm videolarında kare yok")
+        return frames
+
+    def status(self) -> Dict:
+        with self._lock:
+            segments = {status: 0 for status in SEGMENT_STATUSES}
+            segments.update(dict(self._conn.execute("SELECT status, COUNT(*) FROM segments GROUP BY status")
+                                 .fetchall()))
+            workers = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT worker FROM segments WHERE status = 'leased'")]
+            return {'jobs': self.queue.counts(), 'segments': segments, 'active_jobs': sorted(self._jobs),
+                    'workers': workers}
+
+
+class _BrokerHandler(BaseHTTPRequestHandler):
+    server_version = "SoccerBroker/1"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # İstek günlüğü yerine aracının kendi olay satırları yazdırılır
+        pass
+
+    @property
+    def broker(self) -> SegmentBroker:
+        return self.server.broker
+
+    def _send_json(self, status: int, payload: Optional[Dict] = None) -> None:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status >= 400:
+            # Gövdesi okunmamış olabilecek istekten sonra bağlantı yeniden kullanılmaz
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise BrokerError(400, "Geçersiz JSON")
+
+    def _dispatch(self, method: str) -> None:
+        token = self.server.token
+        try:
+            if token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+                raise BrokerError(401, "Geçersiz token")
+            parts = [part for part in self.path.split('?')[0].split('/') if part]
+            if len(parts) < 2 or parts[0] != 'api':
+                raise BrokerError(404, "Bilinmeyen adres")
+            route = (method, parts[1])
+            if route == ('GET', 'status'):
+                self._send_json(200, self.broker.status())
+            elif route == ('GET', 'video') and len(parts) == 3:
+                self._send_video(int(parts[2]))
+            elif route == ('PUT', 'output') and len(parts) == 4:
+                self.broker.store_output(parts[2], parts[3], self.rfile, int(self.headers.get('Content-Length') or 0))
+                self._send_json(200, {})
+            elif method == 'POST':
+                payload = self._read_json()
+                if parts[1] == 'claim':
+                    segment = self.broker.claim(str(payload.get('worker') or self.client_address[0]))
+                    self._send_json(200, segment) if segment else self._send_json(204)
+                elif parts[1] == 'heartbeat':
+                    self._send_json(200, self.broker.heartbeat(payload['lease'], int(payload.get('frames', 0)),
+                                                               float(payload.get('fps', 0.0)),
+                                                               int(payload.get('seq', 0)), payload.get('log')))
+                elif parts[1] == 'complete':
+                    self.broker.complete(payload['lease'], int(payload.get('frames', 0)),
+                                         float(payload.get('seconds', 0.0)))
+                    self._send_json(200, {})
+                elif parts[1] == 'fail':
+                    self.broker.fail(payload['lease'], str(payload.get('error', '')))
+                    self._send_json(200, {})
+                elif parts[1] == 'release':
+                    self.broker.release(payload['lease'])
+                    self._send_json(200, {})
+                else:
+                    raise BrokerError(404, "Bilinmeyen adres")
+            else:
+                raise BrokerError(404, "Bilinmeyen adres")
+        except BrokerError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {'error': f"Geçersiz istek: {e}"})
+        except Exception as e:
+            print(f"İstek işlenemedi {method} {self.path}: {e}", flush=True)
+            self._send_json(500, {'error': str(e)})
+
+    def _send_video(self, job_id: int) -> None:
+        path = self.broker.video_path(job_id)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK_BYTES)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+
+def create_server(broker: SegmentBroker, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                  token: Optional[str] = None) -> ThreadingHTTPServer:
+    """Aracının HTTP sunucusu; port=0 verilirse boş bir port seçilir (server_address'ten okunur)."""
+    server = ThreadingHTTPServer((host, port), _BrokerHandler)
+    server.daemon_threads = True
+    server.broker = broker
+    server.token = token
+    return server
+
+
+def run_broker(db_path: str = DEFAULT_QUEUE_PATH, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+               token: Optional[str] = None, reap_interval_s: float = 1.0,
+               stale_after_s: float = DEFAULT_STALE_AFTER_S, **broker_kwargs) -> int:
+    """Aracıyı SIGINT/SIGTERM gelene kadar çalıştırır; kapanırken alınan işler kuyruğa döner."""
+    broker = SegmentBroker(db_path, **broker_kwargs)
+    recovered = broker.queue.recover(stale_after_s)
+    if recovered:
+        print(f"Yarıda kalan işler kuyruğa geri alındı: {', '.join(f'#{job_id}' for job_id in recovered)}")
+    server = create_server(broker, host, port, token)
+    stop_event = threading.Event()
+    previous_handlers = {sig: signal.signal(sig, lambda signum, frame: stop_event.set())
+                         for sig in (signal.SIGINT, signal.SIGTERM)}
+    serve_thread = threading.Thread(target=server.serve_forever, name="broker-http", daemon=True)
+    serve_thread.start()
+    print(f"Aracı dinliyor: http://{host}:{server.server_address[1]} (kuyruk: {db_path}, "
+          f"bölüm: {broker.segment_frames} kare, kira: {broker.lease_s:.0f} sn)", flush=True)
+    try:
+        while not stop_event.wait(reap_interval_s):
+            broker.reap()
+    finally:
+        print("Aracı durduruluyor; alınan işler kuyruğa geri bırakılıyor...", flush=True)
+        server.shutdown()
+        server.server_close()
+        broker.close()
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+    return 0
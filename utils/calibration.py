@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from utils.file_lock import file_lock
+
+# Parmak izi: saha çizgisi maskesinin küçültülmüş ikili hali (+ kaba çim maskesi)
+LINE_GRID = (32, 18)
+GRASS_GRID = (16, 9)
+LINE_CELL_THRESHOLD = 0.04  # hücredeki çizgi pikseli oranı bunu aşarsa bit 1 olur
+DEFAULT_CALIBRATION_DIR = "calibration"
+
+
+def pitch_line_mask(frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Çim (yeşil) bölgesini ve bu bölge içindeki beyaz saha çizgilerini ikili maske olarak döner.
+    """
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    grass = cv2.inRange(hsv, (35, 40, 40), (85, 255, 255))
+    # Çizgiler ve oyuncular çim maskesinde delik bırakır; kapama ile doldurulur
+    grass = cv2.morphologyEx(grass, cv2.MORPH_CLOSE, np.ones((15, 15), np.uint8))
+    white = cv2.inRange(hsv, (0, 0, 170), (180, 60, 255))
+    lines = cv2.bitwise_and(white, grass)
+    return grass, lines
+
+
+def compute_fingerprint(frame: np.ndarray) -> np.ndarray:
+    """
+    Kamera görüntüsünün algısal parmak izi (paketlenmiş bit dizisi, uint8).
+    Aynı stadyum ve yayın kamerasından gelen kareler küçük Hamming mesafesi verir.
+    """
+    grass, lines = pitch_line_mask(frame)
+    line_cells = cv2.resize(lines, LINE_GRID, interpolation=cv2.INTER_AREA) > 255 * LINE_CELL_THRESHOLD
+    grass_cells = cv2.resize(grass, GRASS_GRID, interpolation=cv2.INTER_AREA) > 127
+    return np.packbits(np.concatenate([line_cells.ravel(), grass_cells.ravel()]))
+
+
+def hamming_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Normalize edilmiş Hamming mesafesi (0-1)."""
+    return float(np.unpackbits(np.bitwise_xor(a, b)).mean())
+
+
+class CalibrationStore:
+    """
+    Geçmiş çalışmalardan iyi skorlu homografileri diskte saklar (directory/index.json).
+
+    Kayıtlar kamera görüntüsünün parmak izi ile eşlenir; yeni bir video başlarken en yakın
+    kayıt FrameProcessor'a başlangıç homografisi olarak verilir. Dizin atomik olarak
+    (geçici dosya + os.replace) yazılır, böylece yarıda kalan yazma dizini bozmaz.
+    Aynı dizini birden çok süreç (arayüz, scheduler worker'ları) kullanabilir: her
+    değişiklik kilit altında diskteki güncel dizin yeniden okunarak uygulanır.
+    """
+
+    INDEX_FILE = "index.json"
+    LOCK_FILE = ".index.lock"
+
+    def __init__(self, directory: str = DEFAULT_CALIBRATION_DIR, max_distance: float = 0.12,
+                 max_entries: int = 200):
+        self.directory = directory
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+        self.lock_path = os.path.join(directory, self.LOCK_FILE)
+        self.entries: List[Dict] = self._load()
+
+    def _load(self) -> List[Dict]:
+        if not os.path.exists(self.index_path):
+            return []
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                entries = json.load(f).get('entries', [])
+        except (OSError, ValueError) as e:
+            print(f"Kalibrasyon dizini okunamadı ({e}), boş dizinle devam ediliyor...")
+            return []
+        for entry in entries:
+            entry['_fingerprint'] = np.frombuffer(bytes.fromhex(entry['fingerprint']), dtype=np.uint8)
+        return entries
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        payload = {'version': 1, 'entries': [{k: v for k, v in entry.items() if not k.startswith('_')}
+                                             for entry in self.entries]}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".index-", suffix=".json")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def match(self, fingerprint: np.ndarray, frame_size: Tuple[int, int]) -> Optional[Dict]:
+        """
+        En yakın kaydı döner (max_distance içinde ve aynı en-boy oranında). Kaydın matrisi
+        istenen kare boyutuna ölçeklenmiş olarak 'matrix' anahtarında verilir.
+        """
+        # Aynı dizini kullanan diğer süreçlerin kayıtları da görülsün (dizin atomik yazılır, kilit gerekmez)
+        self.entries = self._load()
+        best, best_distance = None, self.max_distance
+        for entry in self.entries:
+            width, height = entry['frame_size']
+            if abs(width / height - frame_size[0] / frame_size[1]) > 0.01:
+                continue
+            distance = hamming_distance(fingerprint, entry['_fingerprint'])
+            if distance <= best_distance:
+                best, best_distance = entry, distance
+        if best is None:
+            return None
+
+        # Kaynak (görüntü) koordinatları farklı çözünürlük için yeniden ölçeklenir
+        sx = best['frame_size'][0] / frame_size[0]
+        sy = best['frame_size'][1] / frame_size[1]
+        matrix = np.array(best['matrix'], dtype=np.float64) @ np.diag([sx, sy, 1.0])
+        return {'id': best['id'], 'matrix': matrix, 'score': best['score'], 'distance': best_distance,
+                'source_video': best.get('source_video')}
+
+    def add(self, fingerprint: np.ndarray, matrix: np.ndarray, score: float, frame_size: Tuple[int, int],
+            source_video: Optional[str] = None) -> str:
+        """
+        Homografiyi kaydeder. Aynı kamera görüntüsü için daha iyi skorlu bir kayıt varsa
+        yenisi eklenmez; daha kötüyse yenisiyle değiştirilir.
+        """
+        with file_lock(self.lock_path):
+            # Diğer süreçlerin eklediği kayıtlar üzerine yazılmasın diye dizin yeniden okunur
+            self.entries = self._load()
+            entry_id = self._add(fingerprint, matrix, score, frame_size, source_video)
+            self._save()
+        return entry_id
+
+    def _add(self, fingerprint: np.ndarray, matrix: np.ndarray, score: float, frame_size: Tuple[int, int],
+             source_video: Optional[str]) -> str:
+        now = time.time()
+        for entry in self.entries:
+            if (tuple(entry['frame_size']) == tuple(frame_size)
+                    and hamming_distance(fingerprint, entry['_fingerprint']) <= self.max_distance / 2):
+                entry['last_used'] = now
+                if score < entry['score']:
+                    entry.update(matrix=np.asarray(matrix, dtype=np.float64).tolist(), score=float(score),
+                                 fingerprint=fingerprint.tobytes().hex(), source_video=source_video)
+                    entry['_fingerprint'] = fingerprint
+                return entry['id']
+
+        entry = {
+            'id': uuid.uuid4().hex[:12],
+            'fingerprint': fingerprint.tobytes().hex(),
+            'matrix': np.asarray(matrix, dtype=np.float64).tolist(),
+            'score': float(score),
+            'frame_size': [int(frame_size[0]), int(frame_size[1])],
+            'source_video': source_video,
+            'created': now,
+            'last_used': now,
+            '_fingerprint': fingerprint,
+        }
+        self.entries.append(entry)
+        if len(self.entries) > self.max_entries:
+            # En uzun süredir kullanılmayan kayıtlar atılır
+            self.entries.sort(key=lambda e: e['last_used'], reverse=True)
+            del self.entries[self.max_entries:]
+        return entry['id']
+
+    def touch(self, entry_id: str) -> None:
+        with file_lock(self.lock_path):
+            self.entries = self._load()
+            for entry in self.entries:
+                if entry['id'] == entry_id:
+                    entry['last_used'] = time.time()
+                    self._save()
+                    return
@@ -0,0 +1,141 @@
+import copyreg
+import os
+import pickle
+import tempfile
+import time
+from typing import Dict, Optional
+
+import supervision as sv
+
+CHECKPOINT_FILE = "checkpoint.pkl"
+CHECKPOINT_VERSION = 1
+
+
+def _restore_byte_track(state: Dict) -> sv.ByteTrack:
+    tracker = sv.ByteTrack()
+    tracker.__dict__.update(state)
+    return tracker
+
+
+def _reduce_byte_track(tracker):
+    return _restore_byte_track, (dict(tracker.__dict__),)
+
+
+# supervision'ın kullanımdan kaldırma sarmalayıcısı ByteTrack sınıfını pickle'ın bulamayacağı
+# şekilde gizler; nesne durumu üzerinden yeniden kurulur
+copyreg.pickle(type(sv.ByteTrack()), _reduce_byte_track)
+
+
+def video_identity(video_path: str) -> Dict:
+    """Devam edilecek çalışmanın aynı videoya ait olduğunu doğrulamak için kimlik."""
+    stat = os.stat(video_path)
+    return {'path': os.path.abspath(video_path), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+
+def checkpoint_path(run_dir: str) -> str:
+    return os.path.join(run_dir, CHECKPOINT_FILE)
+
+
+def has_checkpoint(run_dir: Optional[str]) -> bool:
+    return bool(run_dir) and os.path.exists(checkpoint_path(run_dir))
+
+
+def save_checkpoint(run_dir: str, state: Dict) -> str:
+    """
+    Durumu çalışma dizinine atomik olarak yazar: geçici dosya + fsync + os.replace.
+    Yazma sırasında çökme olursa önceki kontrol noktası bozulmadan kalır.
+    """
+    path = checkpoint_path(run_dir)
+    payload = dict(state, version=CHECKPOINT_VERSION, saved_at=time.time())
+    fd, tmp_path = tempfile.mkstemp(dir=run_dir, prefix=".checkpoint-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def load_checkpoint(run_dir: str) -> Optional[Dict]:
+    path = checkpoint_path(run_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except Exception as e:
+        print(f"Kontrol noktası okunamadı ({e}): {path}")
+        return None
+    if state.get('version') != CHECKPOINT_VERSION:
+        print(f"Kontrol noktası sürümü uyumsuz: {path}")
+        return None
+    return state
+
+
+def remove_checkpoint(run_dir: str) -> None:
+    path = checkpoint_path(run_dir)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def find_resumable_run(root: str, video_path: str) -> Optional[Dict]:
+    """
+    root altındaki çalışma dizinlerinde bu videoya ait en son kontrol noktasını bulur.
+    {'run_dir', 'state'} döner (state: load_checkpoint çıktısı); yoksa None.
+    """
+    if not os.path.isdir(root) or not os.path.exists(video_path):
+        return None
+    identity = video_identity(video_path)
+    best = None
+    for name in os.listdir(root):
+        run_dir = os.path.join(root, name)
+        if not has_checkpoint(run_dir):
+            continue
+        state = load_checkpoint(run_dir)
+        if state is None or state.get('video') != identity:
+            continue
+        if best is None or state['saved_at'] > best['state']['saved_at']:
+            best = {'run_dir': run_dir, 'state': state}
+    return best
+
+
+class Checkpointer:
+    """
+    Kontrol noktası zamanlaması. Aralık, son yazma süresinin max_overhead oranına göre
+    uyarlanır: yazma 50 ms sürüyorsa %1 sınırı için en az 5 sn beklenir.
+    """
+
+    def __init__(self, run_dir: str, max_overhead: float = 0.01, min_interval_s: float = 10.0):
+        self.run_dir = run_dir
+        self.max_overhead = max_overhead
+        self.min_interval_s = min_interval_s
+        self.interval_s = min_interval_s
+        self.total_cost_s = 0.0
+        self.saves = 0
+        self._started = time.perf_counter()
+        self._last_save = self._started
+
+    def due(self) -> bool:
+        return time.perf_counter() - self._last_save >= self.interval_s
+
+    def save(self, state: Dict) -> str:
+        start = time.perf_counter()
+        path = save_checkpoint(self.run_dir, state)
+        end = time.perf_counter()
+        cost = end - start
+        self.total_cost_s += cost
+        self.saves += 1
+        self._last_save = end
+        self.interval_s = max(self.min_interval_s, cost / self.max_overhead)
+        return path
+
+    @property
+    def overhead(self) -> float:
+        """Kontrol noktası yazmaya harcanan sürenin toplam süreye oranı."""
+        elapsed = time.perf_counter() - self._started
+        return self.total_cost_s / elapsed if elapsed > 0 else 0.0
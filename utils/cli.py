@@ -0,0 +1,538 @@
+"""
+Arayüzsüz (PyQt gerektirmeyen) toplu işleme aracı.
+
+Videoları FrameProcessor, FrameAnnotator ve VideoProcessor ile işler ve seçilen
+çıktı türlerini ara JPEG yazmadan doğrudan video olarak kaydeder:
+
+    python -m utils.cli process videos/match.mp4
+    python -m utils.cli process videos/ --modes integrated radar_only --output-dir outputs
+    python -m utils.cli process a.mp4 b.mp4 --decoder pyav --prefetch 16 --decode-size 1280x720
+    python -m utils.cli process videos/ --skip-existing --report batch.json
+
+Her video için kare/sn, ETA ve sonunda aşama süreleri yazdırılır; --report ile tüm
+çalışmanın özeti JSON olarak kaydedilir.
+
+Kalıcı iş kuyruğu (utils.job_queue) ve worker süreçleri (utils.scheduler):
+
+    python -m utils.cli submit videos/ --priority 5 --modes integrated radar_only
+    python -m utils.cli schedule --workers 2
+    python -m utils.cli jobs --watch
+    python -m utils.cli cancel 12
+
+Birden çok makine için kuyruğu HTTP aracısı (utils.broker) dağıtır; videolar
+bölümlere ayrılır ve uzak worker'lar (utils.remote_worker) bölümleri paralel işler:
+
+    python -m utils.cli broker --host 0.0.0.0 --token gizli
+    python -m utils.cli remote-worker http://sunucu:8765 --token gizli
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+
+from utils.backend import (
+    FrameProcessor, FrameAnnotator, VideoProcessor,
+    PLAYER_MODEL_PATH, KEYPOINT_MODEL_PATH, BALL_MODEL_PATH,
+)
+from utils.calibration import CalibrationStore
+from utils.config import SoccerPitchConfiguration
+from utils.export import EXPORT_MODES, ThreadedVideoWriter, radar_inset_geometry
+from utils.job_queue import DEFAULT_QUEUE_PATH, JOB_STATUSES, JobQueue
+from utils.profiler import StageProfiler, ThroughputMeter
+from utils.video_io import DECODERS
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi')
+
+# Video başına işleme ayarları; kuyruktaki işlerde JSON olarak saklanır
+DEFAULT_SETTINGS = {
+    'modes': ['integrated'],
+    'decoder': 'auto',
+    'prefetch': 8,
+    'decode_size': None,
+    'hw_accel': False,
+    'radar_size': [1600, 1000],
+    'skip_cutaways': True,
+    'pitch_filter': True,
+    'calibration': True,
+    'max_frames': None,
+}
+
+
+def _parse_size(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not value:
+        return None
+    try:
+        width, height = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz boyut: {value} (örn. 1280x720)")
+    return width, height
+
+
+def collect_videos(inputs: Sequence[str]) -> List[str]:
+    """Dosya ve dizin girdilerinden video listesi; dizinler alfabetik sırayla taranır."""
+    videos = []
+    for path in inputs:
+        if os.path.isdir(path):
+            videos.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if name.lower().endswith(VIDEO_EXTENSIONS))
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            print(f"Bulunamadı, atlanıyor: {path}", file=sys.stderr)
+    return videos
+
+
+def output_paths(video_path: str, output_dir: str, modes: Sequence[str]) -> Dict[str, str]:
+    """Arayüzle aynı adlandırma: <çıktı dizini>/<video adı>_<mod>.mp4"""
+    base = os.path.splitext(os.path.basename(video_path))[0]
+    return {mode: os.path.join(output_dir, f"{base}_{mode}.mp4") for mode in modes}
+
+
+def _format_eta(seconds: float) -> str:
+    if seconds < 0:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def process_video(video_processor: VideoProcessor, outputs: Dict[str, str], max_frames: Optional[int] = None,
+                  report_interval_s: float = 5.0,
+                  progress: Optional[Callable[[int, int, float], None]] = None,
+                  cancelled: Optional[Callable[[], bool]] = None, start_frame: int = 0,
+                  warmup_frames: int = 0, detection_log: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Videoyu baştan sona işler ve her çıktı türünü kendi ThreadedVideoWriter'ına yazar.
+    Radar yerleşimi ilk karede bir kez hesaplanır. Ctrl+C'de o ana kadar yazılanlar
+    kapatılıp istisna yeniden fırlatılır.
+
+    progress verilirse ilerleme satırı yerine her report_interval_s'de
+    progress(kare, toplam, kare/sn) çağrılır; cancelled() True dönerse işlem yarıda
+    bırakılır ve sonuçta 'cancelled': True olur.
+
+    start_frame ile videonun bir bölümü işlenebilir (max_frames bölüm uzunluğudur).
+    Bölümden önceki warmup_frames kare takip ve takım renklerini oturtmak için
+    işlenir ama yazılmaz. detection_log her yazılan karenin tespit kaydıyla çağrılır.
+    """
+    warmup_frames = min(warmup_frames, start_frame)
+    if not video_processor.setup_video_io(start_frame=start_frame - warmup_frames):
+        raise IOError(f"Video açılamadı: {video_processor.video_path}")
+
+    writers: Dict[str, ThreadedVideoWriter] = {}
+    inset = None
+    frames = 0
+    throughput = ThroughputMeter()
+    throughput.start()
+    last_report = time.perf_counter()
+    total_frames = max(video_processor.total_frames - start_frame, 0)
+    if max_frames:
+        total_frames = min(total_frames, max_frames)
+
+    def open_writers(annotated, radar):
+        sizes = {'integrated': annotated.shape[1::-1], 'annotated_only': annotated.shape[1::-1],
+                 'radar_only': radar.shape[1::-1]}
+        for mode, path in outputs.items():
+            writer = ThreadedVideoWriter(path, 'mp4v', video_processor.fps, tuple(sizes[mode]))
+            if not writer.isOpened():
+                writer.release()
+                raise IOError(f"Video yazıcı açılamadı: {path}")
+            writers[mode] = writer
+
+    was_cancelled = False
+    try:
+        for _ in range(warmup_frames):
+            if cancelled is not None and cancelled():
+                break
+            ret, frame = video_processor.cap.read()
+            if not ret:
+                break
+            video_processor.process_frame(frame)
+            if progress is not None and time.perf_counter() - last_report >= report_interval_s:
+                last_report = time.perf_counter()
+                progress(0, total_frames, 0.0)
+
+        while max_frames is None or frames < max_frames:
+            if cancelled is not None and cancelled():
+                was_cancelled = True
+                break
+            with video_processor.profiler.stage('decode'):
+                ret, frame = video_processor.cap.read()
+            if not ret:
+                break
+            annotated, radar = video_processor.process_frame(frame)
+            if not writers:
+                open_writers(annotated, radar)
+                inset = radar_inset_geometry(annotated.shape[1::-1], radar.shape[1::-1])
+
+            with video_processor.profiler.stage('video_write'):
+                if 'annotated_only' in writers:
+                    # Entegre çıktı aynı kareye yazılacağı için kopyası kuyruğa verilir
+                    writers['annotated_only'].write(annotated.copy() if 'integrated' in writers else annotated)
+                if 'radar_only' in writers:
+                    writers['radar_only'].write(radar)
+                if 'integrated' in writers:
+                    x, y, w, h = inset
+                    annotated[y:y + h, x:x + w] = cv2.resize(radar, (w, h), interpolation=cv2.INTER_AREA)
+                    writers['integrated'].write(annotated)
+
+            if detection_log is not None:
+                detection_log(video_processor.detection_record(start_frame + frames))
+            video_processor.profiler.end_frame()
+            frames += 1
+            throughput.update()
+            now = time.perf_counter()
+            if now - last_report >= report_interval_s:
+                last_report = now
+                total_frames = max(total_frames, frames)
+                if progress is not None:
+                    progress(frames, total_frames, throughput.fps)
+                else:
+                    print(f"  {frames}/{total_frames} kare | {throughput.fps:.1f} kare/sn | "
+                          f"kalan {_format_eta(throughput.eta(total_frames - frames))}", flush=True)
+    finally:
+        for writer in writers.values():
+            writer.release()
+        video_processor.cap.release()
+        video_processor.save_calibration()
+
+    elapsed = throughput.elapsed
+    return {
+        'video': video_processor.video_path,
+        'outputs': dict(outputs),
+        'frames': frames,
+        'cancelled': was_cancelled,
+        'seconds': round(elapsed, 3),
+        'fps': round(frames / elapsed, 3) if elapsed > 0 else 0.0,
+        'stages_mean_ms': {name: round(ms, 3)
+                           for name, ms in video_processor.profiler.summary()['stages_mean_ms'].items()},
+        'shots': video_processor.shot_report(),
+    }
+
+
+def _print_video_summary(stats: Dict) -> None:
+    print(f"  Tamamlandı: {stats['frames']} kare, {stats['seconds']:.1f} sn ({stats['fps']:.2f} kare/sn)")
+    stages = sorted(stats['stages_mean_ms'].items(), key=lambda item: -item[1])
+    for name, ms in stages:
+        print(f"    {name:<28}{ms:8.1f} ms/kare")
+    print(f"    atlanan ara çekim karesi: {stats['shots']['frames_skipped']}")
+
+
+def settings_from_args(args: argparse.Namespace) -> Dict:
+    return {
+        'modes': list(dict.fromkeys(args.modes)),
+        'decoder': args.decoder,
+        'prefetch': args.prefetch,
+        'decode_size': list(args.decode_size) if args.decode_size else None,
+        'hw_accel': args.hw_accel,
+        'radar_size': list(args.radar_size),
+        'skip_cutaways': not args.no_skip_cutaways,
+        'pitch_filter': not args.no_pitch_filter,
+        'calibration': not args.no_calibration,
+        'max_frames': args.max_frames,
+    }
+
+
+def load_frame_processor(player_model: str = PLAYER_MODEL_PATH, keypoint_model: str = KEYPOINT_MODEL_PATH,
+                         ball_model: str = BALL_MODEL_PATH) -> FrameProcessor:
+    frame_processor = FrameProcessor(pitch_config=SoccerPitchConfiguration())
+    frame_processor.load_models(player_model, keypoint_model, ball_model)
+    return frame_processor
+
+
+def create_video_processor(video_path: str, output_dir: str, frame_processor: FrameProcessor,
+                           annotator: FrameAnnotator, settings: Dict,
+                           calibration_store: Optional[CalibrationStore] = None) -> VideoProcessor:
+    """Ayarlara göre VideoProcessor kurar; takip, takım renkleri ve radar durumu sıfırlanır."""
+    settings = dict(DEFAULT_SETTINGS, **settings)
+    frame_processor.reset_state()
+    frame_processor.pitch_filter_enabled = settings['pitch_filter']
+    radar_width, radar_height = settings['radar_size']
+    return VideoProcessor(
+        video_path, output_dir, frame_processor, annotator,
+        radar_width=radar_width, radar_height=radar_height,
+        profiler=StageProfiler(), decoder=settings['decoder'], prefetch=settings['prefetch'],
+        decode_size=tuple(settings['decode_size']) if settings['decode_size'] else None,
+        hw_accel=settings['hw_accel'],
+        calibration_store=calibration_store if settings['calibration'] else None,
+        skip_cutaways=settings['skip_cutaways'],
+    )
+
+
+def run_process(args: argparse.Namespace) -> int:
+    videos = collect_videos(args.inputs)
+    if not videos:
+        print("İşlenecek video bulunamadı.", file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+    settings = settings_from_args(args)
+    modes = settings['modes']
+
+    try:
+        frame_processor = load_frame_processor(args.player_model, args.keypoint_model, args.ball_model)
+    except Exception as e:
+        print(f"Modeller yüklenemedi: {e}", file=sys.stderr)
+        return 2
+    annotator = FrameAnnotator()
+    calibration_store = CalibrationStore()
+
+    results, failures = [], []
+    batch_start = time.perf_counter()
+    for index, video_path in enumerate(videos, start=1):
+        outputs = output_paths(video_path, args.output_dir, modes)
+        if args.skip_existing and all(os.path.exists(path) for path in outputs.values()):
+            print(f"[{index}/{len(videos)}] Çıktılar mevcut, atlanıyor: {video_path}")
+            continue
+        print(f"[{index}/{len(videos)}] {video_path}", flush=True)
+
+        video_processor = create_video_processor(video_path, args.output_dir, frame_processor, annotator,
+                                                 settings, calibration_store)
+        try:
+            stats = process_video(video_processor, outputs, max_frames=settings['max_frames'],
+                                  report_interval_s=args.report_interval)
+        except KeyboardInterrupt:
+            print("\nKullanıcı tarafından durduruldu.", file=sys.stderr)
+            failures.append({'video': video_path, 'error': 'interrupted'})
+            break
+        except Exception as e:
+            print(f"  Hata: {e}", file=sys.stderr)
+            failures.append({'video': video_path, 'error': str(e)})
+            continue
+        finally:
+            video_processor.executor.shutdown(wait=True)
+        _print_video_summary(stats)
+        results.append(stats)
+
+    batch_seconds = time.perf_counter() - batch_start
+    total_frames = sum(stats['frames'] for stats in results)
+    print(f"Toplam: {len(results)} video, {total_frames} kare, {batch_seconds:.1f} sn "
+          f"({total_frames / batch_seconds if batch_seconds > 0 else 0.0:.2f} kare/sn), hata: {len(failures)}")
+
+    if args.report:
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'modes': modes,
+            'seconds': round(batch_seconds, 3),
+            'frames': total_frames,
+            'videos': results,
+            'failures': failures,
+        }
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Rapor yazıldı: {args.report}")
+    return 1 if failures else 0
+
+
+def run_submit(args: argparse.Namespace) -> int:
+    videos = collect_videos(args.inputs)
+    if not videos:
+        print("Kuyruğa eklenecek video bulunamadı.", file=sys.stderr)
+        return 1
+    queue = JobQueue(args.queue)
+    settings = settings_from_args(args)
+    for video_path in videos:
+        job_id = queue.submit(video_path, settings, priority=args.priority, output_dir=args.output_dir)
+        print(f"#{job_id} kuyruğa eklendi: {video_path}")
+    return 0
+
+
+def format_job_line(job: Dict) -> str:
+    status = job['status']
+    if status == 'running':
+        detail = (f"%{job['progress'] * 100:5.1f}  {job['frames_done']}/{job['total_frames']} kare  "
+                  f"{job['fps']:.1f} kare/sn  [{job['worker']}]")
+    elif status in ('failed', 'queued') and job['error']:
+        detail = job['error']
+    elif status == 'done' and job['result']:
+        detail = f"{job['result']['frames']} kare, {job['result']['fps']:.1f} kare/sn"
+    else:
+        detail = ""
+    return f"#{job['id']:<5}{status:<10}p{job['priority']:<4}{os.path.basename(job['video']):<32} {detail}"
+
+
+def run_jobs(args: argparse.Namespace) -> int:
+    queue = JobQueue(args.queue)
+    statuses = args.status or None
+    try:
+        while True:
+            jobs = queue.list(statuses=statuses, limit=args.limit)
+            if args.watch:
+                print("\033[2J\033[H", end="")
+            counts = queue.counts()
+            print(" | ".join(f"{status}: {counts[status]}" for status in JOB_STATUSES))
+            for job in jobs:
+                print(format_job_line(job))
+            if not args.watch:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+def run_cancel(args: argparse.Namespace) -> int:
+    queue = JobQueue(args.queue)
+    failed = 0
+    for job_id in args.job_ids:
+        if queue.cancel(job_id):
+            print(f"#{job_id} iptal edildi")
+        else:
+            print(f"#{job_id} iptal edilemedi (bulunamadı ya da bitmiş)", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+def run_retry(args: argparse.Namespace) -> int:
+    queue = JobQueue(args.queue)
+    failed = 0
+    for job_id in args.job_ids:
+        if queue.retry(job_id):
+            print(f"#{job_id} yeniden kuyruğa alındı")
+        else:
+            print(f"#{job_id} yeniden kuyruğa alınamadı (bulunamadı ya da hâlâ aktif)", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+def run_schedule(args: argparse.Namespace) -> int:
+    # utils.scheduler bu modüldeki işleme fonksiyonlarını kullanır; döngüsel içe aktarmayı önlemek için burada
+    from utils.scheduler import Scheduler
+
+    model_paths = (args.player_model, args.keypoint_model, args.ball_model)
+    scheduler = Scheduler(args.queue, workers=args.workers, model_paths=model_paths,
+                          exit_when_idle=args.exit_when_idle)
+    return scheduler.run()
+
+
+def run_broker(args: argparse.Namespace) -> int:
+    from utils.broker import run_broker as serve
+
+    return serve(args.queue, host=args.host, port=args.port, token=args.token, work_dir=args.work_dir,
+                 segment_frames=args.segment_frames, warmup_frames=args.warmup_frames, lease_s=args.lease)
+
+
+def run_remote_worker(args: argparse.Namespace) -> int:
+    import signal
+    import threading
+    from utils.remote_worker import remote_worker_main
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        print("Worker durduruluyor; çalışan bölüm aracıya geri bırakılacak...", flush=True)
+        stop_event.set()
+
+    previous_handlers = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    model_paths = (args.player_model, args.keypoint_model, args.ball_model)
+    try:
+        return remote_worker_main(args.broker_url, name=args.name, model_paths=model_paths, token=args.token,
+                                  stop_event=stop_event, cache_dir=args.cache_dir,
+                                  shared_paths=not args.always_download, exit_when_idle=args.exit_when_idle)
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+
+
+def _add_pipeline_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('inputs', nargs='+', help="Video dosyaları ve/veya video içeren dizinler")
+    parser.add_argument('--output-dir', default="outputs", help="Çıktı dizini (varsayılan: outputs)")
+    parser.add_argument('--modes', nargs='+', choices=EXPORT_MODES, default=DEFAULT_SETTINGS['modes'],
+                        help="Yazılacak çıktı türleri")
+    parser.add_argument('--decoder', choices=DECODERS, default=DEFAULT_SETTINGS['decoder'],
+                        help="Video okuyucu arka ucu")
+    parser.add_argument('--prefetch', type=int, default=DEFAULT_SETTINGS['prefetch'],
+                        help="Arka plan ön-okuma tampon boyutu")
+    parser.add_argument('--decode-size', type=_parse_size, default=None,
+                        help="Çözme çözünürlüğü, örn. 1280x720")
+    parser.add_argument('--hw-accel', action='store_true', help="Donanım hızlandırmalı çözmeyi dene")
+    parser.add_argument('--radar-size', type=_parse_size, default=tuple(DEFAULT_SETTINGS['radar_size']),
+                        help="Radar boyutu, örn. 800x500")
+    parser.add_argument('--no-skip-cutaways', action='store_true',
+                        help="Yakın çekim ve saha dışı kareleri de tam işle")
+    parser.add_argument('--no-pitch-filter', action='store_true', help="Saha maskesi filtresini kapat")
+    parser.add_argument('--no-calibration', action='store_true', help="Kayıtlı homografileri kullanma/kaydetme")
+    parser.add_argument('--max-frames', type=int, default=None, help="Video başına en fazla işlenecek kare")
+
+
+def _add_model_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--player-model', default=PLAYER_MODEL_PATH)
+    parser.add_argument('--keypoint-model', default=KEYPOINT_MODEL_PATH)
+    parser.add_argument('--ball-model', default=BALL_MODEL_PATH)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m utils.cli", description="Headless video processing")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    process = subparsers.add_parser('process', help="Videoları işle ve çıktı videolarını yaz")
+    _add_pipeline_arguments(process)
+    _add_model_arguments(process)
+    process.add_argument('--skip-existing', action='store_true', help="Tüm çıktıları mevcut videoları atla")
+    process.add_argument('--report-interval', type=float, default=5.0, help="İlerleme satırı aralığı (sn)")
+    process.add_argument('--report', default=None, help="Toplu çalışma özetinin yazılacağı JSON dosyası")
+    process.set_defaults(func=run_process)
+
+    submit = subparsers.add_parser('submit', help="Videoları iş kuyruğuna ekle")
+    _add_pipeline_arguments(submit)
+    submit.add_argument('--priority', type=int, default=0, help="Büyük değer önce işlenir")
+    submit.set_defaults(func=run_submit)
+
+    jobs = subparsers.add_parser('jobs', help="Kuyruktaki işleri listele")
+    jobs.add_argument('--status', nargs='+', choices=JOB_STATUSES, default=None)
+    jobs.add_argument('--limit', type=int, default=50)
+    jobs.add_argument('--watch', action='store_true', help="Listeyi sürekli yenile")
+    jobs.add_argument('--interval', type=float, default=2.0, help="--watch yenileme aralığı (sn)")
+    jobs.set_defaults(func=run_jobs)
+
+    cancel = subparsers.add_parser('cancel', help="İşleri iptal et")
+    cancel.add_argument('job_ids', nargs='+', type=int)
+    cancel.set_defaults(func=run_cancel)
+
+    retry = subparsers.add_parser('retry', help="Biten/hata alan işleri yeniden kuyruğa al")
+    retry.add_argument('job_ids', nargs='+', type=int)
+    retry.set_defaults(func=run_retry)
+
+    schedule = subparsers.add_parser('schedule', help="Kuyruktaki işleri worker süreçleriyle işle")
+    schedule.add_argument('--workers', type=int, default=1, help="Paralel worker süreci sayısı")
+    schedule.add_argument('--exit-when-idle', action='store_true', help="Kuyruk boşalınca çık")
+    _add_model_arguments(schedule)
+    schedule.set_defaults(func=run_schedule)
+
+    broker = subparsers.add_parser('broker', help="Kuyruğu uzak worker'lara HTTP üzerinden dağıt")
+    broker.add_argument('--host', default="127.0.0.1",
+                        help="Dinlenecek adres; diğer makineler için 0.0.0.0 (token ile)")
+    broker.add_argument('--port', type=int, default=8765)
+    broker.add_argument('--work-dir', default="broker_work", help="Yüklenen bölümlerin tutulduğu dizin")
+    broker.add_argument('--segment-frames', type=int, default=1500, help="Bölüm uzunluğu (kare)")
+    broker.add_argument('--warmup-frames', type=int, default=25,
+                        help="Bölüm başından önce işlenip yazılmayan kare sayısı")
+    broker.add_argument('--lease', type=float, default=30.0, help="Heartbeat gelmezse kiranın düşeceği süre (sn)")
+    broker.set_defaults(func=run_broker)
+
+    remote = subparsers.add_parser('remote-worker', help="Aracıdan bölüm alıp işleyen worker")
+    remote.add_argument('broker_url', help="Aracı adresi, örn. http://127.0.0.1:8765")
+    remote.add_argument('--name', default=None, help="Worker adı (varsayılan: makine adı ve pid)")
+    remote.add_argument('--cache-dir', default="worker_cache", help="İndirilen videoların dizini")
+    remote.add_argument('--always-download', action='store_true',
+                        help="Video bu makinede aynı yolda olsa da aracıdan indir")
+    remote.add_argument('--exit-when-idle', action='store_true', help="Aracıda işlenecek bölüm kalmayınca çık")
+    _add_model_arguments(remote)
+    remote.set_defaults(func=run_remote_worker)
+
+    for subparser in (broker, remote):
+        subparser.add_argument('--token', default=os.environ.get('BROKER_TOKEN'),
+                               help="Aracı erişim anahtarı (varsayılan: BROKER_TOKEN ortam değişkeni)")
+
+    for subparser in (submit, jobs, cancel, retry, schedule, broker):
+        subparser.add_argument('--queue', default=DEFAULT_QUEUE_PATH, help="İş kuyruğu veritabanı")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
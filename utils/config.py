@@ -1,5 +1,88 @@
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class RadarLayout:
+    """
+    Saha geometrisinin belirli bir radar ölçeği ve kenar boşluğu için piksel karşılıkları.
+    """
+
+    scale: float
+    padding: int
+    vertices_px: np.ndarray  # (32, 2) int32
+    edge_segments_px: np.ndarray  # (E, 2, 2) int32, her kenar için başlangıç/bitiş pikseli
+    centre_px: Tuple[int, int]
+    centre_circle_radius_px: int
+    penalty_spots_px: Tuple[Tuple[int, int], Tuple[int, int]]
+    penalty_arc_radius_px: int
+
+    def to_pixels(self, points: np.ndarray) -> np.ndarray:
+        """Saha koordinatlarını (cm) radar piksellerine çevirir (int() ile aynı kesme davranışı)."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return (points * self.scale).astype(np.int32) + self.padding
+
+
+@dataclass(frozen=True, eq=False)
+class PitchGeometry:
+    """
+    SoccerPitchConfiguration'dan bir kez derlenen, değiştirilemez saha geometrisi.
+    Köşe ve kenar dizileri NumPy olarak tutulur; radar piksel karşılıkları ölçek başına önbelleğe alınır.
+    """
+
+    vertices: np.ndarray  # (32, 2) float32, saha koordinatları [cm]
+    vertex_tuples: Tuple[Tuple[float, float], ...]
+    edges: np.ndarray  # (E, 2) int, 0-indexed köşe indeksleri
+    length: int
+    width: int
+    centre_circle_radius: int
+    penalty_spot_distance: int
+    penalty_arc_radius: int
+    _layouts: Dict[Tuple[float, int], RadarLayout] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_config(cls, config: 'SoccerPitchConfiguration') -> 'PitchGeometry':
+        vertex_tuples = tuple(config._compute_vertices())
+        return cls(
+            vertices=_read_only(np.array(vertex_tuples, dtype=np.float32)),
+            vertex_tuples=vertex_tuples,
+            edges=_read_only(np.array(config.edges, dtype=np.int64).reshape(-1, 2) - 1),
+            length=config.length,
+            width=config.width,
+            centre_circle_radius=config.centre_circle_radius,
+            penalty_spot_distance=config.penalty_spot_distance,
+            penalty_arc_radius=config.penalty_arc_radius,
+        )
+
+    def radar_layout(self, scale: float = 0.1, padding: int = 50) -> RadarLayout:
+        key = (scale, padding)
+        layout = self._layouts.get(key)
+        if layout is None:
+            vertices_px = _read_only(
+                (np.array(self.vertex_tuples, dtype=np.float64) * scale).astype(np.int32) + padding)
+            centre_y = int(self.width * scale / 2) + padding
+            layout = RadarLayout(
+                scale=scale,
+                padding=padding,
+                vertices_px=vertices_px,
+                edge_segments_px=_read_only(np.ascontiguousarray(vertices_px[self.edges])),
+                centre_px=(int(self.length * scale / 2) + padding, centre_y),
+                centre_circle_radius_px=int(self.centre_circle_radius * scale),
+                penalty_spots_px=(
+                    (int(self.penalty_spot_distance * scale) + padding, centre_y),
+                    (int(self.length * scale) - int(self.penalty_spot_distance * scale) + padding, centre_y),
+                ),
+                penalty_arc_radius_px=int(self.penalty_arc_radius * scale),
+            )
+            self._layouts[key] = layout
+        return layout
 
 
 @dataclass
@@ -14,8 +97,26 @@ class SoccerPitchConfiguration:
     centre_circle_radius: int = 915  # Orta saha çember yarıçapı [cm]
     penalty_spot_distance: int = 1100  # Penaltı noktası mesafesi [cm]
     penalty_arc_radius: int = 915
+
+    @property
+    def geometry(self) -> PitchGeometry:
+        """
+        Derlenmiş saha geometrisi. Boyutlar veya kenarlar değişmedikçe aynı nesne döner.
+        """
+        key = (self.width, self.length, self.penalty_box_width, self.penalty_box_length, self.goal_box_width,
+               self.goal_box_length, self.centre_circle_radius, self.penalty_spot_distance,
+               self.penalty_arc_radius, tuple(self.edges))
+        cached = self.__dict__.get('_geometry_cache')
+        if cached is None or cached[0] != key:
+            cached = (key, PitchGeometry.from_config(self))
+            self.__dict__['_geometry_cache'] = cached
+        return cached[1]
+
     @property
     def vertices(self) -> List[Tuple[int, int]]:
+        return list(self.geometry.vertex_tuples)
+
+    def _compute_vertices(self) -> List[Tuple[int, int]]:
 
         half_width = self.width / 2
         half_length = self.length / 2
@@ -0,0 +1,175 @@
+import collections
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+EXPORT_MODES = ('integrated', 'annotated_only', 'radar_only')
+
+
+def radar_inset_geometry(frame_wh: Tuple[int, int], radar_wh: Tuple[int, int],
+                         width_ratio: float = 0.2, bottom_margin: int = 10) -> Tuple[int, int, int, int]:
+    """
+    Entegre çıktıda radarın yerleşimi (x, y, w, h): kare genişliğinin width_ratio'su
+    kadar genişlikte, altta ortalanmış. Tüm dışa aktarma için bir kez hesaplanır.
+    """
+    width, height = frame_wh
+    radar_w, radar_h = radar_wh
+    inset_w = int(width * width_ratio)
+    inset_h = int(radar_h * (inset_w / radar_w))
+    return (width - inset_w) // 2, height - inset_h - bottom_margin, inset_w, inset_h
+
+
+class ThreadedVideoWriter:
+    """
+    cv2.VideoWriter'ı ayrı iş parçacığında çalıştırır; kodlama okuma ve birleştirme ile
+    paralel ilerler. Kuyruk dolarsa write() bekler (bellek sınırlı kalır).
+    """
+
+    _END = object()
+
+    def __init__(self, path: str, fourcc: str, fps: float, frame_wh: Tuple[int, int], queue_size: int = 8):
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, frame_wh)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="video-encoder", daemon=True)
+        self._thread.start()
+
+    def isOpened(self) -> bool:
+        return self.writer.isOpened()
+
+    def _run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is self._END:
+                return
+            try:
+                self.writer.write(frame)
+            except cv2.error as e:
+                self._error = e
+
+    def write(self, frame: np.ndarray) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+
+    def release(self) -> None:
+        self._queue.put(self._END)
+        self._thread.join()
+        self.writer.release()
+        if self._error is not None:
+            raise self._error
+
+
+class FrameExporter:
+    """
+    Seçili karelerden çıktı videosu üretir.
+
+    JPEG okuma ve radar küçültme bir iş parçacığı havuzunda, sırayı koruyarak prefetch
+    kadar önden yürütülür (cv2 çağrıları GIL'i bırakır). Radar yerleşimi bir kez hesaplanır
+    ve radar okunan karenin üzerine yerinde yazılır; kare başına ek tampon ayrılmaz.
+    Kodlama ThreadedVideoWriter'da yapılır.
+    """
+
+    def __init__(self, mode: str = 'integrated', fps: float = 25, prefetch: int = 16, workers: Optional[int] = None,
+                 fourcc: str = 'mp4v'):
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Bilinmeyen dışa aktarma modu: {mode} (seçenekler: {', '.join(EXPORT_MODES)})")
+        self.mode = mode
+        self.fps = fps
+        self.prefetch = prefetch
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.fourcc = fourcc
+        self.frame_wh = None
+        self.inset = None
+        self.radar_read_flag = cv2.IMREAD_COLOR
+
+    def _primary_path(self, info: Dict) -> str:
+        return info["radar_path"] if self.mode == 'radar_only' else info["annotated_path"]
+
+    def prepare(self, first_info: Dict) -> None:
+        """Çıktı boyutu ve radar yerleşimi ilk seçili kareden belirlenir."""
+        first = cv2.imread(self._primary_path(first_info))
+        if first is None:
+            raise IOError(f"The first frame could not be taken:: {self._primary_path(first_info)}")
+        self.frame_wh = (first.shape[1], first.shape[0])
+        if self.mode == 'integrated':
+            radar = cv2.imread(first_info["radar_path"])
+            if radar is None:
+                raise IOError(f"The first radar frame could not be taken:: {first_info['radar_path']}")
+            self.inset = radar_inset_geometry(self.frame_wh, (radar.shape[1], radar.shape[0]))
+            # Radar küçültülerek yerleştirileceği için JPEG doğrudan düşük çözünürlükte açılır
+            inset_w = self.inset[2]
+            if inset_w * 4 <= radar.shape[1]:
+                self.radar_read_flag = cv2.IMREAD_REDUCED_COLOR_4
+            elif inset_w * 2 <= radar.shape[1]:
+                self.radar_read_flag = cv2.IMREAD_REDUCED_COLOR_2
+
+    def _load(self, info: Dict) -> Optional[np.ndarray]:
+        """Havuzda çalışır: kareyi okur, gerekirse çıktı boyutuna getirir ve radarı yerleştirir."""
+        frame = cv2.imread(self._primary_path(info))
+        if frame is None:
+            return None
+        if (frame.shape[1], frame.shape[0]) != self.frame_wh:
+            # Disk dolmaya yaklaştığında kareler küçük ara profille kaydedilmiş olabilir
+            frame = cv2.resize(frame, self.frame_wh)
+        if self.mode == 'integrated':
+            radar = cv2.imread(info["radar_path"], self.radar_read_flag)
+            if radar is None:
+                return None
+            x, y, w, h = self.inset
+            frame[y:y + h, x:x + w] = cv2.resize(radar, (w, h), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def _prefetched(self, infos: Iterable[Dict], executor) -> Iterator[Optional[np.ndarray]]:
+        pending = collections.deque()
+        for info in infos:
+            pending.append(executor.submit(self._load, info))
+            if len(pending) >= self.prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def export(self, infos: Iterable[Dict], total: int, output_path: str,
+               progress: Optional[Callable[[int, int, float], None]] = None,
+               cancelled: Optional[Callable[[], bool]] = None, progress_every: int = 10) -> Dict[str, float]:
+        """
+        Kareleri output_path'e yazar. progress(yazılan, toplam, kare/sn) her progress_every
+        karede çağrılır; cancelled() True dönerse yarıda bırakılır.
+        {'frames', 'skipped', 'seconds', 'fps', 'cancelled'} döner.
+        """
+        if self.frame_wh is None:
+            raise RuntimeError("prepare() çağrılmadan export() çağrıldı")
+        writer = ThreadedVideoWriter(output_path, self.fourcc, self.fps, self.frame_wh)
+        if not writer.isOpened():
+            writer.release()
+            raise IOError(f"Video yazıcı açılamadı: {output_path}")
+
+        written = skipped = 0
+        was_cancelled = False
+        start = time.perf_counter()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export-read")
+        try:
+            for frame in self._prefetched(infos, executor):
+                if cancelled is not None and cancelled():
+                    was_cancelled = True
+                    break
+                if frame is None:
+                    skipped += 1
+                    continue
+                writer.write(frame)
+                written += 1
+                if progress is not None and written % progress_every == 0:
+                    progress(written, total, written / max(time.perf_counter() - start, 1e-6))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            writer.release()
+
+        seconds = time.perf_counter() - start
+        return {'frames': written, 'skipped': skipped, 'seconds': seconds,
+                'fps': written / seconds if seconds > 0 else 0.0, 'cancelled': was_cancelled}
@@ -0,0 +1,89 @@
+import bisect
+from typing import Iterator, List, Tuple
+
+
+class IntervalSet:
+    """
+    Ayrık, sıralı yarı açık aralıklar [start, end) kümesi. Toplam uzunluk her eklemede
+    ve çıkarmada güncellenir (len() O(1)); üyelik sorgusu ikili aramadır.
+    """
+
+    def __init__(self, ranges=()):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._length = 0
+        for start, end in ranges:
+            self.add(start, end)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect.bisect_right(self._starts, value) - 1
+        return i >= 0 and value < self._ends[i]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(zip(self._starts, self._ends))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    @property
+    def range_count(self) -> int:
+        return len(self._starts)
+
+    def _span(self, start: int, end: int) -> Tuple[int, int]:
+        """[start, end) ile kesişen ya da bitişik aralıkların indeks aralığı."""
+        lo = bisect.bisect_left(self._ends, start)
+        hi = bisect.bisect_right(self._starts, end)
+        return lo, hi
+
+    def add(self, start: int, end: int) -> None:
+        if end <= start:
+            return
+        lo, hi = self._span(start, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+            self._length -= sum(e - s for s, e in zip(self._starts[lo:hi], self._ends[lo:hi]))
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+        self._length += end - start
+
+    def remove(self, start: int, end: int) -> None:
+        if end <= start:
+            return
+        lo = bisect.bisect_right(self._ends, start)
+        hi = bisect.bisect_left(self._starts, end)
+        if lo >= hi:
+            return
+        new_starts, new_ends = [], []
+        if self._starts[lo] < start:
+            new_starts.append(self._starts[lo])
+            new_ends.append(start)
+        if self._ends[hi - 1] > end:
+            new_starts.append(end)
+            new_ends.append(self._ends[hi - 1])
+        removed = sum(e - s for s, e in zip(self._starts[lo:hi], self._ends[lo:hi]))
+        kept = sum(e - s for s, e in zip(new_starts, new_ends))
+        self._starts[lo:hi] = new_starts
+        self._ends[lo:hi] = new_ends
+        self._length -= removed - kept
+
+    def set(self, start: int, end: int, value: bool) -> None:
+        if value:
+            self.add(start, end)
+        else:
+            self.remove(start, end)
+
+    def clear(self) -> None:
+        self._starts.clear()
+        self._ends.clear()
+        self._length = 0
+
+    def indices(self) -> Iterator[int]:
+        for start, end in self:
+            yield from range(start, end)
@@ -0,0 +1,243 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_QUEUE_PATH = "jobs.db"
+# Bu süre boyunca ilerleme bildirmeyen "running" iş, worker'ı ölmüş sayılıp kuyruğa döner
+DEFAULT_STALE_AFTER_S = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class JobQueue:
+    """
+    SQLite tabanlı kalıcı iş kuyruğu. Arayüz, CLI ve worker süreçleri aynı dosyayı
+    kendi bağlantılarıyla kullanır (WAL). İş alma BEGIN IMMEDIATE ile tek işlemde
+    yapılır, böylece iki worker aynı işi alamaz. Yarıda kalan işler (worker süreci
+    ölmüş ya da uzun süredir ilerleme bildirmemiş) recover() ile kuyruğa geri döner.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_PATH, timeout: float = 30.0, check_same_thread: bool = True):
+        self.db_path = db_path
+        # check_same_thread=False: çağıran, bağlantıya erişimi kendi kilidiyle sıralar (bkz. utils.broker)
+        self._conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None,
+                                     check_same_thread=check_same_thread)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video TEXT NOT NULL,
+                output_dir TEXT NOT NULL,
+                settings TEXT NOT NULL DEFAULT '{}',
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'queued',
+                progress REAL NOT NULL DEFAULT 0,
+                frames_done INTEGER NOT NULL DEFAULT 0,
+                total_frames INTEGER NOT NULL DEFAULT 0,
+                fps REAL NOT NULL DEFAULT 0,
+                worker TEXT, host TEXT, pid INTEGER, heartbeat REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                error TEXT, result TEXT,
+                created REAL NOT NULL, started REAL, finished REAL
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority DESC, id)")
+        # Çalışan zamanlayıcı süreçleri: arayüz, yeniden açıldığında ayrı süreç olarak
+        # başlatılmış zamanlayıcıyı buradan bulur
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS schedulers (
+                host TEXT NOT NULL,
+                pid INTEGER NOT NULL,
+                workers INTEGER NOT NULL DEFAULT 0,
+                started REAL NOT NULL,
+                PRIMARY KEY (host, pid)
+            )""")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        job['settings'] = json.loads(job['settings'] or '{}')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+
+    def submit(self, video: str, settings: Optional[Dict] = None, priority: int = 0,
+               output_dir: str = "outputs") -> int:
+        """Videoyu kuyruğa ekler; büyük priority önce işlenir, eşitlikte ekleme sırası."""
+        cursor = self._conn.execute(
+            "INSERT INTO jobs (video, output_dir, settings, priority, created) VALUES (?, ?, ?, ?, ?)",
+            (os.path.abspath(video), os.path.abspath(output_dir), json.dumps(settings or {}), priority, time.time()))
+        return cursor.lastrowid
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        return self._row(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, statuses: Optional[List[str]] = None, limit: int = 500) -> List[Dict]:
+        """İşler: önce aktif olanlar (öncelik sırasıyla), sonra en yeni biten."""
+        query = "SELECT * FROM jobs"
+        params: list = []
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' * len(statuses))})"
+            params.extend(statuses)
+        query += (" ORDER BY CASE status WHEN 'running' THEN 0 WHEN 'queued' THEN 1 ELSE 2 END,"
+                  " CASE WHEN status IN ('running', 'queued') THEN -priority ELSE 0 END,"
+                  " CASE WHEN status IN ('running', 'queued') THEN id ELSE -id END LIMIT ?")
+        params.append(limit)
+        return [self._row(row) for row in self._conn.execute(query, params)]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update(dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()))
+        return counts
+
+    def claim(self, worker: str, pid: Optional[int] = None) -> Optional[Dict]:
+        """Sıradaki işi atomik olarak bu worker'a verir; kuyruk boşsa None."""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT id FROM jobs WHERE status = 'queued' "
+                                     "ORDER BY priority DESC, id LIMIT 1").fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, host = ?, pid = ?, heartbeat = ?, started = ?, "
+                "attempts = attempts + 1, progress = 0, frames_done = 0, fps = 0, error = NULL WHERE id = ?",
+                (worker, socket.gethostname(), pid or os.getpid(), now, now, row['id']))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self.get(row['id'])
+
+    def heartbeat(self, job_id: int, frames_done: int, total_frames: int, fps: float) -> bool:
+        """İlerlemeyi kaydeder; iş iptal edildiyse True döner (worker işi bırakmalı)."""
+        progress = min(frames_done / total_frames, 1.0) if total_frames else 0.0
+        self._conn.execute("UPDATE jobs SET frames_done = ?, total_frames = ?, fps = ?, progress = ?, heartbeat = ? "
+                           "WHERE id = ?", (frames_done, total_frames, fps, progress, time.time(), job_id))
+        row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def _finish(self, job_id: int, status: str, error: Optional[str] = None, result: Optional[Dict] = None) -> None:
+        self._conn.execute("UPDATE jobs SET status = ?, error = ?, result = ?, finished = ?, pid = NULL "
+                           "WHERE id = ? AND status = 'running'",
+                           (status, error, json.dumps(result) if result is not None else None, time.time(), job_id))
+
+    def complete(self, job_id: int, result: Optional[Dict] = None) -> None:
+        self._conn.execute("UPDATE jobs SET progress = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        self._finish(job_id, 'done', result=result)
+
+    def fail(self, job_id: int, error: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> None:
+        """Hata alan iş deneme hakkı kaldıysa kuyruğa döner, yoksa failed olur."""
+        job = self.get(job_id)
+        if job and job['status'] == 'running' and job['attempts'] < max_attempts and not job['cancel_requested']:
+            self.release(job_id, error=error)
+        else:
+            self._finish(job_id, 'failed', error=error)
+
+    def release(self, job_id: int, error: Optional[str] = None, count_attempt: bool = True) -> None:
+        """
+        Çalışan işi yeniden alınmak üzere kuyruğa bırakır. Worker düzenli kapatılırken
+        count_attempt=False verilir; bu deneme hakkından düşülmez.
+        """
+        self._conn.execute("UPDATE jobs SET status = 'queued', worker = NULL, pid = NULL, error = ?, "
+                           "attempts = attempts - ? WHERE id = ? AND status = 'running'",
+                           (error, 0 if count_attempt else 1, job_id))
+
+    def mark_cancelled(self, job_id: int) -> None:
+        self._finish(job_id, 'cancelled')
+
+    def cancel(self, job_id: int) -> bool:
+        """Bekleyen iş hemen iptal edilir; çalışan iş için worker'a iptal isteği bırakılır."""
+        now = time.time()
+        cursor = self._conn.execute("UPDATE jobs SET status = 'cancelled', finished = ? "
+                                    "WHERE id = ? AND status = 'queued'", (now, job_id))
+        if cursor.rowcount:
+            return True
+        cursor = self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'",
+                                    (job_id,))
+        return bool(cursor.rowcount)
+
+    def retry(self, job_id: int) -> bool:
+        """Biten, hata alan ya da iptal edilen işi yeniden kuyruğa koyar."""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = 'queued', attempts = 0, cancel_requested = 0, error = NULL, progress = 0, "
+            "frames_done = 0, finished = NULL WHERE id = ? AND status IN ('done', 'failed', 'cancelled')", (job_id,))
+        return bool(cursor.rowcount)
+
+    def set_priority(self, job_id: int, priority: int) -> None:
+        self._conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, job_id))
+
+    def register_scheduler(self, workers: int, pid: Optional[int] = None) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO schedulers (host, pid, workers, started) VALUES (?, ?, ?, ?)",
+                           (socket.gethostname(), pid or os.getpid(), workers, time.time()))
+
+    def unregister_scheduler(self, pid: Optional[int] = None) -> None:
+        self._conn.execute("DELETE FROM schedulers WHERE host = ? AND pid = ?",
+                           (socket.gethostname(), pid or os.getpid()))
+
+    def running_scheduler(self) -> Optional[Dict]:
+        """Bu makinede çalışan zamanlayıcının kaydı; süreci ölmüş kayıtlar silinir."""
+        host = socket.gethostname()
+        for row in self._conn.execute("SELECT * FROM schedulers WHERE host = ? ORDER BY started",
+                                      (host,)).fetchall():
+            if pid_alive(row['pid']):
+                return dict(row)
+            self._conn.execute("DELETE FROM schedulers WHERE host = ? AND pid = ?", (host, row['pid']))
+        return None
+
+    def recover(self, stale_after_s: float = DEFAULT_STALE_AFTER_S,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> List[int]:
+        """
+        Çökmüş worker'lardan kalan "running" işleri kuyruğa geri alır. Bu makinedeki
+        işler için yalnızca süreç yaşıyor mu bakılır (uzun bir adımda heartbeat gecikebilir);
+        diğerleri için son ilerleme zamanı esas alınır.
+        Deneme hakkı biten iş failed olur.
+        """
+        host = socket.gethostname()
+        now = time.time()
+        recovered = []
+        for job in self.list(statuses=['running']):
+            if job['host'] == host:
+                dead = not pid_alive(job['pid'])
+            else:
+                dead = now - (job['heartbeat'] or 0) > stale_after_s
+            if not dead:
+                continue
+            if job['cancel_requested']:
+                self.mark_cancelled(job['id'])
+            elif job['attempts'] >= max_attempts:
+                self._finish(job['id'], 'failed', error="Worker işlem sırasında durdu (deneme hakkı bitti)")
+            else:
+                self.release(job['id'], error="Worker işlem sırasında durdu, yeniden kuyruğa alındı")
+                recovered.append(job['id'])
+        return recovered
+
+    def clear_finished(self) -> int:
+        cursor = self._conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled')")
+        return cursor.rowcount
@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import cv2
+
+DEFAULT_INDEX_PATH = "media_index.db"
+THUMBNAIL_SIZE = (200, 120)
+THUMBNAIL_JPEG_QUALITY = 85
+# Kayıt biçimi ya da küçük resim boyutu değişirse eski kayıtlar yeniden üretilir
+INDEX_FORMAT_VERSION = 1
+
+_COLUMNS = ('path', 'size', 'mtime', 'readable', 'fps', 'frame_count', 'duration_s',
+            'width', 'height', 'thumbnail', 'probed_at')
+
+
+def file_signature(path: str) -> Tuple[int, float]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
+
+
+def duration_text(duration_s: float) -> str:
+    minutes = int(duration_s // 60)
+    seconds = int(duration_s % 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def probe_media(path: str, thumb_size: Tuple[int, int] = THUMBNAIL_SIZE) -> Dict:
+    """
+    Videonun ilk karesinden JPEG küçük resim ve süre bilgilerini çıkarır. Açılamayan
+    dosyalar da readable=False ile döner; dosya değişmedikçe yeniden denenmez.
+    """
+    size, mtime = file_signature(path)
+    record = {'path': path, 'size': size, 'mtime': mtime, 'readable': False, 'fps': 0.0,
+              'frame_count': 0, 'duration_s': 0.0, 'width': 0, 'height': 0,
+              'thumbnail': None, 'probed_at': time.time()}
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            return record
+        ret, frame = cap.read()
+        if not ret:
+            return record
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+
+    h, w = frame.shape[:2]
+    scale = min(thumb_size[0] / w, thumb_size[1] / h)
+    thumb = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode('.jpg', thumb, [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_JPEG_QUALITY])
+    record.update({
+        'readable': True, 'fps': fps, 'frame_count': frame_count,
+        'duration_s': frame_count / fps if fps > 0 else 0.0,
+        'width': w, 'height': h, 'thumbnail': encoded.tobytes() if ok else None,
+    })
+    return record
+
+
+class MediaIndex:
+    """
+    Video dosyalarının küçük resim ve süre bilgilerini SQLite'ta saklar. Kayıtlar yol
+    ile anahtarlanır ve boyut ile mtime eşleştiği sürece geçerlidir; değişen ya da yeni
+    dosyalar yeniden incelenir. Bağlantı iş parçacıkları arasında kilitle paylaşılır.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_FORMAT_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS media")
+                self._conn.execute(f"PRAGMA user_version={INDEX_FORMAT_VERSION}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS media (
+                    path TEXT PRIMARY KEY, size INTEGER, mtime REAL, readable INTEGER,
+                    fps REAL, frame_count INTEGER, duration_s REAL, width INTEGER, height INTEGER,
+                    thumbnail BLOB, probed_at REAL
+                )""")
+
+    def get(self, path: str) -> Optional[Dict]:
+        """Dosya kayıttan sonra değişmediyse kaydı döner, aksi halde None."""
+        path = os.path.abspath(path)
+        try:
+            size, mtime = file_signature(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM media WHERE path = ?",
+                                     (path,)).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(_COLUMNS, row))
+        if record['size'] != size or record['mtime'] != mtime:
+            return None
+        record['readable'] = bool(record['readable'])
+        return record
+
+    def put(self, record: Dict) -> None:
+        record = dict(record, path=os.path.abspath(record['path']), readable=int(record['readable']))
+        with self._lock, self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO media ({', '.join(_COLUMNS)}) "
+                               f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                               [record[column] for column in _COLUMNS])
+
+    def probe(self, path: str) -> Dict:
+        """Kayıt güncelse onu, değilse dosyayı inceleyip kaydedilen yeni kaydı döner."""
+        record = self.get(path)
+        if record is None:
+            record = probe_media(os.path.abspath(path))
+            self.put(record)
+        return record
+
+    def prune(self, directory: str, keep: Iterable[str]) -> int:
+        """directory altındaki, keep'te olmayan (silinmiş) dosyaların kayıtlarını siler."""
+        directory = os.path.join(os.path.abspath(directory), '')
+        keep = {os.path.abspath(path) for path in keep}
+        with self._lock:
+            known = [row[0] for row in self._conn.execute("SELECT path FROM media WHERE substr(path, 1, ?) = ?",
+                                                          (len(directory), directory))]
+        stale = [path for path in known if path not in keep]
+        if stale:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM media WHERE path = ?", [(path,) for path in stale])
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
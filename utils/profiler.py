@@ -0,0 +1,173 @@
+import collections
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class StageProfiler:
+    """
+    İşleme hattının aşamalarını (decode, inference, renk kümeleme, çizim, disk yazma)
+    kare bazında ölçer ve sayaçları (tespit, takipçi, KMeans fit) tutar.
+
+    Aşamalar ThreadPoolExecutor içinde paralel çalıştığı için kayıtlar kilitle korunur.
+    Olaylar Chrome trace formatında (chrome://tracing, Perfetto) dışa aktarılabilir.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 25, max_events: int = 200000):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._events = collections.deque(maxlen=max_events)
+        self._frame_stages = collections.defaultdict(float)
+        self._frame_counts = collections.defaultdict(int)
+        self._recent = collections.deque(maxlen=window)
+        self._total_stages = collections.defaultdict(float)
+        self._total_counts = collections.defaultdict(int)
+        self.frames = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._frame_stages[name] += end - start
+                self._events.append({
+                    'name': name, 'cat': 'stage', 'ph': 'X', 'pid': self._pid,
+                    'tid': threading.get_ident(),
+                    'ts': round((start - self._origin) * 1e6, 1),
+                    'dur': round((end - start) * 1e6, 1),
+                })
+
+    def count(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._frame_counts[name] += value
+
+    def end_frame(self) -> Dict[str, Dict[str, float]]:
+        """
+        Karenin ölçümlerini kapatır ve döndürür: {'stages_ms': {...}, 'counts': {...}}
+        """
+        if not self.enabled:
+            return {'stages_ms': {}, 'counts': {}}
+        with self._lock:
+            frame = {
+                'stages_ms': {name: seconds * 1000 for name, seconds in self._frame_stages.items()},
+                'counts': dict(self._frame_counts),
+            }
+            for name, seconds in self._frame_stages.items():
+                self._total_stages[name] += seconds
+            for name, value in self._frame_counts.items():
+                self._total_counts[name] += value
+            if self._frame_counts:
+                self._events.append({
+                    'name': 'counts', 'cat': 'counts', 'ph': 'C', 'pid': self._pid,
+                    'ts': round((time.perf_counter() - self._origin) * 1e6, 1),
+                    'args': dict(self._frame_counts),
+                })
+            self._frame_stages.clear()
+            self._frame_counts.clear()
+            self._recent.append(frame)
+            self.frames += 1
+        return frame
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Son `window` karenin ortalama aşama süreleri (ms) ve sayaçları."""
+        with self._lock:
+            recent = list(self._recent)
+        if not recent:
+            return {'stages_ms': {}, 'counts': {}, 'frames': 0}
+
+        stages, counts = collections.defaultdict(float), collections.defaultdict(float)
+        for frame in recent:
+            for name, ms in frame['stages_ms'].items():
+                stages[name] += ms
+            for name, value in frame['counts'].items():
+                counts[name] += value
+        n = len(recent)
+        return {
+            'stages_ms': {name: total / n for name, total in stages.items()},
+            'counts': {name: total / n for name, total in counts.items()},
+            'frames': n,
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Tüm çalışma boyunca toplam ve kare başına ortalama değerler."""
+        with self._lock:
+            frames = max(self.frames, 1)
+            return {
+                'frames': self.frames,
+                'stages_total_s': dict(self._total_stages),
+                'stages_mean_ms': {name: s * 1000 / frames for name, s in self._total_stages.items()},
+                'counts_total': dict(self._total_counts),
+            }
+
+    def write_chrome_trace(self, path: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            events = list(self._events)
+        trace = {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'summary': self.summary()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+        return path
+
+
+class ThroughputMeter:
+    """
+    Üssel hareketli ortalama ile yumuşatılmış kare/sn, geçen süre ve kalan süre (ETA) hesabı.
+    """
+
+    def __init__(self, alpha: float = 0.05):
+        self.alpha = alpha
+        self.start_time: Optional[float] = None
+        self._last_time: Optional[float] = None
+        self._frame_interval: Optional[float] = None
+        self.frames = 0
+
+    def start(self, now: Optional[float] = None) -> None:
+        self.start_time = self._last_time = time.perf_counter() if now is None else now
+        self._frame_interval = None
+        self.frames = 0
+
+    def update(self, frames: int = 1, now: Optional[float] = None) -> None:
+        now = time.perf_counter() if now is None else now
+        if self.start_time is None:
+            self.start(now)
+            return
+        interval = (now - self._last_time) / max(frames, 1)
+        self._frame_interval = interval if self._frame_interval is None else (
+            self.alpha * interval + (1 - self.alpha) * self._frame_interval)
+        self._last_time = now
+        self.frames += frames
+
+    @property
+    def elapsed(self) -> float:
+        return 0.0 if self.start_time is None else time.perf_counter() - self.start_time
+
+    @property
+    def fps(self) -> float:
+        if not self._frame_interval:
+            return 0.0
+        return 1.0 / self._frame_interval
+
+    def eta(self, remaining_frames: float) -> float:
+        """Kalan kareler için tahmini süre (sn). Hız henüz bilinmiyorsa -1."""
+        fps = self.fps
+        if fps <= 0:
+            return -1.0
+        return max(remaining_frames, 0) / fps
@@ -0,0 +1,160 @@
+import collections
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+# Forma histogramı: H 16 x S 4 kutu (HSV), Hellinger için karekök alınıp L2 ile normalize edilir
+HIST_BINS = (16, 4)
+HIST_RANGES = (0, 180, 0, 256)
+
+
+def jersey_embedding(jersey_rgb: np.ndarray) -> Optional[np.ndarray]:
+    """Forma bölgesinin (RGB) kompakt renk gömmesi; bölge boşsa None."""
+    if jersey_rgb.size == 0:
+        return None
+    hsv = cv2.cvtColor(jersey_rgb, cv2.COLOR_RGB2HSV)
+    hist = cv2.calcHist([hsv], [0, 1], None, list(HIST_BINS), list(HIST_RANGES)).ravel()
+    total = hist.sum()
+    if total <= 0:
+        return None
+    embedding = np.sqrt(hist / total)
+    return (embedding / np.linalg.norm(embedding)).astype(np.float32)
+
+
+class ReIDGallery:
+    """
+    Kaybolan izleri forma histogramıyla yeniden tanıyan hafif re-ID katmanı.
+
+    Aktif izlerin gömmeleri üssel ortalama ile güncellenir. lost_after kare görülmeyen
+    izler sınırlı bir LRU galeriye taşınır. Yeterince gözlenmiş yeni izler galeriyle
+    tek bir matris çarpımıyla karşılaştırılır; benzerlik eşiği, konum kapısı ve en iyi
+    iki aday arasındaki fark koşulu sağlanırsa yeni iz eski kimliğe bağlanır (alias).
+    Yeni izler ilk link_window kare boyunca bağlanabilir.
+    """
+
+    def __init__(self, capacity: int = 64, lost_after: int = 10, min_observations: int = 3,
+                 link_window: int = 60, min_similarity: float = 0.9, min_margin: float = 0.02,
+                 momentum: float = 0.7):
+        self.capacity = capacity
+        self.lost_after = lost_after
+        self.link_window = link_window
+        self.min_observations = min_observations
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.momentum = momentum
+        self.frame_index = 0
+        self.aliases: Dict[int, int] = {}
+        self.links = 0
+        # Aktif izler: kanonik id -> {'embedding', 'center', 'first_frame', 'last_frame', 'observations', 'new'}
+        self._active: Dict[int, Dict] = {}
+        # Galeri: kanonik id -> kayıt (LRU sırası); matris eşleştirme için ayrıca tutulur
+        self._gallery: "collections.OrderedDict[int, Dict]" = collections.OrderedDict()
+        self._matrix = np.zeros((0, int(np.prod(HIST_BINS))), dtype=np.float32)
+        self._matrix_ids: List[int] = []
+
+    def resolve(self, tracker_ids: np.ndarray) -> np.ndarray:
+        """
+        Takipçinin verdiği id'leri kanonik id'lere çevirir. Orijinal iz geri dönerse
+        (takipçi kendisi yeniden bulduysa) aynı karede çakışan alias kaldırılır.
+        """
+        if len(tracker_ids) == 0 or not self.aliases:
+            return tracker_ids
+        raw = set(tracker_ids.tolist())
+        for alias, canonical in list(self.aliases.items()):
+            if alias in raw and canonical in raw:
+                del self.aliases[alias]
+        return np.array([self.aliases.get(tid, tid) for tid in tracker_ids.tolist()], dtype=tracker_ids.dtype)
+
+    def observe(self, tracker_ids: Sequence[int], embeddings: Sequence[np.ndarray],
+                centers: Sequence[np.ndarray], frame_diagonal: float) -> Dict[int, int]:
+        """
+        Karedeki izlerin gömmelerini günceller, kaybolanları galeriye taşır ve yeni izleri
+        eşleştirir. Bu karede kurulan bağlantıları {yeni_id: eski_id} olarak döner.
+        """
+        self.frame_index += 1
+        for tracker_id, embedding, center in zip(tracker_ids, embeddings, centers):
+            tracker_id = int(tracker_id)
+            if tracker_id in self._gallery:
+                # Kanonik id doğrudan geri döndü
+                self._remove_from_gallery(tracker_id)
+            entry = self._active.get(tracker_id)
+            if entry is None:
+                entry = self._active[tracker_id] = {
+                    'embedding': embedding.copy(), 'observations': 0, 'first_frame': self.frame_index,
+                    'new': tracker_id not in self.aliases.values()}
+            else:
+                blended = self.momentum * entry['embedding'] + (1 - self.momentum) * embedding
+                entry['embedding'] = blended / max(np.linalg.norm(blended), 1e-6)
+            entry['center'] = np.asarray(center, dtype=np.float32)
+            entry['last_frame'] = self.frame_index
+            entry['observations'] += 1
+
+        self._retire_lost()
+        return self._link_new_tracks(frame_diagonal)
+
+    def _retire_lost(self) -> None:
+        for tracker_id in [tid for tid, e in self._active.items()
+                           if self.frame_index - e['last_frame'] >= self.lost_after]:
+            entry = self._active.pop(tracker_id)
+            if entry['observations'] >= self.min_observations:
+                self._gallery[tracker_id] = entry
+                self._gallery.move_to_end(tracker_id)
+        while len(self._gallery) > self.capacity:
+            self._gallery.popitem(last=False)
+        self._rebuild_matrix()
+
+    def _remove_from_gallery(self, tracker_id: int) -> None:
+        self._gallery.pop(tracker_id, None)
+        self._rebuild_matrix()
+
+    def _rebuild_matrix(self) -> None:
+        if list(self._gallery.keys()) == self._matrix_ids:
+            return
+        self._matrix_ids = list(self._gallery.keys())
+        self._matrix = (np.stack([e['embedding'] for e in self._gallery.values()]) if self._gallery
+                        else np.zeros((0, self._matrix.shape[1]), dtype=np.float32))
+
+    def _link_new_tracks(self, frame_diagonal: float) -> Dict[int, int]:
+        candidates = [tid for tid, e in self._active.items()
+                      if e['new'] and e['observations'] >= self.min_observations
+                      and self.frame_index - e['first_frame'] <= self.link_window]
+        if not candidates or len(self._matrix_ids) == 0:
+            return {}
+
+        queries = np.stack([self._active[tid]['embedding'] for tid in candidates])
+        similarity = queries @ self._matrix.T  # (yeni iz, galeri)
+
+        # Konum kapısı: kaybolduğundan beri geçen süreyle büyüyen yarıçap
+        gallery_centers = np.stack([self._gallery[gid]['center'] for gid in self._matrix_ids])
+        gallery_last = np.array([self._gallery[gid]['last_frame'] for gid in self._matrix_ids])
+        radius = frame_diagonal * np.minimum(0.15 + 0.01 * (self.frame_index - gallery_last), 1.0)
+        query_centers = np.stack([self._active[tid]['center'] for tid in candidates])
+        distance = np.linalg.norm(query_centers[:, None, :] - gallery_centers[None, :, :], axis=2)
+        similarity = np.where(distance <= radius[None, :], similarity, -1.0)
+        # Aynı anda görünmüş iki iz aynı kişi olamaz: galeri kaydı yeni iz başlamadan kaybolmuş olmalı
+        first_frames = np.array([self._active[tid]['first_frame'] for tid in candidates])
+        similarity = np.where(gallery_last[None, :] < first_frames[:, None], similarity, -1.0)
+
+        links = {}
+        for row in np.argsort(-similarity.max(axis=1)):
+            order = np.argsort(-similarity[row])
+            best = order[0]
+            second = similarity[row, order[1]] if len(order) > 1 else -1.0
+            score = similarity[row, best]
+            new_id, old_id = candidates[row], self._matrix_ids[best]
+            if score < self.min_similarity or score - second < self.min_margin or old_id not in self._gallery:
+                continue
+            links[new_id] = old_id
+            similarity[:, best] = -1.0
+
+        for new_id, old_id in links.items():
+            self.aliases[new_id] = old_id
+            entry = self._active.pop(new_id)
+            entry['new'] = False
+            self._active[old_id] = entry
+            self._gallery.pop(old_id, None)
+        if links:
+            self.links += len(links)
+            self._rebuild_matrix()
+        return links
@@ -0,0 +1,275 @@
+"""
+utils.broker aracısından bölüm kiralayıp işleyen uzak worker.
+
+Modeller bir kez yüklenir. Her bölüm için kaynak video, worker aynı dosyaya erişebiliyorsa
+(ortak disk ya da aynı makine) doğrudan, erişemiyorsa aracıdan indirilerek okunur. İşleme
+sırasında ilerleme ve tespit kayıtları heartbeat ile gönderilir; bölüm bitince çıktı
+videoları yüklenir. Aracıya lease_s boyunca ulaşılamazsa ya da kira düşerse bölüm
+bırakılır (aracı onu zaten başka worker'a vermiştir).
+
+    python -m utils.cli remote-worker http://127.0.0.1:8765 --name w1
+"""
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.backend import FrameAnnotator
+from utils.broker import CHUNK_BYTES, TOKEN_HEADER
+from utils.calibration import CalibrationStore
+from utils.cli import DEFAULT_SETTINGS, create_video_processor, load_frame_processor, process_video
+
+DEFAULT_CACHE_DIR = "worker_cache"
+# Model yüklenemeyen worker bu kodla çıkar (utils.scheduler ile aynı)
+EXIT_MODEL_ERROR = 2
+
+
+class LeaseLost(Exception):
+    """Kira aracı tarafından düşürüldü ya da iş iptal edildi."""
+
+
+class BrokerClient:
+    """Aracının JSON/HTTP protokolü için ince istemci (yalnızca standart kütüphane)."""
+
+    def __init__(self, base_url: str, token: Optional[str] = None, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+
+    def _open(self, method: str, path: str, data=None, headers: Optional[Dict] = None):
+        request = urllib.request.Request(f"{self.base_url}{path}", data=data, method=method, headers=headers or {})
+        if self.token:
+            request.add_header(TOKEN_HEADER, self.token)
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None, data=None,
+                 headers: Optional[Dict] = None) -> Tuple[int, Optional[Dict]]:
+        """(durum kodu, JSON yanıt) döner. Bağlantı hataları OSError olarak yükselir."""
+        if payload is not None:
+            data = json.dumps(payload).encode('utf-8')
+            headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+        try:
+            with self._open(method, path, data, headers) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        try:
+            return status, json.loads(body) if body else None
+        except ValueError:
+            return status, None
+
+    def _checked(self, method: str, path: str, payload: Optional[Dict] = None, **kwargs) -> Optional[Dict]:
+        status, body = self._request(method, path, payload, **kwargs)
+        if status == 410:
+            raise LeaseLost((body or {}).get('error', "Kira düştü"))
+        if status >= 400:
+            raise IOError(f"Aracı {status} döndü: {(body or {}).get('error', '')}")
+        return body
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        status, body = self._request('POST', "/api/claim", {'worker': worker})
+        if status == 204:
+            return None
+        if status >= 400:
+            raise IOError(f"Aracı {status} döndü: {(body or {}).get('error', '')}")
+        return body
+
+    def heartbeat(self, lease: str, frames: int, fps: float, seq: int, log: List[Dict]) -> Dict:
+        return self._checked('POST', "/api/heartbeat",
+                             {'lease': lease, 'frames': frames, 'fps': fps, 'seq': seq, 'log': log})
+
+    def upload(self, lease: str, mode: str, path: str) -> None:
+        with open(path, 'rb') as f:
+            self._checked('PUT', f"/api/output/{lease}/{mode}", data=f,
+                          headers={'Content-Length': str(os.path.getsize(path)),
+                                   'Content-Type': 'application/octet-stream'})
+
+    def complete(self, lease: str, frames: int, seconds: float) -> None:
+        self._checked('POST', "/api/complete", {'lease': lease, 'frames': frames, 'seconds': seconds})
+
+    def fail(self, lease: str, error: str) -> None:
+        self._checked('POST', "/api/fail", {'lease': lease, 'error': error})
+
+    def release(self, lease: str) -> None:
+        self._checked('POST', "/api/release", {'lease': lease})
+
+    def download_video(self, job_id: int, dest: str, on_chunk: Optional[Callable[[], None]] = None) -> None:
+        temp_path = f"{dest}.part"
+        try:
+            with self._open('GET', f"/api/video/{job_id}") as response, open(temp_path, 'wb') as f:
+                while True:
+                    chunk = response.read(CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    if on_chunk is not None:
+                        on_chunk()
+            os.replace(temp_path, dest)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class _SegmentSession:
+    """
+    Tek bölümün kirası: heartbeat'leri zamanlar, gönderilmemiş tespit kayıtlarını
+    biriktirir ve aracıya lease_s boyunca ulaşılamazsa kirayı kaybedilmiş sayar.
+    """
+
+    def __init__(self, client: BrokerClient, segment: Dict):
+        self.client = client
+        self.lease = segment['lease']
+        self.lease_s = segment['lease_s']
+        self.pending_log: List[Dict] = []
+        self.sent = 0
+        self.lost = False
+        self.last_ok = time.time()
+        self.last_beat = 0.0
+
+    def beat(self, frames: int = 0, fps: float = 0.0, force: bool = False) -> None:
+        now = time.time()
+        if self.lost or (not force and now - self.last_beat < self.lease_s / 3):
+            return
+        self.last_beat = now
+        log = self.pending_log[:]
+        try:
+            self.client.heartbeat(self.lease, frames, fps, self.sent, log)
+        except LeaseLost:
+            self.lost = True
+            return
+        except OSError as e:
+            print(f"Aracıya ulaşılamadı: {e}", flush=True)
+            if time.time() - self.last_ok > self.lease_s:
+                self.lost = True
+            return
+        self.last_ok = time.time()
+        self.sent += len(log)
+        del self.pending_log[:len(log)]
+
+
+def _local_video(client: BrokerClient, segment: Dict, cache_dir: str, session: _SegmentSession,
+                 shared_paths: bool) -> str:
+    """Kaynak videonun bu makinedeki yolu; gerekirse aracıdan indirilir (iş başına bir kez)."""
+    video = segment['video']
+    if shared_paths and os.path.isfile(video) and os.path.getsize(video) == segment['video_size']:
+        return video
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = os.path.join(cache_dir, f"job_{segment['job_id']}_{os.path.basename(video)}")
+    if os.path.isfile(cached) and os.path.getsize(cached) == segment['video_size']:
+        return cached
+    # Önceki işlerin videoları silinir; ardışık bölümler genellikle aynı işe aittir
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith("job_") and os.path.isfile(path):
+            os.remove(path)
+    print(f"#{segment['job_id']} videosu indiriliyor ({segment['video_size'] / 1e6:.1f} MB)...", flush=True)
+    client.download_video(segment['job_id'], cached, on_chunk=session.beat)
+    return cached
+
+
+def run_segment(client: BrokerClient, segment: Dict, frame_processor, annotator: FrameAnnotator,
+                calibration_store: Optional[CalibrationStore], stop_event, cache_dir: str = DEFAULT_CACHE_DIR,
+                shared_paths: bool = True) -> str:
+    """Kiralanan bölümü işler, çıktıları yükler ve tamamlar; son durumu döner."""
+    session = _SegmentSession(client, segment)
+    settings = dict(DEFAULT_SETTINGS, **segment['settings'])
+    work_dir = tempfile.mkdtemp(prefix=f"segment_{segment['job_id']}_{segment['segment']}_")
+    outputs = {mode: os.path.join(work_dir, f"{mode}.mp4") for mode in settings['modes']}
+    try:
+        try:
+            video_path = _local_video(client, segment, cache_dir, session, shared_paths)
+            video_processor = create_video_processor(video_path, work_dir, frame_processor, annotator,
+                                                     settings, calibration_store)
+            try:
+                stats = process_video(
+                    video_processor, outputs, max_frames=segment['frames'],
+                    report_interval_s=min(5.0, segment['lease_s'] / 3),
+                    progress=lambda frames, total, fps: session.beat(frames, fps),
+                    cancelled=lambda: session.lost or stop_event.is_set(),
+                    start_frame=segment['start_frame'], warmup_frames=segment['warmup_frames'],
+                    detection_log=session.pending_log.append)
+            finally:
+                video_processor.executor.shutdown(wait=True)
+        except LeaseLost:
+            session.lost = True
+            stats = None
+        except Exception as e:
+            if not session.lost:
+                client.fail(session.lease, str(e))
+            return 'failed'
+
+        if session.lost:
+            return 'lost'
+        if stats['cancelled']:
+            client.release(session.lease)
+            return 'released'
+
+        # Kalan tespit kayıtları gönderilir, sonra videolar yüklenir. Kare sayısı fazla
+        # tahmin edildiyse bölüm videonun sonundan başlar; çıktısı olmadan 0 kareyle tamamlanır
+        session.beat(stats['frames'], stats['fps'], force=True)
+        if session.lost or session.pending_log:
+            return 'lost'
+        if stats['frames']:
+            for mode, path in outputs.items():
+                client.upload(session.lease, mode, path)
+        client.complete(session.lease, stats['frames'], stats['seconds'])
+        return 'done'
+    except LeaseLost:
+        return 'lost'
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def remote_worker_main(broker_url: str, name: Optional[str] = None, model_paths: Sequence[str] = (),
+                       token: Optional[str] = None, stop_event=None,
+                       processor_factory: Optional[Callable] = None, poll_interval_s: float = 2.0,
+                       cache_dir: str = DEFAULT_CACHE_DIR, shared_paths: bool = True,
+                       exit_when_idle: bool = False) -> int:
+    """
+    Durdurulana kadar aracıdan bölüm alır; exit_when_idle ise aracıda bölüm kalmayınca
+    çıkar. Modeller yüklenemezse EXIT_MODEL_ERROR döner.
+    """
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    stop_event = stop_event or threading.Event()
+    processor_factory = processor_factory or load_frame_processor
+    try:
+        frame_processor = processor_factory(*model_paths)
+    except Exception as e:
+        print(f"[{name}] Modeller yüklenemedi: {e}", flush=True)
+        return EXIT_MODEL_ERROR
+    annotator = FrameAnnotator()
+    calibration_store = CalibrationStore()
+    client = BrokerClient(broker_url, token)
+    print(f"[{name}] hazır, aracı: {broker_url}", flush=True)
+
+    while not stop_event.is_set():
+        try:
+            segment = client.claim(name)
+        except OSError as e:
+            print(f"[{name}] Aracıya ulaşılamadı: {e}", flush=True)
+            stop_event.wait(poll_interval_s)
+            continue
+        if segment is None:
+            if exit_when_idle:
+                print(f"[{name}] işlenecek bölüm yok, çıkılıyor.", flush=True)
+                break
+            stop_event.wait(poll_interval_s)
+            continue
+        label = f"#{segment['job_id']}/{segment['segment']}"
+        print(f"[{name}] {label} başladı (kare {segment['start_frame']})", flush=True)
+        started = time.perf_counter()
+        try:
+            status = run_segment(client, segment, frame_processor, annotator, calibration_store, stop_event,
+                                 cache_dir=cache_dir, shared_paths=shared_paths)
+        except OSError as e:
+            # Yükleme/tamamlama sırasında bağlantı koptu; kira süresi dolunca bölüm yeniden verilir
+            print(f"[{name}] {label} aracıya bildirilemedi: {e}", flush=True)
+            status = 'lost'
+        print(f"[{name}] {label} {status} ({time.perf_counter() - started:.1f} sn)", flush=True)
+    return 0
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_CACHE_DIR = "analysis_cache"
+DEFAULT_QUOTA_BYTES = 10 * 1024 ** 3
+# Çıktı biçimi değişirse eski kayıtların kullanılmaması için anahtara katılır
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Aynı dosya sisteminde sabit bağlantı (kopyalamasız), değilse kopya."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class AnalysisCache:
+    """
+    İşlenmiş videoların çıktılarını içerik adresli olarak diskte saklar (directory/<anahtar>/).
+
+    Anahtar; video içeriğinin, model ağırlıklarının ve pipeline ayarlarının özetinden
+    üretilir, böylece dosya adı değişse de aynı içerik yeniden işlenmez, model ya da ayar
+    değişince de eski sonuç kullanılmaz. Dosya özetleri (boyut, mtime) ile önbelleğe
+    alındığından büyük videolar yalnızca ilk seferde okunur. Toplam boyut quota_bytes'ı
+    aşınca en uzun süredir kullanılmayan kayıtlar silinir. Dizin, CalibrationStore gibi
+    atomik olarak yazılır.
+    """
+
+    INDEX_FILE = "index.json"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, quota_bytes: int = DEFAULT_QUOTA_BYTES):
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+        self.entries: Dict[str, Dict] = {}
+        self.file_hashes: Dict[str, Dict] = {}
+        # key_for arayüzde arka plan iş parçacığında çalışır; dizin yazımı ve özet kayıtları kilitlenir
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Analiz önbelleği dizini okunamadı ({e}), boş dizinle devam ediliyor...")
+            return
+        # Diskte karşılığı kalmamış kayıtlar atlanır
+        self.entries = {key: entry for key, entry in payload.get('entries', {}).items()
+                        if os.path.isdir(self._entry_dir(key))}
+        self.file_hashes = payload.get('file_hashes', {})
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            payload = json.dumps({'version': 1, 'entries': self.entries, 'file_hashes': self.file_hashes}, indent=1)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".index-", suffix=".json")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.index_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _file_digest(self, path: str) -> Tuple[str, bool]:
+        """(BLAKE2b özeti, yeni hesaplandı mı); boyut ve mtime değişmediyse kayıtlı özet kullanılır."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.file_hashes.get(path)
+        if known and known['size'] == stat.st_size and known['mtime'] == stat.st_mtime:
+            return known['digest'], False
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+                digest.update(chunk)
+        with self._lock:
+            self.file_hashes[path] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'digest': digest.hexdigest()}
+        return digest.hexdigest(), True
+
+    def file_digest(self, path: str) -> str:
+        digest, computed = self._file_digest(path)
+        if computed:
+            self._save()
+        return digest
+
+    def key_for(self, video_path: str, model_paths: Sequence[str], config: Dict) -> str:
+        """
+        Video, model ağırlıkları ve pipeline ayarlarından önbellek anahtarı. İlk seferde
+        dosyaların tamamı okunur (büyük videolarda uzun sürer), bu yüzden arayüz bunu arka
+        planda çağırır. Yeni özetler dizine tek seferde yazılır.
+        """
+        digests = [self._file_digest(path) for path in [video_path, *model_paths]]
+        if any(computed for _, computed in digests):
+            self._save()
+        parts = {
+            'format': CACHE_FORMAT_VERSION,
+            'video': digests[0][0],
+            'models': [digest for digest, _ in digests[1:]],
+            'config': config,
+        }
+        encoded = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Kayıt varsa son kullanım zamanını günceller ve kaydı döner."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        manifest_path = os.path.join(self._entry_dir(key), self.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            self._drop(key)
+            return None
+        entry['last_used'] = time.time()
+        self._save()
+        return entry
+
+    def materialize(self, key: str, run_dir: str) -> List[Dict]:
+        """
+        Önbellekteki çıktıları çalışma dizinine bağlar ve worker'ın ürettiği biçimde
+        processed_frames_info listesi döner. Çalışma dizini silinse de önbellek etkilenmez.
+        """
+        entry_dir = self._entry_dir(key)
+        with open(os.path.join(entry_dir, self.MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        os.makedirs(run_dir, exist_ok=True)
+        frames_info = []
+        for frame in manifest['frames']:
+            info = {'selected': True}
+            for field, name in frame.items():
+                dst = os.path.join(run_dir, name)
+                _link_or_copy(os.path.join(entry_dir, name), dst)
+                info[field] = dst
+            frames_info.append(info)
+        return frames_info
+
+    def store(self, key: str, frames_info: List[Dict], video_path: str) -> Optional[str]:
+        """
+        İşlenmiş kare çıktılarını önbelleğe ekler. Kayıt tek başına kotayı aşıyorsa
+        eklenmez. Kotayı aşan eski kayıtlar silinir.
+        """
+        path_fields = [field for field in ('annotated_path', 'radar_path')
+                       if frames_info and field in frames_info[0]]
+        size = sum(os.path.getsize(info[field]) for info in frames_info for field in path_fields)
+        if size > self.quota_bytes:
+            print(f"Analiz önbelleği kotası bu video için yetersiz ({size / 1024 ** 2:.0f} MB)")
+            return None
+
+        entry_dir = self._entry_dir(key)
+        tmp_dir = tempfile.mkdtemp(dir=self._ensure_directory(), prefix=".entry-")
+        try:
+            frames = []
+            for info in frames_info:
+                names = {field: os.path.basename(info[field]) for field in path_fields}
+                for field, name in names.items():
+                    _link_or_copy(info[field], os.path.join(tmp_dir, name))
+                frames.append(names)
+            with open(os.path.join(tmp_dir, self.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump({'frames': frames}, f)
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir)
+            os.replace(tmp_dir, entry_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        now = time.time()
+        self.entries[key] = {'video': os.path.basename(video_path), 'frames': len(frames_info),
+                             'size_bytes': size, 'created': now, 'last_used': now}
+        self._evict(keep=key)
+        self._save()
+        return entry_dir
+
+    def _ensure_directory(self) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        return self.directory
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry['size_bytes'] for entry in self.entries.values())
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        for key in sorted(self.entries, key=lambda k: self.entries[k]['last_used']):
+            if self.total_bytes <= self.quota_bytes:
+                return
+            if key != keep:
+                print(f"Analiz önbelleğinden silindi: {self.entries[key]['video']} ({key})")
+                self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self.entries.pop(key, None)
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
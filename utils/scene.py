@@ -0,0 +1,148 @@
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+# Çekim türleri
+SHOT_WIDE = 'wide'
+SHOT_CLOSE_UP = 'close_up'
+SHOT_NON_PITCH = 'non_pitch'
+SHOT_TYPES = (SHOT_WIDE, SHOT_CLOSE_UP, SHOT_NON_PITCH)
+
+# Çim rengi aralığı (OpenCV HSV)
+GRASS_HSV_LOWER = (35, 40, 40)
+GRASS_HSV_UPPER = (85, 255, 255)
+
+
+class ShotClassifier:
+    """
+    Yayın karelerini küçültülmüş görüntü üzerinden ucuz özelliklerle sınıflandırır:
+
+    - wide: saha (çim) oranı yüksek, büyük bir oyuncu silüeti yok ve saha çizgileri görünüyor
+    - close_up: çim var ama kareyi kaplayan oyuncu/nesne var ya da çizgi görünmüyor
+    - non_pitch: çim oranı çok düşük (tribün, grafik, stüdyo)
+
+    Geniş çekimden çıkış hemen uygulanır (ara çekim kareleri takipçilere girmesin diye);
+    diğer geçişler titremeyi önlemek için ancak hold_frames ardışık kare aynı sonucu
+    verdiğinde uygulanır.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (240, 135), min_grass_ratio: float = 0.15,
+                 wide_grass_ratio: float = 0.35, max_blob_ratio: float = 0.08,
+                 min_line_density: float = 0.001, hold_frames: int = 2):
+        self.size = size
+        self.min_grass_ratio = min_grass_ratio
+        self.wide_grass_ratio = wide_grass_ratio
+        self.max_blob_ratio = max_blob_ratio
+        self.min_line_density = min_line_density
+        self.hold_frames = hold_frames
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        self.reset()
+
+    def reset(self) -> None:
+        self.label = None
+        self._candidate = None
+        self._candidate_frames = 0
+
+    def features(self, frame: np.ndarray) -> Dict[str, float]:
+        # Önce seyreltme, ardından 2x civarı INTER_AREA: doğrudan küçültmeden ~3 kat hızlı
+        step = max(1, frame.shape[1] // (self.size[0] * 2))
+        small = cv2.resize(frame[::step, ::step], self.size, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        grass = cv2.inRange(hsv, GRASS_HSV_LOWER, GRASS_HSV_UPPER)
+        grass_ratio = cv2.countNonZero(grass) / grass.size
+
+        # Çim içindeki ince parlak yapılar (saha çizgileri): V kanalında top-hat
+        tophat = cv2.morphologyEx(hsv[:, :, 2], cv2.MORPH_TOPHAT, self._kernel)
+        lines = (tophat > 25) & (cv2.dilate(grass, self._kernel) > 0)
+        line_density = float(lines.sum()) / max(cv2.countNonZero(grass), 1)
+
+        # Üst kenara değmeyen en büyük çim dışı bölge (tribün hariç): yakın çekimde oyuncu
+        non_grass = cv2.bitwise_not(grass)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(non_grass, connectivity=8)
+        interior = [stats[i, cv2.CC_STAT_AREA] for i in range(1, count) if stats[i, cv2.CC_STAT_TOP] > 0]
+        largest_blob = max(interior, default=0) / grass.size
+
+        return {'grass_ratio': grass_ratio, 'line_density': line_density, 'largest_blob': largest_blob}
+
+    def classify_frame(self, frame: np.ndarray) -> str:
+        """Tek karenin etiketi (zamansal yumuşatma olmadan)."""
+        f = self.features(frame)
+        if f['grass_ratio'] < self.min_grass_ratio:
+            return SHOT_NON_PITCH
+        if (f['grass_ratio'] >= self.wide_grass_ratio and f['largest_blob'] < self.max_blob_ratio
+                and f['line_density'] >= self.min_line_density):
+            return SHOT_WIDE
+        return SHOT_CLOSE_UP
+
+    def classify(self, frame: np.ndarray) -> str:
+        """Zamansal olarak yumuşatılmış etiket."""
+        label = self.classify_frame(frame)
+        if self.label is None or (self.label == SHOT_WIDE and label != SHOT_WIDE):
+            self.label = label
+            self._candidate, self._candidate_frames = None, 0
+        elif label == self.label:
+            self._candidate, self._candidate_frames = None, 0
+        else:
+            if label == self._candidate:
+                self._candidate_frames += 1
+            else:
+                self._candidate, self._candidate_frames = label, 1
+            if self._candidate_frames >= self.hold_frames:
+                self.label = label
+                self._candidate, self._candidate_frames = None, 0
+        return self.label
+
+
+class PitchRegionFilter:
+    """
+    Ayak noktası saha dışında kalan tespitleri (tribün, yedek kulübesi) takipten önce eler.
+
+    Homografi varsa ayak noktaları saha koordinatlarına çevrilir ve margin (cm) kadar
+    genişletilmiş saha dikdörtgeninin içinde mi diye bakılır; ufuk çizgisinin ötesine
+    düşen noktalar (homojen koordinatın işareti değişir) saha dışı sayılır. Homografi
+    yoksa küçültülmüş çim maskesi kullanılır.
+    """
+
+    def __init__(self, pitch_length: float, pitch_width: float, margin: float = 200.0, mask_step: int = 4):
+        self.bounds = (-margin, -margin, pitch_length + margin, pitch_width + margin)
+        self.mask_step = mask_step
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (9, 9))
+        self._dilate_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
+    def keep_mask(self, footpoints: np.ndarray, frame: np.ndarray, transformer=None) -> np.ndarray:
+        """footpoints (N, 2) görüntü koordinatları için saha içinde olanların maskesi."""
+        if len(footpoints) == 0:
+            return np.zeros(0, dtype=bool)
+        if transformer is not None and transformer.m is not None:
+            return self._keep_by_homography(footpoints, frame, transformer.m)
+        return self._keep_by_color(footpoints, frame)
+
+    def _keep_by_homography(self, footpoints: np.ndarray, frame: np.ndarray, m: np.ndarray) -> np.ndarray:
+        points = np.column_stack([footpoints, np.ones(len(footpoints))]) @ np.asarray(m, dtype=np.float64).T
+        # Görüntü merkezinin homojen işareti sahanın bulunduğu tarafı verir
+        height, width = frame.shape[:2]
+        reference = m[2, 0] * width / 2 + m[2, 1] * height / 2 + m[2, 2]
+        w = points[:, 2]
+        in_front = w * np.sign(reference) > 1e-9
+        x = np.divide(points[:, 0], w, out=np.full(len(w), np.inf), where=in_front)
+        y = np.divide(points[:, 1], w, out=np.full(len(w), np.inf), where=in_front)
+        x0, y0, x1, y1 = self.bounds
+        return in_front & (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+    def grass_mask(self, frame: np.ndarray) -> np.ndarray:
+        """Çizgi ve oyuncu boşlukları kapatılmış, küçültülmüş çim maskesi."""
+        small = frame[::self.mask_step, ::self.mask_step]
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        grass = cv2.inRange(hsv, GRASS_HSV_LOWER, GRASS_HSV_UPPER)
+        grass = cv2.morphologyEx(grass, cv2.MORPH_CLOSE, self._kernel)
+        # Örtüşen oyuncuların ayak altında kalan boşluklar için hafif genişletme
+        return cv2.dilate(grass, self._dilate_kernel)
+
+    def _keep_by_color(self, footpoints: np.ndarray, frame: np.ndarray) -> np.ndarray:
+        grass = self.grass_mask(frame)
+        height, width = grass.shape
+        cols = np.clip((footpoints[:, 0] / self.mask_step).astype(np.int64), 0, width - 1)
+        # Ayak noktasının bir satır altı örneklenir: kutunun alt kenarı oyuncunun kendisidir
+        rows = np.clip((footpoints[:, 1] / self.mask_step).astype(np.int64) + 1, 0, height - 1)
+        return grass[rows, cols] > 0
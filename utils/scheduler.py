@@ -0,0 +1,185 @@
+"""
+İş kuyruğunu (utils.job_queue) paralel worker süreçleriyle işleyen zamanlayıcı.
+
+Her worker ayrı bir süreçtir ve modelleri bir kez kendisi yükler; işleri kuyruktan
+atomik olarak alır, ilerlemeyi birkaç saniyede bir kuyruğa yazar ve iptal isteklerini
+bu sırada görür. Çöken worker'ın işi recover() ile kuyruğa döner ve worker yeniden
+başlatılır. Zamanlayıcı durdurulduğunda çalışan işler kuyruğa geri bırakılır.
+
+    python -m utils.cli schedule --workers 2
+"""
+import multiprocessing
+import os
+import signal
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from utils.backend import FrameAnnotator
+from utils.calibration import CalibrationStore
+from utils.cli import DEFAULT_SETTINGS, create_video_processor, load_frame_processor, output_paths, process_video
+from utils.job_queue import DEFAULT_QUEUE_PATH, DEFAULT_STALE_AFTER_S, JobQueue
+
+# Model yüklenemeyen worker bu kodla çıkar; yeniden başlatılmaz
+EXIT_MODEL_ERROR = 2
+HEARTBEAT_INTERVAL_S = 2.0
+
+
+def _remove_outputs(outputs: Dict[str, str]) -> None:
+    for path in outputs.values():
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def run_job(queue: JobQueue, job: Dict, frame_processor, annotator: FrameAnnotator,
+            calibration_store: Optional[CalibrationStore], stop_event) -> str:
+    """Tek bir işi işler ve kuyruktaki durumunu günceller; son durumu döner."""
+    settings = dict(DEFAULT_SETTINGS, **job['settings'])
+    outputs = output_paths(job['video'], job['output_dir'], settings['modes'])
+    os.makedirs(job['output_dir'], exist_ok=True)
+    cancel_requested = [False]
+
+    def progress(frames, total_frames, fps):
+        cancel_requested[0] = queue.heartbeat(job['id'], frames, total_frames, fps)
+
+    def cancelled():
+        return cancel_requested[0] or stop_event.is_set()
+
+    video_processor = create_video_processor(job['video'], job['output_dir'], frame_processor, annotator,
+                                             settings, calibration_store)
+    try:
+        stats = process_video(video_processor, outputs, max_frames=settings['max_frames'],
+                              report_interval_s=HEARTBEAT_INTERVAL_S, progress=progress, cancelled=cancelled)
+    except Exception as e:
+        _remove_outputs(outputs)
+        queue.fail(job['id'], str(e))
+        return 'failed'
+    finally:
+        video_processor.executor.shutdown(wait=True)
+
+    if stats['cancelled']:
+        # Yarım kalan çıktılar bırakılmaz; durdurulan iş baştan yeniden alınır
+        _remove_outputs(outputs)
+        if cancel_requested[0]:
+            queue.mark_cancelled(job['id'])
+            return 'cancelled'
+        queue.release(job['id'], count_attempt=False)
+        return 'queued'
+
+    queue.complete(job['id'], result={key: stats[key] for key in ('outputs', 'frames', 'seconds', 'fps')})
+    return 'done'
+
+
+def worker_main(db_path: str, name: str, model_paths: Sequence[str], stop_event,
+                processor_factory: Callable = load_frame_processor, poll_interval_s: float = 2.0) -> None:
+    """Worker sürecinin giriş noktası: modelleri yükler, kuyruk boşalana ya da durdurulana kadar iş alır."""
+    # Ctrl+C zamanlayıcıya gider; worker stop_event ile düzenli kapanır
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        frame_processor = processor_factory(*model_paths)
+    except Exception as e:
+        print(f"[{name}] Modeller yüklenemedi: {e}", flush=True)
+        raise SystemExit(EXIT_MODEL_ERROR)
+    annotator = FrameAnnotator()
+    calibration_store = CalibrationStore()
+    queue = JobQueue(db_path)
+    print(f"[{name}] hazır (pid {os.getpid()})", flush=True)
+
+    while not stop_event.is_set():
+        job = queue.claim(name)
+        if job is None:
+            stop_event.wait(poll_interval_s)
+            continue
+        print(f"[{name}] #{job['id']} başladı: {job['video']}", flush=True)
+        started = time.perf_counter()
+        status = run_job(queue, job, frame_processor, annotator, calibration_store, stop_event)
+        print(f"[{name}] #{job['id']} {status} ({time.perf_counter() - started:.1f} sn)", flush=True)
+    queue.close()
+
+
+class Scheduler:
+    """
+    workers adet worker sürecini başlatır ve izler. Ölen worker'ların işlerini
+    kuyruğa geri alır ve süreçleri yeniden başlatır. exit_when_idle ise kuyrukta
+    bekleyen ya da çalışan iş kalmayınca çıkar.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_QUEUE_PATH, workers: int = 1,
+                 model_paths: Optional[Sequence[str]] = None, exit_when_idle: bool = False,
+                 processor_factory: Callable = load_frame_processor, poll_interval_s: float = 2.0,
+                 stale_after_s: float = DEFAULT_STALE_AFTER_S):
+        self.db_path = db_path
+        self.worker_count = max(1, workers)
+        self.model_paths = tuple(model_paths or ())
+        self.exit_when_idle = exit_when_idle
+        self.processor_factory = processor_factory
+        self.poll_interval_s = poll_interval_s
+        self.stale_after_s = stale_after_s
+        # Torch/CUDA çatallanan süreçlerde güvenli olmadığı için spawn kullanılır
+        self.context = multiprocessing.get_context('spawn')
+        self.stop_event = self.context.Event()
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * self.worker_count
+
+    def _start_worker(self, index: int) -> None:
+        name = f"worker-{index + 1}"
+        process = self.context.Process(
+            target=worker_main, name=name,
+            args=(self.db_path, name, self.model_paths, self.stop_event, self.processor_factory,
+                  self.poll_interval_s))
+        process.start()
+        self.processes[index] = process
+
+    def _request_stop(self, signum=None, frame=None) -> None:
+        if not self.stop_event.is_set():
+            print("Zamanlayıcı durduruluyor; çalışan işler kuyruğa geri bırakılacak...", flush=True)
+        self.stop_event.set()
+
+    def run(self) -> int:
+        queue = JobQueue(self.db_path)
+        recovered = queue.recover(self.stale_after_s)
+        if recovered:
+            print(f"Yarıda kalan işler kuyruğa geri alındı: {', '.join(f'#{job_id}' for job_id in recovered)}")
+        queue.register_scheduler(self.worker_count)
+        previous_handlers = {sig: signal.signal(sig, self._request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        print(f"{self.worker_count} worker başlatılıyor (kuyruk: {self.db_path})", flush=True)
+        for index in range(self.worker_count):
+            self._start_worker(index)
+
+        model_errors = 0
+        try:
+            while not self.stop_event.is_set():
+                self.stop_event.wait(self.poll_interval_s)
+                for index, process in enumerate(self.processes):
+                    if process is None or process.is_alive() or self.stop_event.is_set():
+                        continue
+                    process.join()
+                    if process.exitcode == EXIT_MODEL_ERROR:
+                        self.processes[index] = None
+                        model_errors += 1
+                        continue
+                    print(f"{process.name} beklenmedik şekilde durdu (çıkış kodu {process.exitcode}), "
+                          f"yeniden başlatılıyor", flush=True)
+                    self._start_worker(index)
+                if model_errors == self.worker_count:
+                    print("Hiçbir worker modelleri yükleyemedi.", flush=True)
+                    return EXIT_MODEL_ERROR
+
+                recovered = queue.recover(self.stale_after_s)
+                if recovered:
+                    print(f"Kuyruğa geri alınan işler: {', '.join(f'#{job_id}' for job_id in recovered)}", flush=True)
+                if self.exit_when_idle:
+                    counts = queue.counts()
+                    if counts['queued'] == 0 and counts['running'] == 0:
+                        print("Kuyruk boş, çıkılıyor.", flush=True)
+                        self.stop_event.set()
+        finally:
+            self.stop_event.set()
+            for process in self.processes:
+                if process is not None:
+                    process.join()
+            # Worker'ı öldürülmüş (SIGKILL) işler de kuyruğa döner
+            queue.recover(self.stale_after_s)
+            queue.unregister_scheduler()
+            queue.close()
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+        return 0
@@ -0,0 +1,173 @@
+import os
+import shutil
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from utils.checkpoint import has_checkpoint
+
+DEFAULT_TEMP_ROOT = "temp_frames"
+DEFAULT_QUOTA_BYTES = 20 * 1024 ** 3
+DEFAULT_MIN_FREE_BYTES = 2 * 1024 ** 3
+
+# Ara kare kayıt profilleri, pahalıdan ucuza. cost: tam profile göre yaklaşık bayt oranı
+STORAGE_PROFILES = (
+    {'name': 'full', 'scale': 1.0, 'jpeg_quality': 95, 'cost': 1.0},
+    {'name': 'reduced', 'scale': 1.0, 'jpeg_quality': 75, 'cost': 0.45},
+    {'name': 'thumbnail', 'scale': 0.5, 'jpeg_quality': 70, 'cost': 0.12},
+)
+
+# Ölçüm yapılana kadar kullanılan kaba JPEG (q95) boyutu tahmini, bayt/piksel
+ANNOTATED_BYTES_PER_PIXEL = 0.25
+RADAR_BYTES_PER_PIXEL = 0.08
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            total += directory_size(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            total += entry.stat().st_size
+    return total
+
+
+def estimate_frame_bytes(frame_wh: Tuple[int, int], radar_wh: Tuple[int, int]) -> float:
+    """Tam profilde bir kare için (anotasyonlu + radar) yazılacak bayt tahmini."""
+    return (frame_wh[0] * frame_wh[1] * ANNOTATED_BYTES_PER_PIXEL
+            + radar_wh[0] * radar_wh[1] * RADAR_BYTES_PER_PIXEL)
+
+
+class TempStorageManager:
+    """
+    temp_frames/ altındaki çalışma dizinlerinin disk kullanımını yönetir.
+
+    Çalışma başına yazılan baytlar izlenir; toplam kullanım quota_bytes'ı ya da diskte
+    min_free_bytes'tan az yer kalmasını aşacaksa en uzun süredir dokunulmayan çalışmalar
+    silinir (devam ettirilebilir çalışmalar en son). Yer yine de yetmezse choose_profile
+    daha ucuz bir ara kayıt profili (düşük JPEG kalitesi, küçük kare) seçer; işlem durmaz.
+    """
+
+    def __init__(self, root: str = DEFAULT_TEMP_ROOT, quota_bytes: int = DEFAULT_QUOTA_BYTES,
+                 min_free_bytes: int = DEFAULT_MIN_FREE_BYTES):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.min_free_bytes = min_free_bytes
+        self._run_bytes: Dict[str, int] = {}
+        self._scan()
+
+    def _scan(self) -> None:
+        """Diskteki mevcut çalışmaların boyutlarını okur (ör. çöken bir oturumdan kalanlar)."""
+        if not os.path.isdir(self.root):
+            return
+        for entry in os.scandir(self.root):
+            if entry.is_dir(follow_symlinks=False):
+                self._run_bytes[entry.path] = directory_size(entry.path)
+
+    def create_run(self) -> str:
+        """Yeni, benzersiz bir çalışma dizini oluşturur."""
+        run_dir = os.path.join(self.root, f"run_{int(time.time())}")
+        suffix = 1
+        while os.path.exists(run_dir):
+            run_dir = os.path.join(self.root, f"run_{int(time.time())}_{suffix}")
+            suffix += 1
+        os.makedirs(run_dir)
+        self._run_bytes[run_dir] = 0
+        return run_dir
+
+    def register_run(self, run_dir: str) -> None:
+        """Dışarıda oluşturulmuş ya da devam ettirilen bir çalışmayı izlemeye alır."""
+        self._run_bytes[run_dir] = directory_size(run_dir) if os.path.isdir(run_dir) else 0
+
+    def record_write(self, run_dir: str, nbytes: int) -> None:
+        self._run_bytes[run_dir] = self._run_bytes.get(run_dir, 0) + nbytes
+
+    def remove_run(self, run_dir: Optional[str]) -> None:
+        if not run_dir:
+            return
+        self._run_bytes.pop(run_dir, None)
+        if os.path.exists(run_dir):
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    def usage(self) -> int:
+        return sum(self._run_bytes.values())
+
+    def run_sizes(self) -> Dict[str, int]:
+        return dict(self._run_bytes)
+
+    def free_bytes(self) -> int:
+        path = self.root if os.path.isdir(self.root) else "."
+        return shutil.disk_usage(path).free
+
+    def available_bytes(self) -> int:
+        """Kota ve diskteki boş alan sınırlarından küçük olanı."""
+        return max(min(self.quota_bytes - self.usage(), self.free_bytes() - self.min_free_bytes), 0)
+
+    def _eviction_order(self, protect: Iterable[str]) -> List[str]:
+        protected = {os.path.normpath(path) for path in protect if path}
+        candidates = [run_dir for run_dir in self._run_bytes
+                      if os.path.normpath(run_dir) not in protected and os.path.isdir(run_dir)]
+        # Devam ettirilebilir çalışmalar en son silinir; kendi içlerinde en eski önce
+        return sorted(candidates, key=lambda run_dir: (has_checkpoint(run_dir), os.path.getmtime(run_dir)))
+
+    def evict(self, needed_bytes: float, protect: Iterable[str] = ()) -> int:
+        """available_bytes needed_bytes'a ulaşana kadar eski çalışmaları siler; silinen baytı döner."""
+        freed = 0
+        for run_dir in self._eviction_order(protect):
+            if self.available_bytes() >= needed_bytes:
+                break
+            size = self._run_bytes.get(run_dir, 0)
+            print(f"Geçici çalışma silindi (disk kotası): {run_dir} ({size / 1024 ** 2:.0f} MB)")
+            self.remove_run(run_dir)
+            freed += size
+        return freed
+
+    def reserve(self, needed_bytes: float, protect: Iterable[str] = ()) -> bool:
+        """Gerekirse eski çalışmaları silerek needed_bytes kadar yer açmaya çalışır."""
+        if self.available_bytes() < needed_bytes:
+            self.evict(needed_bytes, protect)
+        return self.available_bytes() >= needed_bytes
+
+    def choose_profile(self, full_frame_bytes: float, frames_remaining: int,
+                       protect: Iterable[str] = (), current: Optional[Dict] = None) -> Dict:
+        """
+        Kalan kareler için yer açılabilen en kaliteli profil; hiçbiri sığmazsa en ucuzu.
+        current verilirse ondan daha pahalı bir profile dönülmez (çalışma içinde kalite
+        yalnızca düşer, gidip gelmez).
+        """
+        protect = list(protect)
+        start = STORAGE_PROFILES.index(current) if current in STORAGE_PROFILES else 0
+        for profile in STORAGE_PROFILES[start:]:
+            if self.reserve(full_frame_bytes * profile['cost'] * frames_remaining, protect):
+                return profile
+        return STORAGE_PROFILES[-1]
+
+    def cleanup(self, keep_resumable: bool = True) -> None:
+        """Çalışma dizinlerini siler; keep_resumable ise kontrol noktası olanlar korunur."""
+        if not os.path.isdir(self.root):
+            return
+        for entry in os.scandir(self.root):
+            if entry.is_dir(follow_symlinks=False) and keep_resumable and has_checkpoint(entry.path):
+                print(f"Devam ettirilebilir çalışma korundu: {entry.path}")
+                continue
+            try:
+                shutil.rmtree(entry.path) if entry.is_dir(follow_symlinks=False) else os.remove(entry.path)
+                self._run_bytes.pop(entry.path, None)
+                print(f"Temizlendi: {entry.path}")
+            except OSError as e:
+                print(f"Temizlik hatası {entry.path}: {e}")
+        if not any(os.scandir(self.root)):
+            os.rmdir(self.root)
+
+
+def write_image(path: str, image: np.ndarray, profile: Dict) -> int:
+    """Görüntüyü profile göre JPEG olarak yazar; yazılan bayt sayısını döner."""
+    if profile['scale'] != 1.0:
+        image = cv2.resize(image, None, fx=profile['scale'], fy=profile['scale'], interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, profile['jpeg_quality']])
+    if not ok:
+        raise OSError(f"JPEG kodlanamadı: {path}")
+    encoded.tofile(path)
+    return int(encoded.nbytes)
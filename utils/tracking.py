@@ -0,0 +1,94 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import supervision as sv
+
+SLOT_FIELD = 'class_slot'
+
+
+class MultiClassTracker:
+    """
+    Oyuncu, kaleci ve hakem tespitleri için tek bir ByteTrack.
+
+    Tüm kişi tespitleri tek bir eşleştirme geçişinden geçer; sınıf, eşleştirmeyi
+    kısıtlamayan yumuşak bir özniteliktir. Her iz için sınıf oyları (güvenle ağırlıklı,
+    üssel olarak sönümlenen) tutulur ve iz, oyu en yüksek sınıfta raporlanır. Böylece
+    bir kare kaleci olarak yanlış sınıflanan oyuncu kimliğini kaybetmez.
+    """
+
+    def __init__(self, keys: Sequence[str], vote_decay: float = 0.8, duplicate_iou: float = 0.7,
+                 max_missing_frames: int = 30):
+        self.keys = tuple(keys)
+        self.vote_decay = vote_decay
+        self.duplicate_iou = duplicate_iou
+        self.max_missing_frames = max_missing_frames
+        self.tracker = sv.ByteTrack(lost_track_buffer=max_missing_frames)
+        self.frame_index = 0
+        self._votes: Dict[int, np.ndarray] = {}
+        self._last_seen: Dict[int, int] = {}
+        # Her sınıf yuvası için çıktıda kullanılacak model class_id'si (ilk görülende öğrenilir)
+        self._slot_class_ids: Dict[int, int] = {}
+
+    def update(self, detections_by_key: Dict[str, sv.Detections]) -> Dict[str, sv.Detections]:
+        """
+        {'players': ..., 'goalkeepers': ..., 'referees': ...} alır, aynı anahtarlarla
+        tracker_id atanmış ve oylanmış sınıflara göre ayrılmış tespitleri döner.
+        """
+        self.frame_index += 1
+        merged = self._merge(detections_by_key)
+        if len(merged) > 0:
+            # Aynı kişinin farklı sınıflarla çift tespiti tek kutuya indirilir
+            merged = merged.with_nms(threshold=self.duplicate_iou, class_agnostic=True)
+        tracked = self.tracker.update_with_detections(merged)
+
+        slots = self._vote(tracked)
+        self._prune()
+
+        results = {}
+        for slot, key in enumerate(self.keys):
+            dets = tracked[slots == slot] if len(tracked) else tracked
+            if len(dets) and slot in self._slot_class_ids:
+                dets.class_id = np.full(len(dets), self._slot_class_ids[slot], dtype=int)
+            results[key] = dets
+        return results
+
+    def _merge(self, detections_by_key: Dict[str, sv.Detections]) -> sv.Detections:
+        parts = []
+        for slot, key in enumerate(self.keys):
+            dets = detections_by_key.get(key)
+            if dets is None or len(dets) == 0:
+                continue
+            if slot not in self._slot_class_ids and dets.class_id is not None:
+                self._slot_class_ids[slot] = int(dets.class_id[0])
+            dets = dets[:]
+            dets.data[SLOT_FIELD] = np.full(len(dets), slot, dtype=int)
+            parts.append(dets)
+        return sv.Detections.merge(parts) if parts else sv.Detections.empty()
+
+    def _vote(self, tracked: sv.Detections) -> np.ndarray:
+        """İzlerin sınıf oylarını günceller ve her tespitin raporlanacak sınıf yuvasını döner."""
+        if len(tracked) == 0:
+            return np.zeros(0, dtype=int)
+        observed = tracked.data[SLOT_FIELD]
+        confidence = tracked.confidence if tracked.confidence is not None else np.ones(len(tracked))
+        slots = np.empty(len(tracked), dtype=int)
+        for i, tracker_id in enumerate(tracked.tracker_id.tolist()):
+            votes = self._votes.get(tracker_id)
+            if votes is None:
+                votes = self._votes[tracker_id] = np.zeros(len(self.keys))
+            votes *= self.vote_decay
+            votes[observed[i]] += confidence[i]
+            slots[i] = int(np.argmax(votes))
+            self._last_seen[tracker_id] = self.frame_index
+        return slots
+
+    def _prune(self) -> None:
+        stale = [tid for tid, frame in self._last_seen.items()
+                 if self.frame_index - frame > self.max_missing_frames]
+        for tracker_id in stale:
+            del self._last_seen[tracker_id]
+            del self._votes[tracker_id]
+
+    def class_of(self, tracker_id: int) -> Optional[str]:
+        votes = self._votes.get(tracker_id)
+        return None if votes is None else self.keys[int(np.argmax(votes))]
@@ -0,0 +1,316 @@
+import queue
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# PyAV isteğe bağlıdır; yoksa OpenCV ile devam edilir
+try:
+    import av
+except ImportError:
+    av = None
+
+DECODERS = ('auto', 'opencv', 'pyav')
+
+
+class OpenCVFrameSource:
+    """
+    cv2.VideoCapture sarmalayıcısı. İsteğe bağlı olarak FFmpeg donanım hızlandırma
+    ve çözücü iş parçacığı sayısı parametrelerini kullanır.
+    """
+
+    def __init__(self, video_path: str, target_size: Optional[Tuple[int, int]] = None,
+                 hw_accel: bool = False, threads: int = 0):
+        self.video_path = video_path
+        self.target_size = target_size
+        self.backend_name = 'opencv'
+
+        params = []
+        if hw_accel and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        if threads and hasattr(cv2, 'CAP_PROP_N_THREADS'):
+            params += [cv2.CAP_PROP_N_THREADS, threads]
+
+        self.cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, params) if params else cv2.VideoCapture(video_path)
+        if params and not self.cap.isOpened():
+            # Parametreler desteklenmiyorsa düz açılışa dön
+            self.cap = cv2.VideoCapture(video_path)
+        self.duration_s = 0.0
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        ret, frame = self.cap.read()
+        if ret and self.target_size is not None and (frame.shape[1], frame.shape[0]) != tuple(self.target_size):
+            frame = cv2.resize(frame, tuple(self.target_size), interpolation=cv2.INTER_AREA)
+        return ret, frame
+
+    def get(self, prop_id: int) -> float:
+        if self.target_size is not None:
+            if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+                return float(self.target_size[0])
+            if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+                return float(self.target_size[1])
+        return self.cap.get(prop_id)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return self.cap.set(prop_id, value)
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class PyAVFrameSource:
+    """
+    PyAV (FFmpeg) tabanlı okuyucu. Çok iş parçacıklı çözme (thread_type='AUTO') kullanır
+    ve kareleri doğrudan istenen çözünürlükte BGR olarak üretebilir.
+    """
+
+    def __init__(self, video_path: str, target_size: Optional[Tuple[int, int]] = None, threads: int = 0):
+        if av is None:
+            raise RuntimeError("PyAV yüklü değil")
+        self.video_path = video_path
+        self.target_size = target_size
+        self.backend_name = 'pyav'
+        self.container = av.open(video_path)
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = 'AUTO'
+        if threads:
+            self.stream.thread_count = threads
+        self._frames = self.container.decode(self.stream)
+        self._pending = None  # konumlandırma sırasında okunmuş, henüz verilmemiş kare
+        self._position_ms = 0.0
+        self._position_frames = 0
+        self._opened = True
+
+        rate = self.stream.average_rate or self.stream.guessed_rate
+        self.fps = float(rate) if rate else 0.0
+        if self.container.duration:
+            self.duration_s = self.container.duration / av.time_base
+        elif self.stream.duration and self.stream.time_base:
+            self.duration_s = float(self.stream.duration * self.stream.time_base)
+        else:
+            self.duration_s = 0.0
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+        else:
+            try:
+                frame = next(self._frames)
+            except (StopIteration, av.error.FFmpegError):
+                return False, None
+
+        if frame.time is not None:
+            self._position_ms = frame.time * 1000.0
+        self._position_frames += 1
+
+        if self.target_size is not None:
+            image = frame.to_ndarray(format='bgr24', width=self.target_size[0], height=self.target_size[1])
+        else:
+            image = frame.to_ndarray(format='bgr24')
+        return True, image
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.target_size[0] if self.target_size else self.stream.codec_context.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.target_size[1] if self.target_size else self.stream.codec_context.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.stream.frames or 0)
+        if prop_id == cv2.CAP_PROP_POS_MSEC:
+            return self._position_ms
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._position_frames)
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return self.seek(int(value))
+        return False
+
+    def seek(self, frame_index: int) -> bool:
+        """
+        Önceki anahtar kareye konumlanıp hedef kareye kadar ileri çözer; sonraki read()
+        frame_index numaralı kareyi döner. Zaman bilgisi yoksa False döner.
+        """
+        if not self._opened or not self.fps or self.stream.time_base is None:
+            return False
+        target_s = frame_index / self.fps
+        start_s = float(self.stream.start_time * self.stream.time_base) if self.stream.start_time else 0.0
+        try:
+            self.container.seek(int((target_s + start_s) / self.stream.time_base),
+                                stream=self.stream, backward=True, any_frame=False)
+        except av.error.FFmpegError:
+            return False
+        self._frames = self.container.decode(self.stream)
+        self._pending = None
+        # Kare zamanları yarım kare toleransla karşılaştırılır
+        threshold = target_s + start_s - 0.5 / self.fps
+        for frame in self._frames:
+            if frame.time is None or frame.time >= threshold:
+                self._pending = frame
+                break
+        self._position_frames = frame_index
+        self._position_ms = target_s * 1000.0
+        return True
+
+    def release(self) -> None:
+        if self._opened:
+            self._opened = False
+            self.container.close()
+
+
+class PrefetchingFrameSource:
+    """
+    Herhangi bir kaynağı arka plan iş parçacığında okuyup sınırlı bir tampona koyar;
+    böylece çözme işlemi inference ile aynı iş parçacığında beklemez.
+    """
+
+    _END = object()
+
+    def __init__(self, source, buffer_size: int = 8):
+        self.source = source
+        self.backend_name = f"{source.backend_name}+prefetch"
+        self.duration_s = getattr(source, 'duration_s', 0.0)
+        self._queue = queue.Queue(maxsize=max(1, buffer_size))
+        self._stop = threading.Event()
+        # Statik özellikler okuma başlamadan önbelleğe alınır
+        self._static_props = {prop: source.get(prop) for prop in (
+            cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FPS, cv2.CAP_PROP_FRAME_COUNT)}
+        self._position = {cv2.CAP_PROP_POS_MSEC: 0.0, cv2.CAP_PROP_POS_FRAMES: 0.0}
+        # Kaynak, okuyucu iş parçacığı read() içindeyken serbest bırakılmaz; release() zaman
+        # aşımına uğrarsa bırakma işi okuyucu çıkarken yapılır
+        self._release_lock = threading.Lock()
+        self._reader_exited = False
+        self._release_pending = False
+        self._thread = threading.Thread(target=self._run, name="frame-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                ret, frame = self.source.read()
+                if not ret:
+                    break
+                item = (frame, self.source.get(cv2.CAP_PROP_POS_MSEC), self.source.get(cv2.CAP_PROP_POS_FRAMES))
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        finally:
+            self._put_end()
+            with self._release_lock:
+                self._reader_exited = True
+                release = self._release_pending
+            if release:
+                self.source.release()
+
+    def _put_end(self):
+        while True:
+            try:
+                self._queue.put(self._END, timeout=0.1)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    return
+
+    def isOpened(self) -> bool:
+        return self.source.isOpened()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._stop.is_set():
+            return False, None
+        item = self._queue.get()
+        if item is self._END:
+            self._stop.set()
+            return False, None
+        frame, position_ms, position_frames = item
+        self._position[cv2.CAP_PROP_POS_MSEC] = position_ms
+        self._position[cv2.CAP_PROP_POS_FRAMES] = position_frames
+        return True, frame
+
+    def get(self, prop_id: int) -> float:
+        if prop_id in self._position:
+            return self._position[prop_id]
+        if prop_id in self._static_props:
+            return self._static_props[prop_id]
+        return self.source.get(prop_id)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return False
+
+    def release(self) -> None:
+        self._stop.set()
+        # Okuyucu iş parçacığı tampon boşalınca sonlanır
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join(timeout=2.0)
+        with self._release_lock:
+            if not self._reader_exited:
+                # Okuyucu hâlâ read() içinde (ör. yavaş ağ akışı); kaynağı çıkarken kendisi bırakır
+                self._release_pending = True
+                print("Ön okuma iş parçacığı zamanında durmadı, kaynak okuma bitince serbest bırakılacak")
+                return
+        self.source.release()
+
+
+def seek_to(source, frame_index: int) -> int:
+    """
+    Kaynağı frame_index karesine konumlandırır. Kaynak konumlandırmayı desteklemiyorsa
+    kareler okunup atılır. Ulaşılan kare numarasını döner.
+    """
+    if source.set(cv2.CAP_PROP_POS_FRAMES, frame_index):
+        return frame_index
+    skipped = 0
+    while skipped < frame_index:
+        ret, _ = source.read()
+        if not ret:
+            break
+        skipped += 1
+    return skipped
+
+
+def open_frame_source(video_path: str, decoder: str = 'auto', prefetch: int = 0,
+                      target_size: Optional[Tuple[int, int]] = None, hw_accel: bool = False, threads: int = 0,
+                      start_frame: int = 0):
+    """
+    Video okuyucu fabrikası. decoder='auto' PyAV varsa onu, yoksa OpenCV'yi seçer.
+    PyAV açılamazsa OpenCV'ye geri düşülür. prefetch > 0 ise kareler arka planda tamponlanır.
+    start_frame > 0 ise okuma o kareden başlar (devam ettirilen çalışmalar için).
+    """
+    if decoder not in DECODERS:
+        raise ValueError(f"Bilinmeyen decoder: {decoder} (seçenekler: {', '.join(DECODERS)})")
+
+    source = None
+    if decoder in ('auto', 'pyav') and av is not None:
+        try:
+            source = PyAVFrameSource(video_path, target_size=target_size, threads=threads)
+        except Exception as e:
+            print(f"PyAV ile açılamadı ({e}), OpenCV kullanılacak...")
+    elif decoder == 'pyav':
+        print("PyAV yüklü değil, OpenCV kullanılacak...")
+
+    if source is None:
+        source = OpenCVFrameSource(video_path, target_size=target_size, hw_accel=hw_accel, threads=threads)
+
+    if start_frame > 0 and source.isOpened():
+        seek_to(source, start_frame)
+
+    if prefetch > 0 and source.isOpened():
+        source = PrefetchingFrameSource(source, buffer_size=prefetch)
+    return source
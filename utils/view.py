@@ -1,16 +1,33 @@
+import collections
 from typing import Tuple, Optional
 import cv2
 import numpy as np
 import numpy.typing as npt
 
+# Homografi kestirim yöntemleri. MAGSAC eski OpenCV sürümlerinde yoksa RANSAC kullanılır.
+HOMOGRAPHY_METHODS = {
+    'lstsq': 0,
+    'ransac': cv2.RANSAC,
+    'lmeds': cv2.LMEDS,
+    'magsac': getattr(cv2, 'USAC_MAGSAC', cv2.RANSAC),
+}
+
 
 class ViewTransformer:
+    """
+    Görüntü noktalarını saha koordinatlarına eşleyen homografi.
 
+    reprojection_error, inlier noktaların hedef uzaydaki (saha için cm) RMS hatasıdır;
+    score ise bu hatanın inlier oranına bölünmüş halidir (düşük olan daha iyi).
+    """
 
     def __init__(
             self,
             source: npt.NDArray[np.float32],
-            target: npt.NDArray[np.float32]
+            target: npt.NDArray[np.float32],
+            method: str = 'lstsq',
+            reprojection_threshold: float = 100.0,
+            max_reprojection_error: Optional[float] = None
     ) -> None:
 
         # Giriş verilerinin doğruluğunu kontrol et
@@ -23,13 +40,64 @@ class ViewTransformer:
         source = source.astype(np.float32)
         target = target.astype(np.float32)
 
+        if method not in HOMOGRAPHY_METHODS:
+            raise ValueError(f"Unknown homography method: {method}")
+
         # Homografi matrisini hesapla
         self.m: Optional[npt.NDArray[np.float32]] = None
-        if len(source) < 3:
+        self.m_inv: Optional[npt.NDArray[np.float32]] = None
+        if len(source) < 4:
             raise ValueError("At least 4 points are required to compute a homography")
+
+        # Homografi matrisini hesapla ve sınıf değişkenine kaydet
+        m, mask = cv2.findHomography(source, target, HOMOGRAPHY_METHODS[method], reprojection_threshold)
+        self._validate(m)
+
+        self.m = m
+        self.m_inv = np.linalg.inv(m)
+        # En küçük kareler yönteminde tüm noktalar inlier sayılır
+        if mask is None or HOMOGRAPHY_METHODS[method] == 0:
+            self.inlier_mask = np.ones(len(source), dtype=bool)
         else:
-            # Homografi matrisini hesapla ve sınıf değişkenine kaydet
-            self.m, _ = cv2.findHomography(source, target)
+            self.inlier_mask = mask.ravel().astype(bool)
+        if self.inlier_mask.sum() < 4:
+            raise ValueError("Homography has fewer than 4 inliers")
+
+        projected = cv2.perspectiveTransform(source.reshape(-1, 1, 2), m).reshape(-1, 2)
+        errors = np.linalg.norm(projected - target, axis=1)
+        self.reprojection_error = float(np.sqrt(np.mean(errors[self.inlier_mask] ** 2)))
+        self.inlier_ratio = float(self.inlier_mask.mean())
+        self.score = self.reprojection_error / self.inlier_ratio
+
+        if max_reprojection_error is not None and self.reprojection_error > max_reprojection_error:
+            raise ValueError(f"Reprojection error too high: {self.reprojection_error:.1f}")
+
+    @classmethod
+    def from_matrix(cls, m: np.ndarray, score: float = float('inf')) -> 'ViewTransformer':
+        """Kayıtlı (ör. kalibrasyon önbelleğinden gelen) bir matristen transformer oluşturur."""
+        m = np.asarray(m, dtype=np.float64)
+        cls._validate(m)
+        transformer = cls.__new__(cls)
+        transformer.m = m
+        transformer.m_inv = np.linalg.inv(m)
+        transformer.inlier_mask = np.zeros(0, dtype=bool)
+        transformer.inlier_ratio = 1.0
+        transformer.reprojection_error = float(score)
+        transformer.score = float(score)
+        return transformer
+
+    @staticmethod
+    def _validate(m: Optional[np.ndarray]) -> None:
+        """Boş, sonsuz değerli veya tekil (dejenere) homografileri reddeder."""
+        if m is None or not np.all(np.isfinite(m)):
+            raise ValueError("Homography could not be estimated")
+        if abs(m[2, 2]) < 1e-12:
+            raise ValueError("Degenerate homography (h33 ~ 0)")
+        normalized = m / m[2, 2]
+        if abs(np.linalg.det(normalized)) < 1e-10 or abs(np.linalg.det(normalized[:2, :2])) < 1e-10:
+            raise ValueError("Degenerate homography (singular matrix)")
+        if np.linalg.cond(normalized) > 1e12:
+            raise ValueError("Degenerate homography (ill-conditioned)")
 
     def transform_points(
             self,
@@ -55,11 +123,29 @@ class ViewTransformer:
         # Orijinal şekle geri dönüştür
         return transformed_points.reshape(-1, 2)
 
+    def inverse_transform_points(
+            self,
+            points: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float32]:
+        """Saha koordinatlarını görüntü koordinatlarına geri eşler."""
+        if points.size == 0:
+            return np.array([], dtype=np.float32).reshape(0, 2)
+        if self.m_inv is None:
+            raise RuntimeError("Homography matrix is not computed. Initialize with valid points.")
+        reshaped_points = points.reshape(-1, 1, 2).astype(np.float32)
+        return cv2.perspectiveTransform(reshaped_points, self.m_inv).reshape(-1, 2)
+
     def transform_image(
             self,
             image: npt.NDArray[np.uint8],
-            resolution_wh: Tuple[int, int]
+            resolution_wh: Tuple[int, int],
+            warp_engine: Optional['WarpEngine'] = None,
+            roi: Optional[Tuple[int, int, int, int]] = None
     ) -> npt.NDArray[np.uint8]:
+        """
+        Görüntüyü homografi ile dönüştürür. warp_engine verilirse önceden hesaplanmış
+        remap tabloları kullanılır. roi=(x, y, w, h) çıktının yalnızca o bölgesini üretir.
+        """
 
         # Homografi matrisinin var olup olmadığını kontrol et
         if self.m is None:
@@ -69,5 +155,115 @@ class ViewTransformer:
         if len(image.shape) not in {2, 3}:
             raise ValueError("Image must be either grayscale or color.")
 
+        if warp_engine is not None:
+            return warp_engine.warp(image, self.m, resolution_wh, roi=roi)
+
+        if roi is not None:
+            # Çıktı bölgesini öteleyerek yalnızca ROI'yi üret
+            x, y, w, h = roi
+            shift = np.array([[1, 0, -x], [0, 1, -y], [0, 0, 1]], dtype=np.float64)
+            return cv2.warpPerspective(image, shift @ self.m, (w, h))
+
         # Perspektif dönüşüm uygula
-        return cv2.warpPerspective(image, self.m, resolution_wh)
\ No newline at end of file
+        return cv2.warpPerspective(image, self.m, resolution_wh)
+
+
+class WarpEngine:
+    """
+    Sabit kamerada her kareyi aynı homografiyle dönüştürmek için cv2.remap tabloları.
+
+    Tablolar (sabit noktalı CV_16SC2 haritalar) homografi başına bir kez kurulur ve
+    yeni matris, ROI köşelerinde kaynak görüntüde tolerance_px pikselden fazla sapma
+    yaratmadıkça yeniden kullanılır.
+    """
+
+    def __init__(self, tolerance_px: float = 0.5, interpolation: int = cv2.INTER_LINEAR):
+        self.tolerance_px = tolerance_px
+        self.interpolation = interpolation
+        self.rebuilds = 0
+        self._m_inv: Optional[np.ndarray] = None
+        self._key = None
+        self._corners: Optional[np.ndarray] = None
+        self._map1: Optional[np.ndarray] = None
+        self._map2: Optional[np.ndarray] = None
+
+    def invalidate(self) -> None:
+        self._m_inv = None
+        self._key = None
+
+    def _needs_rebuild(self, m_inv: np.ndarray, key) -> bool:
+        if self._m_inv is None or key != self._key:
+            return True
+        # Tolerans, ROI köşelerinin kaynak görüntüdeki yer değiştirmesiyle ölçülür
+        old = cv2.perspectiveTransform(self._corners, self._m_inv)
+        new = cv2.perspectiveTransform(self._corners, m_inv)
+        return float(np.abs(new - old).max()) > self.tolerance_px
+
+    def _build_maps(self, m_inv: np.ndarray, roi: Tuple[int, int, int, int]) -> None:
+        x, y, w, h = roi
+        xs, ys = np.meshgrid(np.arange(x, x + w, dtype=np.float64), np.arange(y, y + h, dtype=np.float64))
+        denominator = m_inv[2, 0] * xs + m_inv[2, 1] * ys + m_inv[2, 2]
+        map_x = ((m_inv[0, 0] * xs + m_inv[0, 1] * ys + m_inv[0, 2]) / denominator).astype(np.float32)
+        map_y = ((m_inv[1, 0] * xs + m_inv[1, 1] * ys + m_inv[1, 2]) / denominator).astype(np.float32)
+        self._map1, self._map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+        self.rebuilds += 1
+
+    def warp(
+            self,
+            image: npt.NDArray[np.uint8],
+            m: npt.NDArray[np.float32],
+            resolution_wh: Tuple[int, int],
+            roi: Optional[Tuple[int, int, int, int]] = None
+    ) -> npt.NDArray[np.uint8]:
+        roi = tuple(roi) if roi is not None else (0, 0, resolution_wh[0], resolution_wh[1])
+        key = (roi, image.shape[:2])
+        m_inv = np.linalg.inv(np.asarray(m, dtype=np.float64))
+
+        if self._needs_rebuild(m_inv, key):
+            x, y, w, h = roi
+            self._corners = np.array([[[x, y]], [[x + w - 1, y]], [[x, y + h - 1]], [[x + w - 1, y + h - 1]]],
+                                     dtype=np.float64)
+            self._build_maps(m_inv, roi)
+            self._m_inv = m_inv
+            self._key = key
+
+        return cv2.remap(image, self._map1, self._map2, self.interpolation, borderMode=cv2.BORDER_CONSTANT)
+
+
+class HomographyCache:
+    """
+    Son kabul edilen homografileri yaşlarıyla birlikte tutar. Yeni kestirim, yakın zamandaki
+    bir kayıttan belirgin şekilde kötüyse (skor oranı > margin) o kayıt yeniden kullanılır.
+    Kayıtlar max_age kareden eskiyse kamera hareket etmiş olabileceği için tercih edilmez.
+    """
+
+    def __init__(self, maxlen: int = 5, max_age: int = 5, margin: float = 1.5):
+        self.max_age = max_age
+        self.margin = margin
+        self.frame_index = 0
+        self._entries = collections.deque(maxlen=maxlen)  # (frame_index, transformer)
+
+    def tick(self) -> None:
+        """Yeni kareye geçildiğini bildirir."""
+        self.frame_index += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.frame_index = 0
+
+    def add(self, transformer: ViewTransformer) -> None:
+        self._entries.append((self.frame_index, transformer))
+
+    def best(self, max_age: Optional[int] = None) -> Optional[ViewTransformer]:
+        """Yeterince yeni kayıtlar arasından en düşük skorlu transformer."""
+        max_age = self.max_age if max_age is None else max_age
+        fresh = [t for frame, t in self._entries if self.frame_index - frame <= max_age]
+        return min(fresh, key=lambda t: t.score) if fresh else None
+
+    def select(self, candidate: ViewTransformer) -> ViewTransformer:
+        """Adayı kaydeder ve kullanılacak transformer'ı seçer."""
+        best = self.best()
+        self.add(candidate)
+        if best is not None and best.score * self.margin < candidate.score:
+            return best
+        return candidate
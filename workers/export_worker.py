@@ -0,0 +1,42 @@
+# workers/export_worker.py
+import os
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from utils.export import FrameExporter
+
+class ExportWorker(QObject):
+    progress = pyqtSignal(int, int, float)  # written_frames, total_frames, fps
+    finished = pyqtSignal(str, dict) # output path, {'frames', 'skipped', 'seconds', 'fps', 'cancelled'}
+    error = pyqtSignal(str)
+
+    def __init__(self, frames_info, output_path, mode='integrated', fps=25, parent=None):
+        super().__init__(parent)
+        self.frames_info = frames_info  # Seçili kare bilgileri, yazılacak sırada
+        self.output_path = output_path
+        self.exporter = FrameExporter(mode=mode, fps=fps)
+        self.is_running = True
+
+    def run(self):
+        try:
+            self.exporter.prepare(self.frames_info[0])
+            stats = self.exporter.export(self.frames_info, len(self.frames_info), self.output_path,
+                                         progress=self.progress.emit, cancelled=lambda: not self.is_running)
+        except Exception as e:
+            self._remove_partial()
+            self.error.emit(str(e))
+            return
+
+        if stats['cancelled']:
+            # Yarım kalan video dosyası bırakılmaz
+            self._remove_partial()
+        else:
+            print(f"Dışa aktarma: {stats['frames']} kare, {stats['seconds']:.1f} sn "
+                  f"({stats['fps']:.1f} kare/sn, atlanan: {stats['skipped']})")
+        self.finished.emit(self.output_path, stats)
+
+    def _remove_partial(self):
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def stop(self):
+        self.is_running = False
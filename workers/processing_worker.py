@@ -1,59 +1,228 @@
 # workers/processing_worker.py
 import os
+import time
 import cv2
 import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from utils.profiler import ThroughputMeter
+from utils.checkpoint import Checkpointer, remove_checkpoint, video_identity
+from utils.temp_storage import STORAGE_PROFILES, estimate_frame_bytes, write_image
 
 class ProcessingWorker(QObject):
-    progress = pyqtSignal(int, int, int)  # percentage, current_frame, total_frames
-    frame_preview_ready = pyqtSignal(object, object) # annotated_frame, radar_frame
+    progress = pyqtSignal(int, int, int, float, float, float)  # percentage, current_frame, total_frames, fps, eta_s, elapsed_s
+    frame_preview_ready = pyqtSignal(QImage, QImage) # önizleme boyutuna küçültülmüş annotated, radar
+    stage_timings = pyqtSignal(dict) # {'stages_ms': {...}, 'counts': {...}, 'frames': n}
     finished = pyqtSignal(list) # List of processed frame info dictionaries
     error = pyqtSignal(str)
 
-    def __init__(self, video_processor, temp_dir, parent=None):
+    def __init__(self, video_processor, temp_dir, resume_state=None, storage=None, parent=None):
         super().__init__(parent)
         self.video_processor = video_processor
         self.temp_frame_dir = temp_dir
+        self.resume_state = resume_state  # load_checkpoint çıktısı; verilirse çalışma kaldığı kareden sürer
         self.is_running = True
+        self.profiler = video_processor.profiler
+        self.throughput = ThroughputMeter()
+        self.checkpointer = Checkpointer(temp_dir)
+        # TempStorageManager; verilirse disk kotasına göre ara kayıt profili seçilir
+        self.storage = storage
+        self.storage_profile = STORAGE_PROFILES[0]
+        self.storage_check_interval = 100  # kare
+        self._profile_bytes = 0
+        self._profile_frames = 0
+        # Önizleme: arayüz son kareyi çizip ack_preview() çağırmadan yenisi gönderilmez
+        self.preview_size = (480, 320)
+        self.preview_min_interval_s = 1 / 15
+        self._preview_acked = True
+        self._preview_sent_at = 0.0
+        self._preview_rtt_s = 0.0
+
+    def set_preview_size(self, width, height):
+        """Arayüz iş parçacığından çağrılır; sonraki önizlemeler bu boyuta küçültülür."""
+        self.preview_size = (width, height)
+
+    def ack_preview(self):
+        """Arayüz iş parçacığından çağrılır: son önizleme ekrana çizildi."""
+        rtt = time.perf_counter() - self._preview_sent_at
+        self._preview_rtt_s = rtt if not self._preview_rtt_s else 0.8 * self._preview_rtt_s + 0.2 * rtt
+        self._preview_acked = True
+
+    def _preview_due(self):
+        """
+        Arayüz önceki önizlemeyi tüketmediyse kare atlanır (kuyruğa alınmaz); tüketim
+        hızı yavaşladıkça gönderim aralığı da ölçülen gidiş-dönüş süresine göre açılır.
+        """
+        if not self._preview_acked:
+            return False
+        interval = max(self.preview_min_interval_s, self._preview_rtt_s)
+        return time.perf_counter() - self._preview_sent_at >= interval
+
+    def _emit_preview(self, annotated, radar):
+        with self.profiler.stage('preview'):
+            annotated_image = _preview_image(annotated, self.preview_size)
+            radar_image = _preview_image(radar, self.preview_size)
+        self._preview_acked = False
+        self._preview_sent_at = time.perf_counter()
+        self.frame_preview_ready.emit(annotated_image, radar_image)
+
+    def _read_frame(self):
+        with self.profiler.stage('decode'):
+            return self.video_processor.cap.read()
 
     def run(self):
         processed_frames_info = []
-        if not self.video_processor.setup_video_io():
+        start_frame = self.resume_state['next_frame'] if self.resume_state else 0
+        if not self.video_processor.setup_video_io(start_frame=start_frame):
             self.error.emit("Video dosyası açılamadı veya I/O hatası oluştu.")
             return
+        if self.resume_state:
+            self.video_processor.set_state(self.resume_state['processor'])
+            processed_frames_info = self.resume_state['frames_info']
+            print(f"Kontrol noktasından devam ediliyor: kare {start_frame}")
 
         total_frames = self.video_processor.total_frames
+        frames_done = start_frame
+        if self.storage is not None:
+            self.storage.register_run(self.temp_frame_dir)
+            self._plan_storage(total_frames - frames_done)
+        self.throughput.start()
         
-        for frame_count, (ret, frame) in enumerate(iter(lambda: self.video_processor.cap.read(), (False, None))):
+        for frame_count, (ret, frame) in enumerate(iter(self._read_frame, (False, None)), start=start_frame):
             if not ret or not self.is_running:
                 break
             
             try:
                 annotated, radar = self.video_processor.process_frame(frame)
                 
-                if frame_count % 5 == 0: # Her 5 karede bir önizleme gönder
-                    self.frame_preview_ready.emit(annotated, radar)
+                if self._preview_due():
+                    self._emit_preview(annotated, radar)
 
                 annotated_path = os.path.join(self.temp_frame_dir, f"annotated_{frame_count:05d}.jpg")
                 radar_path = os.path.join(self.temp_frame_dir, f"radar_{frame_count:05d}.jpg")
-                cv2.imwrite(annotated_path, annotated)
-                cv2.imwrite(radar_path, radar)
+                with self.profiler.stage('disk_write'):
+                    written = (write_image(annotated_path, annotated, self.storage_profile)
+                               + write_image(radar_path, radar, self.storage_profile))
+                self._record_write(written)
                 
                 processed_frames_info.append({
                     "annotated_path": annotated_path,
                     "radar_path": radar_path,
-                    "selected": True
+                    "selected": True,
+                    # Disk darlığında düşürülen kalite; analiz önbelleği yalnızca tam kaliteyi saklar
+                    "storage_profile": self.storage_profile['name']
                 })
 
             except Exception as e:
                 print(f"Hata oluşan çerçeve {frame_count}: {e}")
+
+            self.profiler.end_frame()
+            if frame_count % 5 == 0:
+                self.stage_timings.emit(self.profiler.breakdown())
             
-            percent = int((frame_count + 1) / total_frames * 100)
-            self.progress.emit(percent, frame_count + 1, total_frames)
+            frames_done = frame_count + 1
+            self.throughput.update()
+            fraction = self.video_processor.progress_fraction(frames_done)
+            if fraction > 0:
+                # Toplam kare tahmini okuma konumuna göre sürekli düzeltilir
+                total_frames = max(frames_done, int(round(frames_done / fraction)))
+            total_frames = max(total_frames, frames_done)
+            # Bitiş sinyali gelene kadar %100 gösterilmez
+            percent = min(int(fraction * 100), 99)
+            self.progress.emit(percent, frames_done, total_frames, self.throughput.fps,
+                               self.throughput.eta(total_frames - frames_done), self.throughput.elapsed)
+            if self.checkpointer.due():
+                self._save_checkpoint(frames_done, processed_frames_info)
+            if self.storage is not None and frames_done % self.storage_check_interval == 0:
+                self._plan_storage(total_frames - frames_done)
         
         self.video_processor.cap.release()
-        if self.is_running:
+        self.video_processor.save_calibration()
+        self._log_shot_report()
+        self._write_trace()
+        if not self.is_running:
+            # İptal edilen çalışma daha sonra kaldığı yerden sürdürülebilir
+            self._save_checkpoint(frames_done, processed_frames_info)
+        else:
+            self._finish_checkpoints()
+            self.progress.emit(100, frames_done, frames_done, self.throughput.fps, 0.0, self.throughput.elapsed)
             self.finished.emit(processed_frames_info)
 
+    def _record_write(self, nbytes):
+        self._profile_bytes += nbytes
+        self._profile_frames += 1
+        if self.storage is not None:
+            self.storage.record_write(self.temp_frame_dir, nbytes)
+
+    def _plan_storage(self, frames_remaining):
+        """
+        Kalan kareler için disk alanı ayırır ve sığan en kaliteli kayıt profilini seçer.
+        Kare başı bayt, ölçüm yapılana kadar çözünürlükten tahmin edilir.
+        """
+        if self._profile_frames:
+            full_frame_bytes = self._profile_bytes / self._profile_frames / self.storage_profile['cost']
+        else:
+            vp = self.video_processor
+            full_frame_bytes = estimate_frame_bytes((vp.frame_width, vp.frame_height),
+                                                    (vp.radar_width, vp.radar_height))
+        profile = self.storage.choose_profile(full_frame_bytes, max(frames_remaining, 0),
+                                              protect=[self.temp_frame_dir], current=self.storage_profile)
+        if profile is not self.storage_profile:
+            print(f"Ara kayıt profili: {self.storage_profile['name']} -> {profile['name']} "
+                  f"(kullanılabilir alan: {self.storage.available_bytes() / 1024 ** 2:.0f} MB)")
+            self.storage_profile = profile
+            self._profile_bytes = self._profile_frames = 0
+
+    def _save_checkpoint(self, next_frame, processed_frames_info):
+        """Çalışma durumunu atomik olarak kaydeder; hata işlemeyi durdurmaz."""
+        state = {
+            'video': video_identity(self.video_processor.video_path),
+            'next_frame': next_frame,
+            'frames_info': processed_frames_info,
+            'processor': self.video_processor.get_state(),
+        }
+        try:
+            with self.profiler.stage('checkpoint'):
+                self.checkpointer.save(state)
+        except Exception as e:
+            print(f"Kontrol noktası kaydedilemedi: {e}")
+
+    def _finish_checkpoints(self):
+        """Tamamlanan çalışmanın kontrol noktasını siler ve ek yükü raporlar."""
+        remove_checkpoint(self.temp_frame_dir)
+        if self.checkpointer.saves:
+            print(f"Kontrol noktası: {self.checkpointer.saves} kayıt, "
+                  f"toplam {self.checkpointer.total_cost_s * 1000:.0f} ms "
+                  f"(ek yük %{self.checkpointer.overhead * 100:.2f})")
+
+    def _log_shot_report(self):
+        """Atlanan ara çekimleri ve kazanılan süreyi raporlar."""
+        report = self.video_processor.shot_report()
+        frames = report['frames']
+        print(f"Çekim türleri: geniş {frames['wide']}, yakın {frames['close_up']}, saha dışı {frames['non_pitch']} | "
+              f"atlanan kare: {report['frames_skipped']}, kazanılan süre: {report['time_saved_s']:.1f} sn")
+
+    def _write_trace(self):
+        """Aşama ölçümlerini çevrimdışı analiz için Chrome trace JSON olarak kaydeder."""
+        try:
+            trace_path = self.profiler.write_chrome_trace(os.path.join(self.temp_frame_dir, "trace.json"))
+            if trace_path:
+                print(f"Profil kaydı yazıldı: {trace_path}")
+        except OSError as e:
+            print(f"Profil kaydı yazılamadı: {e}")
+
     def stop(self):
-        self.is_running = False
\ No newline at end of file
+        self.is_running = False
+
+
+def _preview_image(frame, size):
+    """Kareyi en-boy oranını koruyarak size içine sığdırır ve kendi belleğine sahip bir QImage döner."""
+    h, w = frame.shape[:2]
+    scale = min(size[0] / w, size[1] / h, 1.0)
+    if scale < 1.0:
+        frame = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    frame = np.ascontiguousarray(frame)
+    h, w, ch = frame.shape
+    # copy(): numpy tamponu serbest kalsa da görüntü arayüz iş parçacığında geçerli kalır
+    return QImage(frame.data, w, h, ch * w, QImage.Format_BGR888).copy()